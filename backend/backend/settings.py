@@ -40,6 +40,7 @@ AUTH_USER_MODEL = 'flights.User'
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # Must be first
+    'flights.perf.PerfMiddleware',            # Query count / timing per route (see flights/perf.py)
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -158,3 +159,26 @@ EMAIL_USE_TLS = config('EMAIL_USE_TLS', cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
+
+# ─── Outbound email queue (flights/emails.py) ─────────────────────────────────
+# Run `python manage.py process_email_queue` to deliver queued mail.
+# EMAIL_QUEUE_EAGER sends inline after commit instead — dev / tests only.
+EMAIL_QUEUE_EAGER              = config('EMAIL_QUEUE_EAGER', default=False, cast=bool)
+EMAIL_QUEUE_MAX_ATTEMPTS       = config('EMAIL_QUEUE_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_QUEUE_RETRY_BASE_SECONDS = config('EMAIL_QUEUE_RETRY_BASE_SECONDS', default=60, cast=int)
+
+# ─── In-process caches (flights/cache_versions.py) ────────────────────────────
+# Each worker rebuilds its copy when another worker bumps the shared version,
+# or at the latest after this many seconds (per-process cache backends).
+AIRPORT_INDEX_MAX_AGE_SECONDS       = config('AIRPORT_INDEX_MAX_AGE_SECONDS', default=300, cast=int)
+COMMISSION_SCHEDULE_MAX_AGE_SECONDS = config('COMMISSION_SCHEDULE_MAX_AGE_SECONDS', default=30, cast=int)
+
+# ─── Request instrumentation (flights/perf.py) ────────────────────────────────
+# Per-route query counts / timings for /api/v1/admin/perf/. Server-Timing headers
+# go out with DEBUG, or to admin / staff users when PERF_SERVER_TIMING is on.
+PERF_INSTRUMENTATION = config('PERF_INSTRUMENTATION', default=True, cast=bool)
+PERF_SERVER_TIMING   = config('PERF_SERVER_TIMING', default=False, cast=bool)
+
+# ─── Public catalog lists (flights/catalog.py) ────────────────────────────────
+# Rendered airport / aircraft / yacht / tier lists are cached per catalog version.
+CATALOG_CACHE_SECONDS = config('CATALOG_CACHE_SECONDS', default=60, cast=int)
@@ -1,8 +1,9 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Sum, Count
 from .models import (
     Airport, Aircraft, Yacht,
@@ -15,12 +16,51 @@ from .models import (
     MarketplaceBooking, CommissionSetting,
     PaymentRecord, SavedRoute, Dispute,
 )
+from .exports import dataset_for, export_response
+from .empty_legs import refresh_empty_legs
+from .revenue import refresh_rollups
 
 admin.site.site_header = "✈  NairobiJetHouse Admin"
 admin.site.site_title  = "NairobiJetHouse"
 admin.site.index_title = "Operations Dashboard"
 
 
+class ExportActionsMixin:
+    """Streams the selected rows as CSV / JSON Lines (see flights/exports.py)."""
+
+    @admin.action(description="Export selected → CSV")
+    def export_csv(self, request, queryset):
+        return export_response(queryset, dataset_for(self.model), "csv")
+
+    @admin.action(description="Export selected → JSON Lines")
+    def export_jsonl(self, request, queryset):
+        return export_response(queryset, dataset_for(self.model), "jsonl")
+
+
+def update_bookings(queryset, **changes):
+    """
+    queryset.update() for the booking status actions. update() skips the
+    post_save receivers, so redo what they would have done for these rows.
+    """
+    pks     = list(queryset.values_list("pk", flat=True))
+    updated = queryset.model.objects.filter(pk__in=pks).update(**changes)
+    refresh_rollups(queryset.model, pks)
+    if queryset.model is MarketplaceBooking:
+        aircraft_ids = MarketplaceBooking.objects.filter(pk__in=pks).values_list("aircraft_id", flat=True)
+        for aircraft_id in set(aircraft_ids):
+            refresh_empty_legs(aircraft_id)
+    return updated
+
+
+def update_aircraft(queryset, **changes):
+    """queryset.update() for MarketplaceAircraft, then recompute each one's empty legs."""
+    pks     = list(queryset.values_list("pk", flat=True))
+    updated = MarketplaceAircraft.objects.filter(pk__in=pks).update(**changes)
+    for aircraft_id in pks:
+        refresh_empty_legs(aircraft_id)
+    return updated
+
+
 # ──────────────────────────────────────────────────────────────────────────────
 # AIRPORT
 # ──────────────────────────────────────────────────────────────────────────────
@@ -122,7 +162,7 @@ class FlightLegInline(admin.TabularInline):
 
 
 @admin.register(FlightBooking)
-class FlightBookingAdmin(admin.ModelAdmin):
+class FlightBookingAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display   = ("short_reference", "guest_name", "guest_email", "route",
                       "departure_date", "passenger_count", "status_badge",
                       "quoted_price_display", "created_at")
@@ -148,7 +188,7 @@ class FlightBookingAdmin(admin.ModelAdmin):
         ("Timestamps",        {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
 
-    actions = ["mark_quoted", "mark_confirmed", "mark_completed", "mark_cancelled"]
+    actions = ["mark_quoted", "mark_confirmed", "mark_completed", "mark_cancelled", "export_csv", "export_jsonl"]
 
     @admin.display(description="Reference")
     def short_reference(self, obj):
@@ -179,22 +219,22 @@ class FlightBookingAdmin(admin.ModelAdmin):
 
     @admin.action(description="Mark selected as Quoted")
     def mark_quoted(self, request, queryset):
-        updated = queryset.filter(status="inquiry").update(status="quoted")
+        updated = update_bookings(queryset.filter(status="inquiry"), status="quoted")
         self.message_user(request, f"{updated} booking(s) marked as Quoted.")
 
     @admin.action(description="Mark selected as Confirmed")
     def mark_confirmed(self, request, queryset):
-        updated = queryset.filter(status__in=["inquiry", "quoted"]).update(status="confirmed")
+        updated = update_bookings(queryset.filter(status__in=["inquiry", "quoted"]), status="confirmed")
         self.message_user(request, f"{updated} booking(s) marked as Confirmed.")
 
     @admin.action(description="Mark selected as Completed")
     def mark_completed(self, request, queryset):
-        updated = queryset.exclude(status="cancelled").update(status="completed")
+        updated = update_bookings(queryset.exclude(status="cancelled"), status="completed")
         self.message_user(request, f"{updated} booking(s) marked as Completed.")
 
     @admin.action(description="Mark selected as Cancelled")
     def mark_cancelled(self, request, queryset):
-        updated = queryset.exclude(status="completed").update(status="cancelled")
+        updated = update_bookings(queryset.exclude(status="completed"), status="cancelled")
         self.message_user(request, f"{updated} booking(s) marked as Cancelled.")
 
 
@@ -735,7 +775,7 @@ class MembershipTierAdmin(admin.ModelAdmin):
 # MEMBERSHIP  (inline on User is optional — registered standalone here)
 # ──────────────────────────────────────────────────────────────────────────────
 @admin.register(Membership)
-class MembershipAdmin(admin.ModelAdmin):
+class MembershipAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display   = ("short_reference", "user_link", "user_email", "tier_badge",
                       "status_badge", "billing_cycle", "start_date", "end_date",
                       "days_remaining_display", "auto_renew", "amount_paid")
@@ -757,7 +797,7 @@ class MembershipAdmin(admin.ModelAdmin):
         ("Timestamps",   {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
 
-    actions = ["mark_active", "mark_suspended", "mark_cancelled"]
+    actions = ["mark_active", "mark_suspended", "mark_cancelled", "export_csv", "export_jsonl"]
 
     @admin.display(description="Reference")
     def short_reference(self, obj):
@@ -825,7 +865,7 @@ class MaintenanceLogInline(admin.TabularInline):
 
 
 @admin.register(MarketplaceAircraft)
-class MarketplaceAircraftAdmin(admin.ModelAdmin):
+class MarketplaceAircraftAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display   = ("name", "registration_number", "owner_link", "category_badge",
                       "status_badge", "is_approved", "base_location",
                       "hourly_rate_usd", "total_flight_hours",
@@ -856,7 +896,7 @@ class MarketplaceAircraftAdmin(admin.ModelAdmin):
         ("Timestamps",    {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
 
-    actions = ["approve_aircraft", "mark_available", "mark_maintenance", "mark_inactive"]
+    actions = ["approve_aircraft", "mark_available", "mark_maintenance", "mark_inactive", "export_csv", "export_jsonl"]
 
     @admin.display(description="Owner")
     def owner_link(self, obj):
@@ -896,20 +936,20 @@ class MarketplaceAircraftAdmin(admin.ModelAdmin):
 
     @admin.action(description="✅ Approve & list selected aircraft")
     def approve_aircraft(self, request, queryset):
-        updated = queryset.update(is_approved=True, status="available")
+        updated = update_aircraft(queryset, is_approved=True, status="available")
         self.message_user(request, f"{updated} aircraft approved and listed.")
 
     @admin.action(description="Set selected as Available")
     def mark_available(self, request, queryset):
-        self.message_user(request, f"{queryset.update(status='available')} aircraft set to Available.")
+        self.message_user(request, f"{update_aircraft(queryset, status='available')} aircraft set to Available.")
 
     @admin.action(description="Set selected as Under Maintenance")
     def mark_maintenance(self, request, queryset):
-        self.message_user(request, f"{queryset.update(status='maintenance')} aircraft set to Maintenance.")
+        self.message_user(request, f"{update_aircraft(queryset, status='maintenance')} aircraft set to Maintenance.")
 
     @admin.action(description="Set selected as Inactive")
     def mark_inactive(self, request, queryset):
-        self.message_user(request, f"{queryset.update(status='inactive')} aircraft set to Inactive.")
+        self.message_user(request, f"{update_aircraft(queryset, status='inactive')} aircraft set to Inactive.")
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -988,7 +1028,7 @@ class MaintenanceLogAdmin(admin.ModelAdmin):
 # MARKETPLACE BOOKING
 # ──────────────────────────────────────────────────────────────────────────────
 @admin.register(MarketplaceBooking)
-class MarketplaceBookingAdmin(admin.ModelAdmin):
+class MarketplaceBookingAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display   = ("short_reference", "client_link", "aircraft_link",
                       "route", "departure_datetime", "passenger_count",
                       "status_badge", "payment_badge",
@@ -1016,7 +1056,7 @@ class MarketplaceBookingAdmin(admin.ModelAdmin):
         ("Timestamps",  {"fields": ("created_at", "updated_at"), "classes": ("collapse",)}),
     )
 
-    actions = ["mark_confirmed", "mark_completed", "mark_cancelled", "mark_disputed"]
+    actions = ["mark_confirmed", "mark_completed", "mark_cancelled", "mark_disputed", "export_csv", "export_jsonl"]
 
     @admin.display(description="Reference")
     def short_reference(self, obj):
@@ -1065,21 +1105,47 @@ class MarketplaceBookingAdmin(admin.ModelAdmin):
     def net_display(self, obj):
         return format_html('<span style="color:#50C878;font-weight:600;">${:,.0f}</span>', obj.net_owner_usd)
 
+    def _without_clashes(self, request, queryset):
+        """
+        The selected bookings whose window is still free on their aircraft —
+        checked against other blocking bookings and against each other.
+        Warns about the ones left out.
+        """
+        from .availability import is_booked
+        taken, free, clashes = {}, [], 0
+        for b in queryset.order_by("occupied_from").values("pk", "aircraft_id", "occupied_from", "occupied_until"):
+            start, end = b["occupied_from"], b["occupied_until"]
+            mine = taken.setdefault(b["aircraft_id"], [])
+            if is_booked(b["aircraft_id"], start, end, exclude_pk=b["pk"]) or \
+                    any(s < end and start < e for s, e in mine):
+                clashes += 1
+                continue
+            mine.append((start, end))
+            free.append(b["pk"])
+        if clashes:
+            self.message_user(request, f"{clashes} booking(s) skipped — the aircraft is already booked "
+                                       f"for that window.", messages.WARNING)
+        return queryset.filter(pk__in=free)
+
     @admin.action(description="Mark selected as Confirmed")
     def mark_confirmed(self, request, queryset):
-        self.message_user(request, f"{queryset.filter(status='pending').update(status='confirmed')} booking(s) confirmed.")
+        with transaction.atomic():
+            queryset = self._without_clashes(request, queryset.filter(status='pending'))
+            self.message_user(request, f"{update_bookings(queryset, status='confirmed')} booking(s) confirmed.")
 
     @admin.action(description="Mark selected as Completed")
     def mark_completed(self, request, queryset):
-        self.message_user(request, f"{queryset.exclude(status='cancelled').update(status='completed')} booking(s) completed.")
+        self.message_user(request, f"{update_bookings(queryset.exclude(status='cancelled'), status='completed')} booking(s) completed.")
 
     @admin.action(description="Mark selected as Cancelled")
     def mark_cancelled(self, request, queryset):
-        self.message_user(request, f"{queryset.exclude(status='completed').update(status='cancelled')} booking(s) cancelled.")
+        self.message_user(request, f"{update_bookings(queryset.exclude(status='completed'), status='cancelled')} booking(s) cancelled.")
 
     @admin.action(description="Mark selected as Disputed")
     def mark_disputed(self, request, queryset):
-        self.message_user(request, f"{queryset.update(status='disputed')} booking(s) flagged as Disputed.")
+        with transaction.atomic():
+            queryset = self._without_clashes(request, queryset)
+            self.message_user(request, f"{update_bookings(queryset, status='disputed')} booking(s) flagged as Disputed.")
 
 
 # ──────────────────────────────────────────────────────────────────────────────
@@ -1122,7 +1188,7 @@ class CommissionSettingAdmin(admin.ModelAdmin):
 # PAYMENT RECORD
 # ──────────────────────────────────────────────────────────────────────────────
 @admin.register(PaymentRecord)
-class PaymentRecordAdmin(admin.ModelAdmin):
+class PaymentRecordAdmin(ExportActionsMixin, admin.ModelAdmin):
     list_display   = ("short_reference", "user_link", "type_badge", "amount_display",
                       "currency", "status_badge", "stripe_id_short", "created_at")
     list_filter    = ("payment_type", "status", "currency",
@@ -1133,6 +1199,7 @@ class PaymentRecordAdmin(admin.ModelAdmin):
     readonly_fields = ("reference", "created_at")
     list_per_page  = 30
     date_hierarchy = "created_at"
+    actions        = ["export_csv", "export_jsonl"]
 
     fieldsets = (
         ("Reference",  {"fields": ("reference",)}),
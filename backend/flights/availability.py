@@ -0,0 +1,81 @@
+# flights/availability.py
+"""
+Marketplace aircraft calendars.
+
+Every MarketplaceBooking stores the window it blocks its aircraft for in
+occupied_from / occupied_until (filled in by MarketplaceBooking.save):
+
+    departure_datetime  →  (return_datetime or departure_datetime)
+                           + estimated_hours + turnaround
+
+With the (aircraft, occupied_until) index, one booking's calendar is an
+index range scan, and the double-booking check is an EXISTS over the same
+range that does not rely on the stored windows being disjoint.
+
+Every write that can block the aircraft (member and admin create, updates,
+status changes) locks the aircraft row first (select_for_update), so two
+concurrent requests for the same aircraft are checked one after the other.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+
+TURNAROUND = timedelta(hours=getattr(settings, 'MARKETPLACE_TURNAROUND_HOURS', 1))
+
+# Statuses that keep an aircraft busy
+BLOCKING_STATUSES = ['pending', 'confirmed', 'in_flight', 'completed', 'disputed']
+
+MAX_CALENDAR_DAYS = 366
+
+
+def booking_window(departure, return_datetime, estimated_hours):
+    """(occupied_from, occupied_until) for a booking."""
+    end = (return_datetime or departure) + timedelta(hours=float(estimated_hours or 0))
+    return departure, end + TURNAROUND
+
+
+def _blocking(aircraft_id, exclude_pk=None):
+    from .models import MarketplaceBooking
+    qs = MarketplaceBooking.objects.filter(aircraft_id=aircraft_id, status__in=BLOCKING_STATUSES)
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return qs
+
+
+def is_booked(aircraft_id, start, end, exclude_pk=None):
+    """
+    True when a blocking booking overlaps [start, end). Locks the aircraft
+    row first, so call it inside transaction.atomic() and write the booking
+    in the same transaction.
+    """
+    from .models import MarketplaceAircraft
+    MarketplaceAircraft.objects.select_for_update().filter(pk=aircraft_id).first()
+    return (
+        _blocking(aircraft_id, exclude_pk)
+        .filter(occupied_from__lt=end, occupied_until__gt=start)
+        .exists()
+    )
+
+
+def busy_intervals(aircraft_id, start, end):
+    """Blocking bookings overlapping [start, end), in time order."""
+    return list(
+        _blocking(aircraft_id)
+        .filter(occupied_until__gt=start, occupied_from__lt=end)
+        .order_by('occupied_from')
+        .values('reference', 'status', 'occupied_from', 'occupied_until')
+    )
+
+
+def free_windows(busy, start, end):
+    """Gaps in [start, end) not covered by the busy intervals."""
+    windows, cursor = [], start
+    for b in busy:
+        if b['occupied_from'] > cursor:
+            windows.append((cursor, min(b['occupied_from'], end)))
+        cursor = max(cursor, b['occupied_until'])
+        if cursor >= end:
+            break
+    if cursor < end:
+        windows.append((cursor, end))
+    return windows
@@ -0,0 +1,36 @@
+# flights/cache_versions.py
+"""
+Version numbers for process-local caches, kept in the Django cache.
+
+Each worker holds its own copy of things like the airport index or the
+commission schedule. A signal only fires in the worker that saved the
+row, so that worker also bumps a shared version number; every worker
+compares its copy's version against it and rebuilds on a mismatch.
+The bump is deferred to transaction commit, so no worker rebuilds from
+data that is not visible yet.
+
+With the default per-process LocMemCache a bump only reaches the worker
+that made it, so callers also give their copies a maximum age.
+"""
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def current_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Start from the clock so a lost key never reuses an old number
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    def bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    transaction.on_commit(bump)
@@ -0,0 +1,134 @@
+# flights/catalog.py
+"""
+Fast read path for the public catalog lists: airports, charter aircraft,
+yachts and membership tiers.
+
+These rows almost never change, yet every list request built model
+instances and ran them through a ModelSerializer field by field. The
+catalog lists instead:
+  • read only the columns the serializer shows, with values_list();
+  • turn each row into the serializer's dict with a transform compiled
+    once from that serializer — field order, names, *_display labels and
+    decimal formatting all come from it, so the JSON is byte-identical;
+  • cache the rendered bytes in the Django cache, keyed on the absolute
+    URL (page, filters, host) and a catalog version number.
+
+post_save / post_delete on Airport, Aircraft, Yacht and MembershipTier
+bump the version on commit (see flights/signals.py and cache_versions.py);
+bulk writers that skip signals (import_airports, import_fleet) bump it
+themselves. With a shared cache backend every worker sees the bump at
+once; with the default per-process LocMemCache other workers may serve the
+old bytes for up to CATALOG_CACHE_SECONDS.
+
+Free-text ?search= results are serialized the fast way but not cached.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from rest_framework import serializers
+
+from .cache_versions import bump_version, current_version
+
+CACHE_SECONDS = getattr(settings, 'CATALOG_CACHE_SECONDS', 60)
+
+VERSION_KEY = 'flights:catalog:version'
+
+# Serializer fields whose to_representation() returns a values_list()
+# value unchanged (str / int / bool / decoded JSON)
+PASSTHROUGH = (
+    serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+    serializers.ChoiceField, serializers.JSONField, serializers.ReadOnlyField,
+)
+
+
+def catalog_version():
+    return current_version(VERSION_KEY)
+
+
+def bump_catalog_version(**kwargs):
+    """Signal receiver — a catalog row changed; cached lists go stale on commit."""
+    bump_version(VERSION_KEY)
+
+
+def compile_rows(serializer_class):
+    """
+    (columns, to_dict): the columns to pass to values_list() and a function
+    turning one such row into serializer_class(instance).data.
+    """
+    model   = serializer_class.Meta.model
+    columns = []
+    steps   = []
+    for name, field in serializer_class().fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        if source.startswith('get_') and source.endswith('_display'):
+            model_field = model._meta.get_field(source[4:-8])
+            labels      = dict(model_field.flatchoices)
+            convert     = lambda value, labels=labels: str(labels.get(value, value))
+        else:
+            model_field = model._meta.get_field(source)
+            convert     = None if isinstance(field, PASSTHROUGH) else field.to_representation
+        if model_field.attname not in columns:
+            columns.append(model_field.attname)
+        steps.append((name, columns.index(model_field.attname), convert))
+
+    def to_dict(row):
+        data = {}
+        for name, index, convert in steps:
+            value = row[index]
+            data[name] = value if convert is None or value is None else convert(value)
+        return data
+
+    return columns, to_dict
+
+
+class CatalogListMixin:
+    """
+    list() for read-only catalog viewsets: values_list() rows through the
+    compiled serializer transform, rendered bytes cached per catalog version.
+    Only requests whose query parameters are all in catalog_cache_params
+    (plus any filterset_fields) are cached.
+    """
+    catalog_cache_params = ('page', 'ordering')
+
+    _compiled = {}
+
+    def catalog_rows(self):
+        serializer_class = self.get_serializer_class()
+        compiled = self._compiled.get(serializer_class)
+        if compiled is None:
+            compiled = self._compiled[serializer_class] = compile_rows(serializer_class)
+        return compiled
+
+    def catalog_cache_key(self, request):
+        allowed = set(self.catalog_cache_params) | set(getattr(self, 'filterset_fields', None) or ())
+        if not set(request.query_params) <= allowed:
+            return None
+        return (f'flights:catalog:{catalog_version()}:{request.accepted_media_type}:'
+                f'{request.build_absolute_uri()}')
+
+    def list(self, request, *args, **kwargs):
+        renderer     = request.accepted_renderer
+        content_type = renderer.media_type if renderer.charset is None else \
+                       f'{renderer.media_type}; charset={renderer.charset}'
+        key  = self.catalog_cache_key(request)
+        body = cache.get(key) if key else None
+        if body is None:
+            columns, to_dict = self.catalog_rows()
+            queryset = self.filter_queryset(self.get_queryset()).values_list(*columns)
+            page     = self.paginate_queryset(queryset)
+            started  = time.perf_counter()
+            data     = [to_dict(row) for row in (queryset if page is None else page)]
+            stats    = getattr(request, 'perf', None)
+            if stats is not None:
+                stats.serializer_ms += (time.perf_counter() - started) * 1000
+            if page is not None:
+                data = self.get_paginated_response(data).data
+            body = renderer.render(data, request.accepted_media_type, self.get_renderer_context())
+            if key:
+                cache.set(key, body, CACHE_SECONDS)
+        # finalize_response() still adds DRF's Allow / Vary: Accept headers
+        return HttpResponse(body, content_type=content_type)
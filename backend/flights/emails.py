@@ -0,0 +1,275 @@
+# flights/emails.py
+"""
+Outbound email queue.
+
+Views never talk to SMTP. queue_email() stores a 'pending' EmailLog and
+returns straight away; the process_email_queue worker claims due rows,
+delivers them over one SMTP connection per thread and retries failures with
+exponential backoff:
+
+    pending ──claim──▶ sending ──ok──▶ sent
+       ▲                  │
+       └──retry (backoff)─┤
+                          └──out of attempts──▶ failed
+
+A claimed row's next_attempt_at doubles as its lease, so rows held by a
+worker that died are picked up again once the lease runs out.
+
+Set EMAIL_QUEUE_EAGER = True to deliver inline after commit instead (handy
+with the locmem backend in tests and local dev). The row is still claimed
+first, so a worker running alongside never sends it a second time.
+
+`success` stays False until a delivery succeeds; `status` is the full
+picture.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from itertools import islice
+from string import Formatter
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import EmailLog
+
+MAX_ATTEMPTS       = getattr(settings, 'EMAIL_QUEUE_MAX_ATTEMPTS', 5)
+RETRY_BASE_SECONDS = getattr(settings, 'EMAIL_QUEUE_RETRY_BASE_SECONDS', 60)
+LEASE_SECONDS      = getattr(settings, 'EMAIL_QUEUE_LEASE_SECONDS', 300)
+
+
+def render_email_html(to_name, body):
+    return f"""
+    <html><body style="font-family:Arial,sans-serif;max-width:600px;margin:auto;padding:20px">
+      <div style="background:#0b1d3a;padding:20px;border-radius:8px 8px 0 0">
+        <h2 style="color:#C9A84C;margin:0">NairobiJetHouse</h2>
+        <p style="color:rgba(255,255,255,0.6);margin:4px 0 0;font-size:13px">Private Aviation & Luxury Charter</p>
+      </div>
+      <div style="border:1px solid #e5e7eb;border-top:none;padding:28px;border-radius:0 0 8px 8px">
+        {"<p style='color:#374151'>Dear " + to_name + ",</p>" if to_name else ""}
+        <div style="color:#374151;line-height:1.7;white-space:pre-line">{body}</div>
+        <hr style="border:none;border-top:1px solid #e5e7eb;margin:24px 0">
+        <p style="color:#9ca3af;font-size:12px;margin:0">
+          NairobiJetHouse · Private Aviation & Luxury Charter<br>
+          This email was sent by our operations team. Please do not reply directly to this message.
+        </p>
+      </div>
+    </body></html>
+    """
+
+
+def build_message(log, connection=None):
+    """EmailMultiAlternatives for an EmailLog row (plain body + branded HTML)."""
+    msg = EmailMultiAlternatives(
+        subject=log.subject,
+        body=log.body,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'ops@NairobiJetHouse.com'),
+        to=[f'"{log.to_name}" <{log.to_email}>' if log.to_name else log.to_email],
+        connection=connection,
+    )
+    msg.attach_alternative(render_email_html(log.to_name, log.body), "text/html")
+    return msg
+
+
+def queue_email(admin_user, to_email, to_name, subject, body,
+                inquiry_type='general', related_id=None):
+    """Store a pending EmailLog for the worker and return it."""
+    log = EmailLog.objects.create(
+        sent_by=admin_user, to_email=to_email, to_name=to_name or '',
+        subject=subject, body=body, inquiry_type=inquiry_type,
+        related_id=related_id, status='pending',
+    )
+    if getattr(settings, 'EMAIL_QUEUE_EAGER', False):
+        transaction.on_commit(lambda: deliver(claim(log)))
+    return log
+
+
+def claim(log):
+    """
+    Move one pending row to 'sending' under a lease. Returns [log] when this
+    caller won the row, [] when a worker already has it.
+    """
+    lease = timezone.now() + timedelta(seconds=LEASE_SECONDS)
+    won   = EmailLog.objects.filter(id=log.id, status='pending').update(
+        status='sending', next_attempt_at=lease,
+    )
+    if not won:
+        return []
+    log.status, log.next_attempt_at = 'sending', lease
+    return [log]
+
+
+# ── WORKER SIDE ───────────────────────────────────────────────────────────────
+def claim_batch(limit):
+    """
+    Atomically move up to `limit` due rows to 'sending' and return them.
+    skip_locked lets several workers share the queue on Postgres; SQLite
+    serialises writers anyway.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        due = (
+            EmailLog.objects
+            .select_for_update(skip_locked=True)
+            .filter(status__in=['pending', 'sending'])
+            .filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+            .order_by('sent_at')[:limit]
+        )
+        logs = list(due)
+        if logs:
+            EmailLog.objects.filter(id__in=[l.id for l in logs]).update(
+                status='sending', next_attempt_at=now + timedelta(seconds=LEASE_SECONDS),
+            )
+    return logs
+
+
+def _send_chunk(logs):
+    """Deliver rows over a single SMTP connection. Returns [(log, error_str)]."""
+    results = []
+    connection = get_connection()
+    try:
+        connection.open()
+        for log in logs:
+            try:
+                build_message(log, connection).send()
+                results.append((log, ''))
+            except Exception as e:
+                results.append((log, str(e) or e.__class__.__name__))
+    except Exception as e:
+        # Could not even connect — every row in the chunk gets the error
+        done = {l.id for l, _ in results}
+        results.extend((l, str(e) or e.__class__.__name__) for l in logs if l.id not in done)
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return results
+
+
+def record_results(results):
+    """Persist delivery outcomes, scheduling retries with exponential backoff."""
+    now = timezone.now()
+    for log, error in results:
+        log.attempts += 1
+        if not error:
+            log.status, log.success, log.error_msg = 'sent', True, ''
+            log.delivered_at, log.next_attempt_at = now, None
+        elif log.attempts >= MAX_ATTEMPTS:
+            log.status, log.success, log.error_msg = 'failed', False, error
+            log.next_attempt_at = None
+        else:
+            log.status, log.error_msg = 'pending', error
+            log.next_attempt_at = now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (log.attempts - 1))
+    EmailLog.objects.bulk_update(
+        [log for log, _ in results],
+        ['status', 'success', 'error_msg', 'attempts', 'delivered_at', 'next_attempt_at'],
+    )
+
+
+def deliver(logs, workers=1):
+    """Send the given rows, split across `workers` threads, and record outcomes."""
+    logs = list(logs)
+    if not logs:
+        return []
+    workers = max(1, min(workers, len(logs)))
+    chunks  = [logs[i::workers] for i in range(workers)]
+    if workers == 1:
+        results = _send_chunk(chunks[0])
+    else:
+        # Threads only talk SMTP; all DB writes happen back on this thread
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = [r for chunk in pool.map(_send_chunk, chunks) for r in chunk]
+    record_results(results)
+    return results
+
+
+def process_outbox(batch_size=100, workers=4):
+    """Claim one batch and deliver it. Returns (sent, retrying, failed)."""
+    results = deliver(claim_batch(batch_size), workers)
+    sent    = sum(1 for log, err in results if not err)
+    failed  = sum(1 for log, err in results if err and log.status == 'failed')
+    return sent, len(results) - sent - failed, failed
+
+
+# ── BULK CAMPAIGNS ────────────────────────────────────────────────────────────
+BULK_PLACEHOLDERS = {'name', 'first_name', 'email', 'tier'}
+
+
+def template_fields(template):
+    """Placeholder names used in a str.format-style template."""
+    return {field for _, field, _, _ in Formatter().parse(template) if field is not None}
+
+
+def member_recipients(role=None, membership_status=None, tier=None, chunk_size=500):
+    """
+    Yield (email, template_context) for active users matching the filters,
+    streamed from the DB and de-duplicated on email.
+    """
+    from .models import User
+    users = User.objects.filter(is_active=True).exclude(email='')
+    if role:
+        users = users.filter(role=role)
+    if membership_status:
+        users = users.filter(membership__status=membership_status)
+    if tier:
+        users = users.filter(membership__tier__name=tier)
+    rows = users.order_by('id').values_list(
+        'email', 'first_name', 'last_name', 'username', 'membership__tier__display_name',
+    )
+    seen = set()
+    for email, first, last, username, tier_name in rows.iterator(chunk_size=chunk_size):
+        key = email.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        yield email, {
+            'name':       f'{first} {last}'.strip() or username,
+            'first_name': first or username,
+            'email':      email,
+            'tier':       tier_name or '',
+        }
+
+
+def listed_recipients(recipients):
+    """Yield (email, template_context) for an explicit [{email, name}] list."""
+    seen = set()
+    for r in recipients:
+        key = r['email'].lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        name = r.get('name', '')
+        yield r['email'], {
+            'name': name, 'first_name': name.split(' ')[0] if name else '',
+            'email': r['email'], 'tier': '',
+        }
+
+
+def queue_bulk(admin_user, recipients, subject, body, inquiry_type='general',
+               chunk_size=100):
+    """
+    Render one 'pending' EmailLog per (email, context) recipient for the
+    process_email_queue worker; nothing is sent here.
+
+    Recipients are consumed lazily, chunk_size at a time, each chunk written
+    with one bulk_create. Returns the number of rows queued.
+    """
+    recipients = iter(recipients)
+    queued     = 0
+    while True:
+        chunk = list(islice(recipients, chunk_size))
+        if not chunk:
+            break
+        EmailLog.objects.bulk_create([
+            EmailLog(
+                sent_by=admin_user, to_email=email, to_name=ctx['name'],
+                subject=subject.format_map(ctx), body=body.format_map(ctx),
+                inquiry_type=inquiry_type, status='pending',
+            )
+            for email, ctx in chunk
+        ])
+        queued += len(chunk)
+    return queued
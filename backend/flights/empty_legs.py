@@ -0,0 +1,201 @@
+# flights/empty_legs.py
+"""
+Empty legs — repositioning flights sold to members at a discount.
+
+An aircraft's upcoming confirmed bookings, taken in time order, describe
+where it has to be and when. Starting from base_location:
+
+  * before each booking, if the aircraft is somewhere other than the
+    booking's origin, it flies there empty  → a 'positioning' leg;
+  * after the last booking, if it is not back at base, it flies home
+    empty                                   → a 'return' leg.
+
+A one-way booking leaves the aircraft at its destination; a round trip
+brings it back to its origin. Each leg can depart any time between the end
+of the previous booking (plus turnaround) and the latest departure that
+still reaches the next booking in time. Where only one end is bounded by
+a booking (positioning for the first booking, returning after the last)
+the window is EMPTY_LEG_WINDOW_HOURS long.
+
+refresh_empty_legs(aircraft_id) recomputes one aircraft's legs from its
+own bookings and writes only the difference: new legs are created,
+changed open legs updated, legs that no longer exist deleted. Booked legs
+are left alone (their booking is a real booking now) unless that booking
+was cancelled, which puts the leg back on sale. It runs from the
+MarketplaceBooking / MarketplaceAircraft signals (see flights/signals.py);
+after bulk writes run `manage.py rebuild_empty_legs`.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .availability import TURNAROUND
+from .models import EmptyLeg, MarketplaceAircraft, MarketplaceBooking
+
+# Bookings that commit an aircraft to a route
+SOURCE_STATUSES = ['confirmed', 'in_flight']
+
+DISCOUNT_PCT  = Decimal(str(getattr(settings, 'EMPTY_LEG_DISCOUNT_PCT', 40)))
+OPEN_WINDOW   = timedelta(hours=getattr(settings, 'EMPTY_LEG_WINDOW_HOURS', 48))
+
+# Fields a refresh may change on an open leg
+LEG_FIELDS = [
+    'origin', 'destination', 'available_from', 'available_until',
+    'estimated_hours', 'discount_pct', 'price_usd',
+]
+
+
+def _place(name):
+    return (name or '').strip().casefold()
+
+
+def leg_hours(origin, destination, aircraft, fallback):
+    """
+    Flight time between two places. Uses the airport distance when both
+    are airport codes; otherwise the length of the booking that carries the
+    aircraft there (or back), which is the same route.
+    """
+    from .fleet import DEFAULT_CRUISE_KMH
+    from .geo import get_airport_index
+    index = get_airport_index()
+    a, b  = index.get_by_code(origin), index.get_by_code(destination)
+    distance = index.distance_km(a.id, b.id) if a is not None and b is not None else None
+    if distance:
+        cruise = aircraft['cruise_speed_kmh'] or DEFAULT_CRUISE_KMH.get(aircraft['category'], 800)
+        hours = Decimal(str(distance / cruise))
+    else:
+        hours = fallback
+    return max(hours.quantize(Decimal('0.1')), Decimal('0.1'))
+
+
+def _one_way_hours(booking):
+    hours = booking['estimated_hours']
+    return hours / 2 if booking['trip_type'] == 'round_trip' else hours
+
+
+def derive_legs(aircraft, bookings, now):
+    """{(kind, source_booking_id): leg fields} for one aircraft's bookings, in time order."""
+    legs     = {}
+    base     = aircraft['base_location']
+    here     = base
+    free_at  = None
+    previous = None
+
+    def add(kind, source, destination, earliest, latest, fallback):
+        hours = leg_hours(here, destination, aircraft, fallback)
+        if kind == 'positioning':
+            latest -= timedelta(hours=float(hours)) + TURNAROUND
+        if earliest is None:
+            earliest = latest - OPEN_WINDOW
+        if latest < max(earliest, now):
+            return
+        price = aircraft['hourly_rate_usd'] * hours * (1 - DISCOUNT_PCT / 100)
+        legs[(kind, source['id'])] = {
+            'origin':          here,
+            'destination':     destination,
+            'available_from':  earliest,
+            'available_until': latest,
+            'estimated_hours': hours,
+            'discount_pct':    DISCOUNT_PCT,
+            'price_usd':       price.quantize(Decimal('0.01')),
+        }
+
+    for b in bookings:
+        if _place(here) != _place(b['origin']):
+            add('positioning', b, b['origin'], free_at, b['occupied_from'],
+                _one_way_hours(previous or b))
+        here     = b['destination'] if b['trip_type'] == 'one_way' else b['origin']
+        free_at  = b['occupied_until']
+        previous = b
+
+    if previous is not None and _place(here) != _place(base):
+        add('return', previous, base, free_at, free_at + OPEN_WINDOW, _one_way_hours(previous))
+    return legs
+
+
+def refresh_empty_legs(aircraft_id):
+    """Bring one aircraft's empty legs in line with its bookings. Returns (created, updated, deleted)."""
+    aircraft = (
+        MarketplaceAircraft.objects.filter(pk=aircraft_id)
+        .values('id', 'base_location', 'category', 'cruise_speed_kmh', 'hourly_rate_usd')
+        .first()
+    )
+    if aircraft is None:
+        return 0, 0, 0
+    now = timezone.now()
+    bookings = (
+        MarketplaceBooking.objects
+        .filter(aircraft_id=aircraft_id, status__in=SOURCE_STATUSES, occupied_until__gt=now)
+        .order_by('occupied_from')
+        .values('id', 'trip_type', 'origin', 'destination', 'estimated_hours',
+                'occupied_from', 'occupied_until')
+    )
+    wanted = derive_legs(aircraft, bookings, now)
+
+    with transaction.atomic():
+        existing = {
+            (leg.kind, leg.source_booking_id): leg
+            for leg in EmptyLeg.objects.filter(aircraft_id=aircraft_id).select_related('booking')
+        }
+        create, update = [], []
+        for key, leg in existing.items():
+            if leg.status == 'booked' and (leg.booking is None or leg.booking.status == 'cancelled'):
+                leg.status, leg.booking = 'open', None
+                update.append(leg)
+        for key, fields in wanted.items():
+            leg = existing.pop(key, None)
+            if leg is None:
+                create.append(EmptyLeg(aircraft_id=aircraft_id, source_booking_id=key[1], kind=key[0], **fields))
+            elif leg.status == 'open' and any(getattr(leg, f) != v for f, v in fields.items()):
+                for f, v in fields.items():
+                    setattr(leg, f, v)
+                if leg not in update:
+                    update.append(leg)
+        delete = [leg.pk for leg in existing.values() if leg.status == 'open']
+        update = [leg for leg in update if leg.pk not in delete]
+        for leg in update:
+            leg.updated_at = now
+
+        EmptyLeg.objects.bulk_create(create)
+        EmptyLeg.objects.bulk_update(update, LEG_FIELDS + ['status', 'booking', 'updated_at'])
+        EmptyLeg.objects.filter(pk__in=delete).delete()
+    return len(create), len(update), len(delete)
+
+
+def rebuild_empty_legs():
+    """Refresh every aircraft that has upcoming bookings or existing legs."""
+    ids = set(
+        MarketplaceBooking.objects.filter(status__in=SOURCE_STATUSES, occupied_until__gt=timezone.now())
+        .values_list('aircraft_id', flat=True)
+    ) | set(EmptyLeg.objects.values_list('aircraft_id', flat=True))
+    totals = [0, 0, 0]
+    for aircraft_id in sorted(ids):
+        for i, n in enumerate(refresh_empty_legs(aircraft_id)):
+            totals[i] += n
+    return tuple(totals)
+
+
+# ── Signal receivers ──────────────────────────────────────────────────────────
+def booking_changed(sender, instance, raw=False, **kwargs):
+    """post_save / post_delete on MarketplaceBooking."""
+    if raw:
+        return
+    ids = {instance.aircraft_id}
+    # A booking moved to another aircraft leaves legs behind on the old one
+    ids.update(
+        EmptyLeg.objects.filter(source_booking_id=instance.pk)
+        .exclude(aircraft_id=instance.aircraft_id)
+        .values_list('aircraft_id', flat=True)
+    )
+    for aircraft_id in ids:
+        refresh_empty_legs(aircraft_id)
+
+
+def aircraft_changed(sender, instance, created, raw=False, **kwargs):
+    """post_save on MarketplaceAircraft — base, speed or rate feed into the legs."""
+    if raw or created:
+        return
+    refresh_empty_legs(instance.pk)
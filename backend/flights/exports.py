@@ -0,0 +1,151 @@
+# flights/exports.py
+"""
+Streaming CSV / JSON Lines exports.
+
+An export is a values_list() projection of a queryset, read with
+.iterator(chunk_size=…) and written out row by row through a
+StreamingHttpResponse. Memory stays flat however many rows are exported:
+no model instances, no result cache, and on PostgreSQL the rows come off
+a server-side cursor a chunk at a time.
+
+Used by the admin export endpoint (/admin/exports/<dataset>/) and by the
+Django admin "Export" actions.
+"""
+import csv
+import json
+from datetime import date, datetime, time
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import FlightBooking, MarketplaceAircraft, MarketplaceBooking, Membership, PaymentRecord
+
+CHUNK_SIZE = 2000
+
+FORMATS = {
+    'csv':   ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson',    'jsonl'),
+}
+
+# dataset -> (model, [(column, lookup), ...])
+DATASETS = {
+    'flight-bookings': (FlightBooking, [
+        ('reference', 'reference'), ('created_at', 'created_at'), ('status', 'status'),
+        ('guest_name', 'guest_name'), ('guest_email', 'guest_email'), ('guest_phone', 'guest_phone'),
+        ('company', 'company'), ('trip_type', 'trip_type'),
+        ('origin', 'origin__code'), ('destination', 'destination__code'),
+        ('departure_date', 'departure_date'), ('departure_time', 'departure_time'),
+        ('return_date', 'return_date'), ('passenger_count', 'passenger_count'),
+        ('aircraft', 'aircraft__name'), ('quoted_price_usd', 'quoted_price_usd'),
+        ('commission_pct', 'commission_pct'), ('commission_usd', 'commission_usd'),
+        ('net_revenue_usd', 'net_revenue_usd'),
+    ]),
+    'marketplace-bookings': (MarketplaceBooking, [
+        ('reference', 'reference'), ('created_at', 'created_at'), ('status', 'status'),
+        ('client', 'client__username'), ('client_email', 'client__email'),
+        ('aircraft', 'aircraft__registration_number'), ('trip_type', 'trip_type'),
+        ('origin', 'origin'), ('destination', 'destination'),
+        ('departure_datetime', 'departure_datetime'), ('return_datetime', 'return_datetime'),
+        ('estimated_hours', 'estimated_hours'), ('passenger_count', 'passenger_count'),
+        ('gross_amount_usd', 'gross_amount_usd'), ('commission_pct', 'commission_pct'),
+        ('commission_usd', 'commission_usd'), ('net_owner_usd', 'net_owner_usd'),
+        ('discount_applied', 'discount_applied'), ('payment_status', 'payment_status'),
+    ]),
+    'payments': (PaymentRecord, [
+        ('reference', 'reference'), ('created_at', 'created_at'), ('status', 'status'),
+        ('payment_type', 'payment_type'), ('user', 'user__username'), ('user_email', 'user__email'),
+        ('booking', 'booking__reference'), ('membership', 'membership__reference'),
+        ('amount_usd', 'amount_usd'), ('currency', 'currency'),
+        ('stripe_payment_id', 'stripe_payment_id'), ('description', 'description'),
+    ]),
+    'marketplace-aircraft': (MarketplaceAircraft, [
+        ('id', 'id'), ('created_at', 'created_at'), ('status', 'status'),
+        ('registration_number', 'registration_number'), ('name', 'name'), ('model', 'model'),
+        ('category', 'category'), ('owner', 'owner__username'), ('base_location', 'base_location'),
+        ('passenger_capacity', 'passenger_capacity'), ('range_km', 'range_km'),
+        ('cruise_speed_kmh', 'cruise_speed_kmh'), ('hourly_rate_usd', 'hourly_rate_usd'),
+        ('is_approved', 'is_approved'), ('total_flight_hours', 'total_flight_hours'),
+        ('maintenance_hours_left', 'maintenance_hours_left'),
+    ]),
+    'memberships': (Membership, [
+        ('reference', 'reference'), ('created_at', 'created_at'), ('status', 'status'),
+        ('user', 'user__username'), ('user_email', 'user__email'), ('tier', 'tier__name'),
+        ('billing_cycle', 'billing_cycle'), ('start_date', 'start_date'), ('end_date', 'end_date'),
+        ('auto_renew', 'auto_renew'), ('amount_paid', 'amount_paid'),
+    ]),
+}
+
+
+def dataset_for(model):
+    return next(name for name, (m, _) in DATASETS.items() if m is model)
+
+
+def filter_rows(queryset, params):
+    """
+    Applies ?from= / ?to= (inclusive dates on created_at) and ?status=
+    (comma-separated). Raises ValueError on a malformed date.
+    """
+    for key, lookup in (('from', 'created_at__date__gte'), ('to', 'created_at__date__lte')):
+        if params.get(key):
+            day = parse_date(params[key])
+            if day is None:
+                raise ValueError(f'"{key}" must be a date (YYYY-MM-DD).')
+            queryset = queryset.filter(**{lookup: day})
+    if params.get('status'):
+        queryset = queryset.filter(status__in=[s.strip() for s in params['status'].split(',') if s.strip()])
+    return queryset
+
+
+def _cell(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return str(value)   # Decimal, UUID
+
+
+# Leading characters that make spreadsheet apps evaluate a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    """_cell() plus a leading ' on text that a spreadsheet would run as a formula."""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return _cell(value)
+
+
+class _Echo:
+    """File-like object whose write() hands the line straight back (csv.writer target)."""
+    def write(self, value):
+        return value
+
+
+def csv_lines(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_csv_cell(v) for v in row])
+
+
+def jsonl_lines(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, map(_cell, row))), separators=(',', ':')) + '\n'
+
+
+def export_response(queryset, dataset, fmt='csv', chunk_size=CHUNK_SIZE):
+    """StreamingHttpResponse of queryset, projected to the dataset's columns."""
+    _, columns = DATASETS[dataset]
+    content_type, extension = FORMATS[fmt]
+    headers = [name for name, _ in columns]
+    rows = (
+        queryset.order_by('created_at', 'pk')
+        .values_list(*[lookup for _, lookup in columns])
+        .iterator(chunk_size=chunk_size)
+    )
+    lines    = csv_lines(headers, rows) if fmt == 'csv' else jsonl_lines(headers, rows)
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    filename = f'{dataset}-{timezone.now():%Y%m%d-%H%M%S}.{extension}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,113 @@
+# flights/fleet.py
+"""
+"Which marketplace aircraft can fly this route on this date?"
+
+search_fleet() runs a fixed number of queries however large the fleet is:
+
+  1. candidates  — approved, available, visible to the member's tier, with
+                   range_km >= the great-circle distance and enough seats
+                   (one query, values() rows, no model instances);
+  2. discount    — the member's active tier discount;
+  3. calendars   — every blocking booking of every candidate that touches
+                   the requested day, in one query, grouped in Python.
+
+Hours, price and availability are then computed for all candidates in a
+single pass and the list is ranked by the member's price.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .availability import BLOCKING_STATUSES, TURNAROUND, booking_window, free_windows
+from .models import MarketplaceAircraft, MarketplaceBooking, Membership
+from .pricing import estimate_quote
+
+# Used when a listing has no cruise_speed_kmh
+DEFAULT_CRUISE_KMH = {
+    'light':         700,
+    'midsize':       780,
+    'super_midsize': 830,
+    'heavy':         870,
+    'ultra_long':    900,
+    'vip_airliner':  850,
+}
+
+FIELDS = [
+    'id', 'name', 'model', 'category', 'registration_number', 'base_location',
+    'passenger_capacity', 'range_km', 'cruise_speed_kmh', 'hourly_rate_usd', 'image_url',
+]
+
+
+def member_discount(user):
+    m = (
+        Membership.objects.filter(user=user).select_related('tier')
+        .only('status', 'end_date', 'tier__hourly_discount_pct').first()
+    )
+    return m.tier.hourly_discount_pct if m is not None and m.is_active else Decimal('0')
+
+
+def search_fleet(user, distance_km, day, passengers, departure_time=None, limit=20):
+    """
+    Ranked candidates for a flight of distance_km on `day` (a date). With
+    departure_time the aircraft must be free for that exact flight window;
+    without it, for any window of the flight's length during the day (UTC).
+    """
+    from .visibility import visible_to
+    if user.role == 'client':
+        qs = visible_to(user)
+    else:
+        qs = MarketplaceAircraft.objects.filter(is_approved=True, status='available')
+    rows = list(
+        qs.filter(range_km__gte=distance_km, passenger_capacity__gte=passengers)
+        .values(*FIELDS)
+    )
+    if not rows:
+        return [], Decimal('0')
+
+    discount   = member_discount(user)
+    multiplier = float(1 - discount / 100)
+    day_start  = timezone.make_aware(datetime.combine(day, time.min), dt_timezone.utc)
+    day_end    = day_start + timedelta(days=1)
+
+    busy = defaultdict(list)
+    for b in (
+        MarketplaceBooking.objects
+        .filter(aircraft_id__in=[r['id'] for r in rows], status__in=BLOCKING_STATUSES,
+                occupied_until__gt=day_start, occupied_from__lt=day_end + timedelta(days=1))
+        .order_by('occupied_from')
+        .values('aircraft_id', 'occupied_from', 'occupied_until')
+    ):
+        busy[b['aircraft_id']].append(b)
+
+    results = []
+    for r in rows:
+        cruise = r['cruise_speed_kmh'] or DEFAULT_CRUISE_KMH.get(r['category'], 800)
+        hours, list_price = estimate_quote(distance_km, cruise, r['hourly_rate_usd'])
+        if departure_time is not None:
+            start = timezone.make_aware(datetime.combine(day, departure_time), dt_timezone.utc)
+            _, end = booking_window(start, None, hours)
+            if any(b['occupied_from'] < end and b['occupied_until'] > start for b in busy[r['id']]):
+                continue
+            earliest = start
+        else:
+            needed = timedelta(hours=hours) + TURNAROUND
+            earliest = next(
+                (s for s, e in free_windows(busy[r['id']], day_start, day_end + needed) if e - s >= needed and s < day_end),
+                None,
+            )
+            if earliest is None:
+                continue
+        results.append({
+            **r,
+            'hourly_rate_usd':       float(r['hourly_rate_usd']),
+            'cruise_speed_kmh':      cruise,
+            'estimated_hours':       round(hours, 1),
+            'earliest_departure':    earliest,
+            'list_price_usd':        round(list_price, 0),
+            'member_price_usd':      round(list_price * multiplier, 0),
+        })
+
+    results.sort(key=lambda r: (r['member_price_usd'], r['id']))
+    return results[:limit], discount
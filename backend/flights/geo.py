@@ -0,0 +1,203 @@
+# flights/geo.py
+"""
+In-memory great-circle distances between airports.
+
+Airport coordinates rarely move, so instead of re-reading both rows on
+every quote we keep one process-local index of all airports keyed by id,
+with the trig terms precomputed per airport. A distance is then a handful
+of float operations; pairs are not memoised, since an import can load
+~70k airports and the pair space would grow without bound.
+
+Nearest-airport and radius queries go through a k-d tree over each airport's
+unit vector on the sphere; straight-line (chord) distance between unit
+vectors orders points exactly like great-circle distance, and avoids any
+special-casing of the poles or the antimeridian.
+
+The index is built lazily on first use and dropped by the Airport
+post_save / post_delete signals (see flights/signals.py), which also bump
+a shared version so other workers rebuild too (see cache_versions.py).
+An index older than AIRPORT_INDEX_MAX_AGE_SECONDS is rebuilt regardless.
+"""
+import heapq
+import math
+import threading
+import time
+
+from django.conf import settings
+
+from .cache_versions import bump_version, current_version
+
+EARTH_RADIUS_KM = 6371
+
+MAX_AGE_SECONDS = getattr(settings, 'AIRPORT_INDEX_MAX_AGE_SECONDS', 300)
+VERSION_KEY     = 'flights:geo:airport_index:version'
+
+
+def _unit_vector(lat_rad, lon_rad, cos_lat):
+    return (cos_lat * math.cos(lon_rad), cos_lat * math.sin(lon_rad), math.sin(lat_rad))
+
+
+def _chord_to_km(chord):
+    return EARTH_RADIUS_KM * 2 * math.asin(min(chord / 2, 1.0))
+
+
+def _km_to_chord(km):
+    return 2 * math.sin(min(km / EARTH_RADIUS_KM, math.pi) / 2)
+
+
+class _KDTree:
+    """Static 3-d tree over (x, y, z, airport_id) points."""
+
+    def __init__(self, points):
+        self._nodes = []   # (point, axis, left, right)
+        self._root  = self._build(list(points), 0)
+
+    def _build(self, points, depth):
+        if not points:
+            return -1
+        axis = depth % 3
+        points.sort(key=lambda p: p[axis])
+        mid = len(points) // 2
+        slot = len(self._nodes)
+        self._nodes.append(None)
+        left  = self._build(points[:mid], depth + 1)
+        right = self._build(points[mid + 1:], depth + 1)
+        self._nodes[slot] = (points[mid], axis, left, right)
+        return slot
+
+    def query(self, target, k, max_chord):
+        """Up to k (chord, airport_id) pairs within max_chord, nearest first."""
+        best  = []   # max-heap of (-chord², id)
+        limit = max_chord * max_chord
+        stack = [self._root]
+        while stack:
+            slot = stack.pop()
+            if slot < 0:
+                continue
+            point, axis, left, right = self._nodes[slot]
+            d2 = ((point[0] - target[0]) ** 2 + (point[1] - target[1]) ** 2
+                  + (point[2] - target[2]) ** 2)
+            if d2 <= limit:
+                if len(best) < k:
+                    heapq.heappush(best, (-d2, point[3]))
+                elif d2 < -best[0][0]:
+                    heapq.heapreplace(best, (-d2, point[3]))
+                if len(best) == k:
+                    limit = min(limit, -best[0][0])
+            diff = target[axis] - point[axis]
+            near, far = (left, right) if diff < 0 else (right, left)
+            # Visit the near side last so it is popped first
+            if diff * diff <= limit:
+                stack.append(far)
+            stack.append(near)
+        return sorted((math.sqrt(-d2), pk) for d2, pk in best)
+
+
+class AirportIndex:
+    """Airport rows by id plus precomputed trig terms for great-circle distances."""
+
+    def __init__(self, airports, version=None):
+        self.airports = {}
+        self.version  = version
+        self.built_at = time.monotonic()
+        self._coords  = {}   # id -> (lat_rad, lon_rad, cos_lat)
+        self._tree    = None
+        self._codes   = None
+        for airport in airports:
+            self.airports[airport.id] = airport
+            # 0.0 is a real coordinate (the equator, Greenwich); only missing ones are skipped
+            if airport.latitude is not None and airport.longitude is not None:
+                lat = math.radians(float(airport.latitude))
+                lon = math.radians(float(airport.longitude))
+                self._coords[airport.id] = (lat, lon, math.cos(lat))
+
+    def __len__(self):
+        return len(self.airports)
+
+    def get(self, airport_id):
+        return self.airports.get(airport_id)
+
+    def get_by_code(self, code):
+        """Airport by IATA / ICAO code (case-insensitive), or None."""
+        if self._codes is None:
+            self._codes = {a.code.upper(): a for a in self.airports.values()}
+        return self._codes.get((code or '').strip().upper())
+
+    def has_coordinates(self, airport_id):
+        return airport_id in self._coords
+
+    def is_current(self, version):
+        return self.version == version and time.monotonic() - self.built_at < MAX_AGE_SECONDS
+
+    def distance_km(self, origin_id, destination_id):
+        """Great-circle distance in km, or None if either airport lacks coordinates."""
+        a = self._coords.get(origin_id)
+        b = self._coords.get(destination_id)
+        if a is None or b is None:
+            return None
+        if origin_id == destination_id:
+            return 0.0
+        dlat = b[0] - a[0]
+        dlon = b[1] - a[1]
+        h = math.sin(dlat / 2) ** 2 + a[2] * b[2] * math.sin(dlon / 2) ** 2
+        return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(h), math.sqrt(1 - h))
+
+    def nearest(self, lat, lon, k=5, radius_km=None):
+        """
+        Up to k (airport, distance_km) pairs closest to (lat, lon), nearest
+        first, optionally limited to radius_km. Airports without coordinates
+        are never returned.
+        """
+        if self._tree is None:
+            self._tree = _KDTree(
+                _unit_vector(*c) + (pk,) for pk, c in self._coords.items()
+            )
+        lat_r, lon_r = math.radians(lat), math.radians(lon)
+        target = _unit_vector(lat_r, lon_r, math.cos(lat_r))
+        max_chord = _km_to_chord(radius_km) if radius_km is not None else 2.0
+        return [
+            (self.airports[pk], _chord_to_km(chord))
+            for chord, pk in self._tree.query(target, k, max_chord)
+        ]
+
+
+_index      = None
+_index_lock = threading.Lock()
+
+
+def get_airport_index():
+    """Return the current AirportIndex, building it from the DB if needed."""
+    global _index
+    version = current_version(VERSION_KEY)
+    index   = _index
+    if index is None or not index.is_current(version):
+        with _index_lock:
+            index = _index
+            if index is None or not index.is_current(version):
+                from .models import Airport
+                index = _index = AirportIndex(Airport.objects.all(), version)
+    return index
+
+
+def invalidate_airport_index(**kwargs):
+    """Signal receiver — drop the index here and, on commit, in every other worker."""
+    global _index
+    _index = None
+    bump_version(VERSION_KEY)
+
+
+def resolve_airport(value):
+    """Airport for a numeric id or an airport code from request data, or None."""
+    index = get_airport_index()
+    try:
+        return index.get(int(value))
+    except (TypeError, ValueError):
+        return index.get_by_code(value) if isinstance(value, str) else None
+
+
+def resolve_airport_id(value):
+    """Coerce an id from request data (str / int) to int, or raise ValueError."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Field 'id' expected a number but got {value!r}.")
@@ -0,0 +1,129 @@
+# flights/importers.py
+"""
+Bulk CSV upserts for reference data (airports, the charter fleet).
+
+The file is read row by row; each row is coerced to the model's field
+types and diffed in memory against the existing rows, keyed on a natural
+key (Airport.code, Aircraft.name). Only new and changed rows are written,
+in batches, through bulk_create(update_conflicts=True) — a few statements
+per batch instead of update_or_create's two queries per row.
+
+bulk_create() sends no post_save signals, so callers drop any caches that
+mirror the imported table themselves.
+"""
+import csv
+import json
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+
+BATCH_SIZE = 1000
+
+
+@dataclass
+class ImportResult:
+    inserted:   int = 0
+    updated:    int = 0
+    unchanged:  int = 0
+    duplicates: int = 0
+    skipped:    int = 0
+
+
+def coerce(field, raw):
+    """
+    CSV string -> the value the database hands back for `field`. Raises
+    ValidationError for a blank value in a NOT NULL column with no default,
+    and for text over max_length.
+    """
+    raw = raw.strip() if isinstance(raw, str) else raw
+    if raw in ('', None):
+        if field.null:
+            return None
+        default = field.get_default()     # '' for text columns
+        if default is None:
+            raise ValidationError(f'{field.name} is required.')
+        return default
+    if isinstance(field, models.JSONField):
+        return json.loads(raw) if raw[:1] in '[{"' else [v.strip() for v in raw.split('|') if v.strip()]
+    if isinstance(field, models.BooleanField):
+        return raw.lower() in ('1', 'true', 'yes', 'y', 't')
+    value = field.to_python(raw)
+    if isinstance(field, models.DecimalField):
+        value = value.quantize(Decimal(1).scaleb(-field.decimal_places), rounding=ROUND_HALF_UP)
+    elif isinstance(field, models.CharField) and field.max_length and len(value) > field.max_length:
+        raise ValidationError(f'{field.name} is longer than {field.max_length} characters.')
+    return value
+
+
+def upsert(model, rows, key, fields, batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Upserts an iterable of {field: raw string} dicts into `model`, matching
+    on `key`. Rows whose key already appeared earlier in the file are
+    counted as duplicates and ignored, rows with a blank key are skipped.
+    Raises ValidationError on a value that cannot be coerced, a blank
+    required value or text that does not fit, naming the offending row.
+    """
+    meta     = model._meta
+    pk_name  = meta.pk.name
+    columns  = [meta.get_field(name) for name in fields]
+    existing = {
+        values[1]: (values[0], values[2:])
+        for values in model.objects.values_list(pk_name, key, *fields).iterator(chunk_size=5000)
+    }
+    result = ImportResult()
+    seen   = set()
+    batch  = []
+
+    def flush():
+        if batch and not dry_run:
+            model.objects.bulk_create(
+                batch, update_conflicts=True,
+                unique_fields=[pk_name], update_fields=[f for f in fields if f != key],
+            )
+        batch.clear()
+
+    with transaction.atomic():
+        for line, row in enumerate(rows, start=2):
+            if not (row.get(key) or '').strip():
+                result.skipped += 1
+                continue
+            try:
+                values = tuple(coerce(field, row.get(field.name)) for field in columns)
+            except ValidationError as exc:
+                raise ValidationError(f"Row {line}: {' '.join(exc.messages)}")
+            except (ValueError, ArithmeticError) as exc:
+                raise ValidationError(f'Row {line}: {exc}')
+            code = values[fields.index(key)]
+            if code in seen:
+                result.duplicates += 1
+                continue
+            seen.add(code)
+
+            current = existing.get(code)
+            if current is None:
+                batch.append(model(**dict(zip(fields, values))))
+                result.inserted += 1
+            elif current[1] != values:
+                batch.append(model(**{pk_name: current[0]}, **dict(zip(fields, values))))
+                result.updated += 1
+            else:
+                result.unchanged += 1
+
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+    return result
+
+
+def read_header(path):
+    """Column names from the first line of a CSV file."""
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        return [name.strip() for name in next(csv.reader(handle), [])]
+
+
+def read_csv(path):
+    """Yields one dict per CSV row, streaming from disk."""
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        yield from csv.DictReader(handle)
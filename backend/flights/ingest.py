@@ -0,0 +1,98 @@
+# flights/ingest.py
+"""
+Bulk flight-hours ingestion from the ops system.
+
+A batch is a list of {record_id, registration_number, hours, timestamp}
+records, posted as JSON or uploaded as CSV / JSON lines. The whole batch is
+applied in one transaction:
+
+  1. insert a FlightHoursEntry per record (ignoring record_ids already
+     stored — that is what makes re-sending a batch safe), tagged with a
+     fresh batch id;
+  2. read back which records this batch actually inserted;
+  3. add their hours to each aircraft with a single F()-based UPDATE.
+
+That UPDATE skips save(), so it stamps updated_at itself and the batch
+refreshes the touched aircraft's empty legs afterwards, as the post_save
+receiver would have.
+
+Aircraft rows are locked before their maintenance_hours_left is read, so
+concurrent batches cannot lose increments and each threshold crossing is
+reported by exactly one of them.
+"""
+import csv
+import io
+import json
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, Value, When
+from django.utils import timezone
+
+from .empty_legs import refresh_empty_legs
+from .models import FlightHoursEntry, MarketplaceAircraft
+
+MAX_RECORDS = 10000
+
+
+def parse_upload(upload):
+    """Records from an uploaded CSV (with header row) or JSON-lines file."""
+    text = upload.read().decode('utf-8-sig')
+    name = (getattr(upload, 'name', '') or '').lower()
+    if name.endswith(('.jsonl', '.ndjson', '.json')) or text.lstrip().startswith('{'):
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def ingest(records, user=None):
+    """
+    Apply validated records (dicts with record_id, aircraft_id, hours,
+    timestamp). Returns (applied_count, duplicate_count, crossed) where
+    crossed lists aircraft that reached their maintenance interval in
+    this batch.
+    """
+    batch = uuid.uuid4()
+    seen, rows = set(), []
+    for r in records:
+        if r['record_id'] in seen:
+            continue
+        seen.add(r['record_id'])
+        rows.append(FlightHoursEntry(
+            record_id=r['record_id'], aircraft_id=r['aircraft_id'], hours=r['hours'],
+            flown_at=r['timestamp'], batch=batch, ingested_by=user,
+        ))
+    aircraft_ids = {row.aircraft_id for row in rows}
+
+    with transaction.atomic():
+        before = dict(
+            MarketplaceAircraft.objects.select_for_update()
+            .filter(id__in=aircraft_ids).order_by('id')
+            .values_list('id', 'maintenance_hours_left')
+        )
+        FlightHoursEntry.objects.bulk_create(rows, ignore_conflicts=True, batch_size=1000)
+        applied = FlightHoursEntry.objects.filter(batch=batch).values_list('aircraft_id', 'hours')
+
+        deltas = defaultdict(Decimal)
+        count  = 0
+        for aircraft_id, hours in applied:
+            deltas[aircraft_id] += hours
+            count += 1
+        if deltas:
+            MarketplaceAircraft.objects.filter(id__in=deltas).update(
+                total_flight_hours=F('total_flight_hours') + Case(
+                    *[When(id=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                    output_field=DecimalField(max_digits=10, decimal_places=1),
+                ),
+                updated_at=timezone.now(),
+            )
+        after = (
+            MarketplaceAircraft.objects.filter(id__in=deltas, maintenance_hours_left__lte=0)
+            .values('id', 'registration_number', 'name', 'total_flight_hours', 'maintenance_hours_left')
+        )
+        crossed = [a for a in after if before[a['id']] > 0]
+
+    for aircraft_id in sorted(deltas):
+        refresh_empty_legs(aircraft_id)
+    return count, len(records) - count, crossed
@@ -0,0 +1,91 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.pagination import Cursor
+from rest_framework.test import APIClient
+
+from flights.models import ContactInquiry, User
+from flights.pagination import AdminCursorPagination
+
+URL = '/api/v1/admin/contacts/'
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Benchmark a deep admin list page (offset vs cursor pagination) on "
+            "synthetic contact inquiries. Everything it creates is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--page', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rows, page, size = options['rows'], options['page'], options['page_size']
+        t0 = time.perf_counter()
+
+        # created_at is auto_now_add — switch that off so rows get distinct timestamps
+        created_at = ContactInquiry._meta.get_field('created_at')
+        created_at.auto_now_add = False
+        try:
+            start = timezone.now() - timedelta(seconds=rows)
+            ContactInquiry.objects.bulk_create([
+                ContactInquiry(full_name=f'Bench {i}', email=f'bench{i}@example.com',
+                               message='Benchmark', created_at=start + timedelta(seconds=i))
+                for i in range(rows)
+            ], batch_size=2000)
+        finally:
+            created_at.auto_now_add = True
+        admin = User.objects.create(username='bench-admin', role='admin')
+        self.stdout.write(f"Seeded {rows:,} contact inquiries in {time.perf_counter() - t0:.1f}s")
+
+        client = APIClient(SERVER_NAME='localhost')
+        client.force_authenticate(admin)
+
+        # The cursor a client reaches page `page` with: position = last row of the page before
+        before = (
+            ContactInquiry.objects.order_by('-created_at', '-id')
+            .values_list('created_at', flat=True)[(page - 1) * size - 1]
+        )
+        paginator = AdminCursorPagination()
+        paginator.base_url = f'http://localhost{URL}?page_size={size}'
+        cursor_url = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(before)))
+
+        def run(label, url):
+            timings, queries = [], 0
+            for _ in range(options['repeat']):
+                with CaptureQueriesContext(connection) as ctx:
+                    t = time.perf_counter()
+                    response = client.get(url)
+                    timings.append((time.perf_counter() - t) * 1000)
+                queries = len(ctx)
+                assert response.status_code == 200, response.status_code
+            self.stdout.write(
+                f"{label:<8} page {page:,}   median {statistics.median(timings):8.2f} ms   "
+                f"max {max(timings):8.2f} ms   queries {queries}"
+            )
+            return [r['id'] for r in response.data['results']]
+
+        offset = run('offset', f'{URL}?paginate=offset&page={page}&page_size={size}')
+        cursor = run('cursor', cursor_url)
+        if offset == cursor:
+            self.stdout.write(self.style.SUCCESS("Both paginators return the same rows for that page"))
+        else:
+            self.stdout.write(self.style.ERROR("Rows differ between the two paginators"))
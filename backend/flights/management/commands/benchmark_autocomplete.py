@@ -0,0 +1,66 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from flights.models import Airport
+from flights.search import AirportSearchIndex
+
+
+CITY_WORDS = ['nairobi', 'mombasa', 'london', 'new', 'york', 'san', 'jose', 'port',
+              'saint', 'lake', 'city', 'north', 'south', 'falls', 'springs', 'bay']
+NAME_WORDS = ['international', 'regional', 'municipal', 'airstrip', 'airfield',
+              'county', 'memorial', 'field', 'executive', 'airport']
+
+
+class Command(BaseCommand):
+    help = ("Benchmark AirportViewSet.autocomplete's in-memory index against a "
+            "synthetic airport table. Does not touch the database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--airports', type=int, default=10000)
+        parser.add_argument('--queries', type=int, default=20000)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        airports = []
+        for pk in range(1, options['airports'] + 1):
+            city = ' '.join(rng.sample(CITY_WORDS, 2)).title()
+            airports.append(Airport(
+                id=pk,
+                code=''.join(rng.choices(string.ascii_uppercase, k=3)),
+                name=f"{city} {' '.join(rng.sample(NAME_WORDS, 2)).title()}",
+                city=city,
+                country=rng.choice(['Kenya', 'USA', 'France', 'Brazil', 'Japan']),
+            ))
+
+        t0 = time.perf_counter()
+        index = AirportSearchIndex(airports)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        pool = [a.code for a in airports[:500]] + CITY_WORDS + NAME_WORDS
+        queries = []
+        for _ in range(options['queries']):
+            word = rng.choice(pool)
+            queries.append(word[:rng.randint(1, len(word))])
+
+        timings = []
+        for q in queries:
+            t = time.perf_counter()
+            index.search(q)
+            timings.append((time.perf_counter() - t) * 1000)
+        timings.sort()
+
+        def pct(p):
+            return timings[min(int(len(timings) * p / 100), len(timings) - 1)]
+
+        self.stdout.write(f"Airports: {len(airports):,}   queries: {len(queries):,}")
+        self.stdout.write(f"Index build: {build_ms:.1f} ms")
+        self.stdout.write(f"Lookup p50: {pct(50):.3f} ms   p95: {pct(95):.3f} ms   "
+                          f"p99: {pct(99):.3f} ms   max: {timings[-1]:.3f} ms")
+        if pct(99) < 2:
+            self.stdout.write(self.style.SUCCESS("p99 within the 2 ms target"))
+        else:
+            self.stdout.write(self.style.WARNING("p99 above the 2 ms target"))
@@ -0,0 +1,369 @@
+# flights/management/commands/benchmark_endpoints.py
+"""
+Latency / query-count baseline for every route on the API router.
+
+Usage:
+  python manage.py benchmark_endpoints [--iterations 20] [--output report.json]
+  python manage.py benchmark_endpoints --scale 100000          # seed first (rolled back)
+  python manage.py benchmark_endpoints --compare baseline.json [--threshold 1.5]
+
+Walks flights.urls.router: list, retrieve and every GET extra action of
+each registered viewset, plus the POSTs that only compute — quick-quote,
+quick-quote/batch and the admin price calculator. Write endpoints are not
+exercised. Each route is requested as the first
+of anonymous → member → fleet owner → admin that gets a 2xx, so public,
+member, owner and admin routes are all measured with the caller they are
+meant for.
+
+For every route the report records p50/p95/p99/max latency, SQL queries
+and rows fetched per request, and the response size. With --compare the
+command fails (CommandError) when a route's median latency (--metric)
+grows past --threshold × its baseline and by more than --min-delta-ms,
+when its query count grows, or when it stops answering 2xx.
+
+Runs in a transaction that is rolled back, including any --scale seeding.
+"""
+import gc
+import json
+import logging
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from flights.models import (
+    Aircraft, Airport, FlightBooking, MarketplaceAircraft, MarketplaceBooking, User, YachtCharter,
+)
+
+# Query strings for routes that need them; {placeholders} come from fixtures()
+QUERY = {
+    'airport-autocomplete':        'q=nai',
+    'airport-nearby':              'lat={lat}&lon={lon}',
+    'flight-booking-list':         'email={booking_email}',
+    'yacht-charter-list':          'email={charter_email}',
+    'marketplace-aircraft-search': 'origin={origin}&destination={destination}&date={date}&passengers=2',
+    'marketplace-bookings-track':  'reference={mp_reference}',
+    'admin-exports-detail':        'from={date}&to={date}',
+}
+# Detail routes whose key is not a primary key
+DETAIL_KEY = {
+    'admin-exports-detail': 'flight-bookings',
+}
+
+PERSONAS = ['anonymous', 'member', 'owner', 'admin']
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def measure(stats):
+    """Counts queries, DB time and fetched rows into `stats` while active."""
+    def wrapper(execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            stats['queries'] += 1
+            stats['db_ms']   += (time.perf_counter() - started) * 1000
+
+    def counting(name):
+        def fetch(self, *args):
+            result = getattr(self.cursor, name)(*args)
+            if name == 'fetchone':
+                stats['rows'] += result is not None
+            else:
+                stats['rows'] += len(result)
+            return result
+        return fetch
+
+    patched = {name: CursorWrapper.__dict__.get(name) for name in ('fetchone', 'fetchmany', 'fetchall')}
+    for name in patched:
+        setattr(CursorWrapper, name, counting(name))
+    try:
+        with connection.execute_wrapper(wrapper):
+            yield stats
+    finally:
+        for name, original in patched.items():
+            if original is None:
+                delattr(CursorWrapper, name)
+            else:
+                setattr(CursorWrapper, name, original)
+
+
+@contextmanager
+def quiet_request_log():
+    """The 401/403s from persona probing are expected; keep them out of the output."""
+    logger = logging.getLogger('django.request')
+    level  = logger.level
+    logger.setLevel(logging.ERROR)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def model_of(viewset, user):
+    """The model behind a viewset, asking get_queryset() (as `user`) when there is no .queryset."""
+    queryset = getattr(viewset, 'queryset', None)
+    if queryset is None:
+        request      = Request(APIRequestFactory().get('/'))
+        request.user = user
+        try:
+            queryset = viewset(action='retrieve', request=request, args=(), kwargs={},
+                               format_kwarg=None).get_queryset()
+        except Exception:
+            return None
+    return queryset.model
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct / 100), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = ("Benchmark every API router route (plus quick-quote): latency percentiles, "
+            "queries and rows per request; optionally compare against a baseline report.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per route')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per route first')
+        parser.add_argument('--scale', type=int, default=0,
+                            help='Seed ~N synthetic rows first (seed_data --scale), rolled back afterwards')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--only', help='Only routes whose path contains this string')
+        parser.add_argument('--output', help='Write the JSON report here')
+        parser.add_argument('--compare', help='Baseline JSON report to check for regressions')
+        parser.add_argument('--metric', default='p50_ms', choices=['p50_ms', 'p95_ms', 'p99_ms'],
+                            help='Latency percentile --compare checks (p50 is the least noisy)')
+        parser.add_argument('--threshold', type=float, default=1.5,
+                            help='Fail when the metric exceeds baseline × this')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Ignore latency regressions smaller than this many ms')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                if options['scale']:
+                    from flights.synthetic import SyntheticDataset
+                    self.stdout.write(f"Seeding ~{options['scale']:,} synthetic rows...")
+                    SyntheticDataset(options['scale'], seed=options['seed'], log=lambda line: None).generate()
+                with quiet_request_log():
+                    self.report = self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+        report = self.report
+        self.print_table(report)
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+        if options['compare']:
+            self.compare(report, options)
+
+    # ── Setup ─────────────────────────────────────────────────────────────────
+    def personas(self):
+        booking = MarketplaceBooking.objects.order_by('-pk').values('client_id', 'aircraft__owner_id').first() or {}
+        member  = (User.objects.filter(pk=booking.get('client_id')).first()
+                   or User.objects.filter(role='client', membership__isnull=False).first()
+                   or User.objects.create(username='bench-member', role='client'))
+        owner   = (User.objects.filter(pk=booking.get('aircraft__owner_id')).first()
+                   or User.objects.filter(role='owner').first()
+                   or User.objects.create(username='bench-owner', role='owner'))
+        admin   = User.objects.create(username='bench-admin', role='admin', is_staff=True)
+        return {'anonymous': None, 'member': member, 'owner': owner, 'admin': admin}
+
+    def fixtures(self):
+        airports = list(Airport.objects.filter(latitude__isnull=False).order_by('pk')[:2])
+        if len(airports) < 2:
+            raise CommandError('Benchmarking needs at least two airports with coordinates — run seed_data.')
+        booking  = FlightBooking.objects.order_by('-pk').first()
+        charter  = YachtCharter.objects.order_by('-pk').first()
+        mp       = MarketplaceBooking.objects.order_by('-pk').first()
+        return {
+            'lat':           airports[0].latitude,
+            'lon':           airports[0].longitude,
+            'origin':        airports[0].code,
+            'destination':   airports[1].code,
+            'origin_id':     airports[0].pk,
+            'destination_id': airports[1].pk,
+            'aircraft_id':   Aircraft.objects.values_list('pk', flat=True).first(),
+            'booking_email': booking.guest_email if booking else 'nobody@example.com',
+            'charter_email': charter.guest_email if charter else 'nobody@example.com',
+            'mp_reference':  mp.reference if mp else '',
+            'date':          timezone.now().date().isoformat(),
+        }
+
+    def routes(self, fx, admin):
+        """(name, method, path, body) for every benchmarked route."""
+        from flights.urls import router
+
+        routes = []
+        for prefix, viewset, basename in router.registry:
+            model = model_of(viewset, admin)
+            if model is MarketplaceAircraft:
+                pk = MarketplaceAircraft.objects.filter(is_approved=True).values_list('pk', flat=True).first()
+            else:
+                pk = model.objects.order_by('-pk').values_list('pk', flat=True).first() if model else None
+            reference = None
+            if model is not None and any(f.name == 'reference' for f in model._meta.fields):
+                reference = model.objects.order_by('-pk').values_list('reference', flat=True).first()
+
+            candidates = []
+            if hasattr(viewset, 'list'):
+                candidates.append((f'{basename}-list', {}))
+            if hasattr(viewset, 'retrieve'):
+                candidates.append((f'{basename}-detail', {'pk': DETAIL_KEY.get(f'{basename}-detail', pk)}))
+            for extra in viewset.get_extra_actions():
+                if 'get' not in extra.mapping:
+                    continue
+                kwargs = {'pk': pk} if extra.detail else {}
+                if '(?P<reference>' in extra.url_path:
+                    kwargs['reference'] = reference
+                candidates.append((f'{basename}-{extra.url_name}', kwargs))
+
+            for name, kwargs in candidates:
+                if any(v is None for v in kwargs.values()):
+                    self.stdout.write(self.style.WARNING(f'  skip {name}: no row to address'))
+                    continue
+                try:
+                    path = reverse(name, kwargs=kwargs)
+                except NoReverseMatch:
+                    continue
+                query = QUERY.get(name)
+                if query:
+                    path += '?' + query.format(**fx)
+                routes.append((name, 'GET', path, None))
+
+        if fx['aircraft_id']:
+            routes.append(('quick-quote', 'POST', reverse('quick-quote'), {
+                'origin': fx['origin_id'], 'destination': fx['destination_id'], 'aircraft': fx['aircraft_id'],
+            }))
+        routes.append(('quick-quote-batch', 'POST', reverse('quick-quote-batch'), {
+            'routes': [{'origin': fx['origin_id'], 'destination': fx['destination_id']},
+                       {'origin': fx['destination_id'], 'destination': fx['origin_id']}],
+        }))
+        routes.append(('admin-price-calc-calculate', 'POST', reverse('admin-price-calc-calculate'), {
+            'hourly_rate_usd': '5000.00', 'estimated_hours': '2.5', 'passenger_count': 4, 'catering': True,
+        }))
+        return routes
+
+    # ── Benchmark ─────────────────────────────────────────────────────────────
+    def request(self, api, method, path, body):
+        if method == 'POST':
+            response = api.post(path, body, format='json')
+        else:
+            response = api.get(path)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        return response.status_code, size
+
+    def run(self, options):
+        personas = self.personas()
+        clients  = {}
+        for label, user in personas.items():
+            clients[label] = APIClient(SERVER_NAME='localhost')
+            if user is not None:
+                clients[label].force_authenticate(user)
+
+        fx      = self.fixtures()
+        results = {}
+        for name, method, path, body in self.routes(fx, personas['admin']):
+            if options['only'] and options['only'] not in path:
+                continue
+            # First persona that gets a 2xx; otherwise the last one tried
+            for persona in PERSONAS:
+                status, _ = self.request(clients[persona], method, path, body)
+                if status < 400:
+                    break
+            api = clients[persona]
+            for _ in range(options['warmup']):
+                self.request(api, method, path, body)
+
+            timings, queries, rows, db_ms = [], [], [], []
+            gc.collect()
+            gc.disable()   # keep collector pauses out of the timings
+            try:
+                for _ in range(options['iterations']):
+                    stats = {'queries': 0, 'rows': 0, 'db_ms': 0.0}
+                    with measure(stats):
+                        started = time.perf_counter()
+                        status, size = self.request(api, method, path, body)
+                        timings.append((time.perf_counter() - started) * 1000)
+                    queries.append(stats['queries'])
+                    rows.append(stats['rows'])
+                    db_ms.append(stats['db_ms'])
+            finally:
+                gc.enable()
+
+            results[f'{method} {path.split("?")[0]}'] = {
+                'name':    name,
+                'persona': persona,
+                'status':  status,
+                'p50_ms':  round(percentile(timings, 50), 3),
+                'p95_ms':  round(percentile(timings, 95), 3),
+                'p99_ms':  round(percentile(timings, 99), 3),
+                'max_ms':  round(max(timings), 3),
+                'db_ms':   round(statistics.median(db_ms), 3),
+                'queries': max(queries),
+                'rows':    max(rows),
+                'bytes':   size,
+            }
+        return {
+            'generated_at': timezone.now().isoformat(),
+            'vendor':       connection.vendor,
+            'iterations':   options['iterations'],
+            'scale':        options['scale'] or None,
+            'routes':       results,
+        }
+
+    # ── Output ────────────────────────────────────────────────────────────────
+    def print_table(self, report):
+        self.stdout.write(f"{'route':<62} {'as':<9} {'st':>3} {'p50':>8} {'p95':>8} {'q':>4} {'rows':>6}")
+        for route, r in sorted(report['routes'].items()):
+            line = (f"{route[:62]:<62} {r['persona']:<9} {r['status']:>3} {r['p50_ms']:>8.2f} "
+                    f"{r['p95_ms']:>8.2f} {r['queries']:>4} {r['rows']:>6}")
+            self.stdout.write(self.style.ERROR(line) if r['status'] >= 400 else line)
+        self.stdout.write(f"{len(report['routes'])} routes, {report['iterations']} requests each")
+
+    def compare(self, report, options):
+        try:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)['routes']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f"Cannot read baseline {options['compare']}: {exc}")
+
+        regressions = []
+        for route, now in sorted(report['routes'].items()):
+            before = baseline.get(route)
+            if before is None:
+                continue
+            if before['status'] < 400 <= now['status']:
+                regressions.append(f"{route}: status {before['status']} → {now['status']}")
+            if now['queries'] > before['queries']:
+                regressions.append(f"{route}: queries {before['queries']} → {now['queries']}")
+            metric = options['metric']
+            if (now[metric] > before[metric] * options['threshold']
+                    and now[metric] - before[metric] > options['min_delta_ms']):
+                regressions.append(f"{route}: {metric[:3]} {before[metric]:.2f} → {now[metric]:.2f} ms")
+
+        missing = sorted(set(baseline) - set(report['routes']))
+        if missing and not options['only']:
+            self.stdout.write(self.style.WARNING(f"Not in this run: {', '.join(missing)}"))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against {options["compare"]}:\n'
+                               + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}"))
@@ -0,0 +1,113 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from flights.models import MarketplaceAircraft, Membership, MembershipTier, User
+from flights.visibility import refresh_tier_masks, visible_to
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Benchmark client marketplace visibility (tier_mask lookup vs the old "
+            "exclusive_tiers OR-join) on synthetic data. Everything it creates is "
+            "rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--aircraft', type=int, default=10000)
+        parser.add_argument('--members', type=int, default=50000)
+        parser.add_argument('--queries', type=int, default=50)
+        parser.add_argument('--baseline-queries', type=int, default=3,
+                            help='Members timed against the old OR-join, which is slow at this size')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        t0 = time.perf_counter()
+
+        tiers = []
+        for name, label in MembershipTier.TIER_CHOICES:
+            tier, _ = MembershipTier.objects.get_or_create(
+                name=name, defaults={'display_name': label, 'monthly_fee_usd': 0, 'annual_fee_usd': 0},
+            )
+            tiers.append(tier)
+
+        owner = User.objects.create(username='bench-owner', role='owner')
+        aircraft = MarketplaceAircraft.objects.bulk_create([
+            MarketplaceAircraft(
+                owner=owner, name=f'Bench {i}', model='Bench', category='light',
+                registration_number=f'BENCH-{i:06d}', base_location='NBO',
+                passenger_capacity=8, range_km=3000, hourly_rate_usd=4000,
+                is_approved=rng.random() < 0.9,
+                status=rng.choice(['available'] * 4 + ['maintenance']),
+            )
+            for i in range(options['aircraft'])
+        ], batch_size=1000)
+        Through = MarketplaceAircraft.exclusive_tiers.through
+        links = [
+            Through(marketplaceaircraft_id=a.id, membershiptier_id=t.id)
+            for a in aircraft if rng.random() < 0.3
+            for t in rng.sample(tiers, rng.randint(1, 2))
+        ]
+        Through.objects.bulk_create(links, batch_size=1000)
+        refresh_tier_masks([a.id for a in aircraft])
+
+        members = User.objects.bulk_create([
+            User(username=f'bench-member-{i}', password='!', role='client')
+            for i in range(options['members'])
+        ], batch_size=1000)
+        Membership.objects.bulk_create([
+            Membership(user=u, tier=rng.choice(tiers), status='active') for u in members
+        ], batch_size=1000)
+        self.stdout.write(f"Seeded {len(aircraft):,} aircraft ({len(links):,} tier links), "
+                          f"{len(members):,} members in {time.perf_counter() - t0:.1f}s")
+
+        sample = rng.sample(members, min(options['queries'], len(members)))
+
+        def old_rule(user):
+            return MarketplaceAircraft.objects.filter(
+                is_approved=True, status='available'
+            ).exclude(
+                exclusive_tiers__isnull=False
+            ) | MarketplaceAircraft.objects.filter(
+                is_approved=True, status='available',
+                exclusive_tiers__membership__user=user
+            )
+
+        def run(label, build, users):
+            timings, rows, queries, seen = [], 0, 0, {}
+            for user in users:
+                with CaptureQueriesContext(connection) as ctx:
+                    t = time.perf_counter()
+                    ids = list(build(user).values_list('id', flat=True))
+                    timings.append((time.perf_counter() - t) * 1000)
+                rows    += len(ids)
+                queries += len(ctx)
+                seen[user.id] = set(ids)
+            self.stdout.write(
+                f"{label:<16} median {statistics.median(timings):8.2f} ms   "
+                f"max {max(timings):8.2f} ms   rows/member {rows / len(users):8.1f}   "
+                f"queries/member {queries / len(users):.0f}   ({len(users)} members)"
+            )
+            return seen
+
+        old = run('exclusive_tiers', old_rule, sample[:options['baseline_queries']])
+        new = run('tier_mask', visible_to, sample)
+        if all(new[pk] == ids for pk, ids in old.items()):
+            self.stdout.write(self.style.SUCCESS("Both rules return the same listings for every member"))
+        else:
+            self.stdout.write(self.style.ERROR("Visible listings differ between the two rules"))
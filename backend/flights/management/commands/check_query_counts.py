@@ -0,0 +1,119 @@
+# flights/management/commands/check_query_counts.py
+"""
+Fail when a list endpoint's query count grows with the number of rows it
+serializes — the N+1 pattern of a serializer walking a relation the
+viewset did not select_related / prefetch_related.
+
+Usage:
+  python manage.py check_query_counts [--small 2] [--large 20] [--scale 20000]
+
+For every router viewset with a list action, and for each caller whose
+queryset differs (member, fleet owner, admin), the viewset's own
+get_queryset() is sliced to --small and to --large rows and run through
+its list serializer. Both must cost the same number of queries. Viewsets
+with fewer than --large rows for a caller are reported and skipped, so
+run it against a seeded database (or pass --scale, which seeds synthetic
+data inside the transaction that is rolled back afterwards).
+
+flights.tests.ListQueryCountTests runs the same comparison under
+manage.py test.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from flights.models import MarketplaceBooking, User
+
+PERSONAS = ['admin', 'owner', 'member']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Serialize every list endpoint's queryset at two page sizes and fail when "
+            "the query count differs (N+1). Runs in a rolled-back transaction.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--small', type=int, default=2, help='Rows in the small page')
+        parser.add_argument('--large', type=int, default=20, help='Rows in the large page')
+        parser.add_argument('--scale', type=int, default=0,
+                            help='Seed ~N synthetic rows first (seed_data --scale), rolled back afterwards')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if not 0 < options['small'] < options['large']:
+            raise CommandError('--small must be positive and smaller than --large.')
+        self.failures = []
+        try:
+            with transaction.atomic():
+                if options['scale']:
+                    from flights.synthetic import SyntheticDataset
+                    self.stdout.write(f"Seeding ~{options['scale']:,} synthetic rows...")
+                    SyntheticDataset(options['scale'], seed=options['seed'], log=lambda line: None).generate()
+                self.run(options['small'], options['large'])
+                raise Rollback
+        except Rollback:
+            pass
+        if self.failures:
+            raise CommandError(
+                f"{len(self.failures)} list endpoint{'s' if len(self.failures) != 1 else ''} "
+                f"with per-row queries:\n" + '\n'.join(self.failures)
+            )
+        self.stdout.write(self.style.SUCCESS('Query counts are independent of page size'))
+
+    def personas(self):
+        booking = MarketplaceBooking.objects.order_by('-pk').values('client_id', 'aircraft__owner_id').first() or {}
+        member  = (User.objects.filter(pk=booking.get('client_id')).first()
+                   or User.objects.filter(role='client', membership__isnull=False).first()
+                   or User.objects.create(username='nplus1-member', role='client'))
+        owner   = (User.objects.filter(pk=booking.get('aircraft__owner_id')).first()
+                   or User.objects.filter(role='owner').first()
+                   or User.objects.create(username='nplus1-owner', role='owner'))
+        admin   = User.objects.create(username='nplus1-admin', role='admin', is_staff=True)
+        return {'member': member, 'owner': owner, 'admin': admin}
+
+    def count(self, view, rows):
+        """Queries needed to fetch `rows` rows of the view's queryset and serialize them."""
+        with CaptureQueriesContext(connection) as ctx:
+            page = list(view.get_queryset()[:rows])
+            view.get_serializer(page, many=True).data
+        return len(ctx.captured_queries), len(page)
+
+    def list_views(self):
+        """(label, view) for every router list endpoint and distinct caller queryset."""
+        from flights.urls import router
+
+        personas = self.personas()
+        for prefix, viewset, basename in router.registry:
+            if not hasattr(viewset, 'list') or not hasattr(viewset, 'get_serializer'):
+                continue
+            seen = set()
+            for persona in PERSONAS:
+                request      = Request(APIRequestFactory().get('/'))
+                request.user = personas[persona]
+                view = viewset(action='list', request=request, args=(), kwargs={}, format_kwarg=None)
+                try:
+                    sql = str(view.get_queryset().query)
+                except Exception:
+                    continue           # this caller has no queryset here (e.g. wrong role)
+                if sql in seen:
+                    continue
+                seen.add(sql)
+                yield f'{basename} as {persona}', view
+
+    def run(self, small, large):
+        for label, view in self.list_views():
+            few, _     = self.count(view, small)
+            many, rows = self.count(view, large)
+            if rows < large:
+                self.stdout.write(self.style.WARNING(f'{label:<40} skipped: only {rows} rows'))
+                continue
+            if many != few:
+                self.failures.append(f'  {label}: {few} queries for {small} rows, {many} for {large}')
+                self.stdout.write(self.style.ERROR(f'{label:<40} {few:>3} → {many} queries'))
+            else:
+                self.stdout.write(self.style.SUCCESS(f'{label:<40} {few:>3} queries'))
@@ -0,0 +1,251 @@
+# flights/management/commands/check_query_plans.py
+"""
+EXPLAIN every query the hot endpoints run against a large seeded dataset
+and fail if any of them reads a big table with a sequential scan.
+
+Usage:
+  python manage.py check_query_plans [--rows 20000] [--verbose]
+
+Everything it seeds is rolled back. Exits non-zero (CommandError) when a
+plan contains a full table scan — SQLite `SCAN <table>` without an index,
+PostgreSQL `Seq Scan on <table>` — on one of the seeded tables. Index-only
+scans (e.g. counting a whole table through a covering index) are fine.
+
+flights.tests.QueryPlanTests runs it (smaller seed) as part of the suite.
+"""
+import random
+import re
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from flights.models import (
+    Airport, User, MembershipTier, Membership, MarketplaceAircraft, MarketplaceBooking,
+    MaintenanceLog, Dispute, FlightBooking, YachtCharter, LeaseInquiry, FlightInquiry,
+    ContactInquiry, GroupCharterInquiry, AirCargoInquiry, AircraftSalesInquiry,
+)
+from flights.summaries import invalidate_inquiries_summary, invalidate_users_summary
+
+LARGE_MODELS = [
+    User, Membership, MarketplaceAircraft, MarketplaceBooking, MaintenanceLog, Dispute,
+    FlightBooking, YachtCharter, LeaseInquiry, FlightInquiry, ContactInquiry,
+    GroupCharterInquiry, AirCargoInquiry, AircraftSalesInquiry,
+]
+
+SQLITE_SCAN   = re.compile(r'\bSCAN (?:TABLE )?"?(\w+)"?(?: AS \w+)?\s*$')
+POSTGRES_SCAN = re.compile(r'Seq Scan on "?(\w+)"?')
+ALIAS         = re.compile(r'"(\w+)" (?:AS )?"?([A-Z]\d+)"?\b')
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("EXPLAIN the queries behind the guest, dashboard and admin endpoints on a "
+            "large seeded dataset; fail on sequential scans. Seed data is rolled back.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000,
+                            help='Rows per booking / inquiry table')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--verbose', action='store_true', help='Print every plan')
+
+    def handle(self, *args, **options):
+        self.failures = []
+        try:
+            with transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+        if self.failures:
+            raise CommandError(
+                f"{len(self.failures)} quer{'y' if len(self.failures) == 1 else 'ies'} "
+                f"with a sequential scan:\n" + '\n'.join(self.failures)
+            )
+        self.stdout.write(self.style.SUCCESS('No sequential scans on seeded tables'))
+
+    # ── Seeding ───────────────────────────────────────────────────────────────
+    def seed(self, rows, rng):
+        now   = timezone.now()
+        today = now.date()
+        bulk  = dict(batch_size=1000)
+
+        tier, _ = MembershipTier.objects.get_or_create(
+            name='gold', defaults={'display_name': 'Gold', 'monthly_fee_usd': 0, 'annual_fee_usd': 0},
+        )
+        origin, _      = Airport.objects.get_or_create(code='PLNA', defaults={'name': 'A', 'city': 'A', 'country': 'A'})
+        destination, _ = Airport.objects.get_or_create(code='PLNB', defaults={'name': 'B', 'city': 'B', 'country': 'B'})
+
+        admin   = User.objects.create(username='plan-admin', role='admin')
+        owners  = User.objects.bulk_create(
+            [User(username=f'plan-owner-{i}', password='!', role='owner') for i in range(rows // 100)], **bulk)
+        clients = User.objects.bulk_create(
+            [User(username=f'plan-client-{i}', password='!', role='client') for i in range(rows // 10)], **bulk)
+        Membership.objects.bulk_create([
+            Membership(user=u, tier=tier, status=rng.choice(['active'] * 3 + ['expired', 'pending']))
+            for u in clients
+        ], **bulk)
+        aircraft = MarketplaceAircraft.objects.bulk_create([
+            MarketplaceAircraft(
+                owner=owners[i % len(owners)], name=f'Plan {i}', model='Plan', category='light',
+                registration_number=f'PLAN-{i:06d}', base_location='PLNA', passenger_capacity=8,
+                range_km=3000, hourly_rate_usd=4000, is_approved=rng.random() < 0.9, status='available',
+            )
+            for i in range(len(owners) * 2)
+        ], **bulk)
+
+        statuses = [s for s, _ in MarketplaceBooking.STATUS_CHOICES]
+        bookings = []
+        for i in range(rows):
+            departure = now + timedelta(hours=rng.randint(-24 * 365, 24 * 180))
+            gross     = Decimal(rng.randint(2000, 90000))
+            bookings.append(MarketplaceBooking(
+                client=rng.choice(clients), aircraft=rng.choice(aircraft), origin='PLNA', destination='PLNB',
+                departure_datetime=departure, estimated_hours=2, passenger_count=2,
+                status=rng.choice(statuses), gross_amount_usd=gross, commission_usd=gross / 10,
+                net_owner_usd=gross - gross / 10,
+                occupied_from=departure, occupied_until=departure + timedelta(hours=3),
+            ))
+        bookings = MarketplaceBooking.objects.bulk_create(bookings, **bulk)
+        Dispute.objects.bulk_create([
+            Dispute(booking=b, raised_by=b.client, subject='Plan', description='Plan',
+                    status=rng.choice(['open', 'reviewing', 'resolved', 'closed']))
+            for b in rng.sample(bookings, rows // 20)
+        ], **bulk)
+        MaintenanceLog.objects.bulk_create([
+            MaintenanceLog(aircraft=rng.choice(aircraft), maintenance_type='routine', flight_hours_at=0,
+                           status=rng.choice(['scheduled', 'completed']), description='Plan',
+                           scheduled_date=today + timedelta(days=rng.randint(-365, 90)))
+            for _ in range(rows // 4)
+        ], **bulk)
+
+        def guest(i):
+            return f'guest{i % (rows // 5 or 1)}@example.com'
+
+        FlightBooking.objects.bulk_create([
+            FlightBooking(guest_name='Plan', guest_email=guest(i), origin=origin, destination=destination,
+                          departure_date=today, passenger_count=2,
+                          status=rng.choice([s for s, _ in FlightBooking.STATUS_CHOICES]))
+            for i in range(rows)
+        ], **bulk)
+        YachtCharter.objects.bulk_create([
+            YachtCharter(guest_name='Plan', guest_email=guest(i), departure_port='Plan',
+                         charter_start=today, charter_end=today + timedelta(days=7), guest_count=4,
+                         status=rng.choice([s for s, _ in YachtCharter.STATUS_CHOICES]))
+            for i in range(rows)
+        ], **bulk)
+        pending = lambda: rng.choice(['pending', 'contacted', 'closed'])
+        LeaseInquiry.objects.bulk_create([
+            LeaseInquiry(guest_name='Plan', guest_email=guest(i), asset_type='aircraft',
+                         lease_duration=LeaseInquiry.LEASE_DURATION_CHOICES[0][0],
+                         preferred_start_date=today, status=pending())
+            for i in range(rows)
+        ], **bulk)
+        FlightInquiry.objects.bulk_create([
+            FlightInquiry(guest_name='Plan', guest_email=guest(i), origin_description='Plan',
+                          destination_description='Plan', message='Plan')
+            for i in range(rows)
+        ], **bulk)
+        ContactInquiry.objects.bulk_create([
+            ContactInquiry(full_name='Plan', email=guest(i), message='Plan') for i in range(rows)
+        ], **bulk)
+        GroupCharterInquiry.objects.bulk_create([
+            GroupCharterInquiry(contact_name='Plan', email=guest(i), group_size=20,
+                                group_type=GroupCharterInquiry.GROUP_TYPE_CHOICES[0][0],
+                                origin_description='Plan', destination_description='Plan', status=pending())
+            for i in range(rows)
+        ], **bulk)
+        AirCargoInquiry.objects.bulk_create([
+            AirCargoInquiry(contact_name='Plan', email=guest(i), cargo_description='Plan',
+                            cargo_type=AirCargoInquiry.CARGO_TYPE_CHOICES[0][0],
+                            origin_description='Plan', destination_description='Plan', status=pending())
+            for i in range(rows)
+        ], **bulk)
+        AircraftSalesInquiry.objects.bulk_create([
+            AircraftSalesInquiry(contact_name='Plan', email=guest(i), status=pending(),
+                                 inquiry_type=AircraftSalesInquiry.INQUIRY_TYPE_CHOICES[0][0])
+            for i in range(rows)
+        ], **bulk)
+
+        client = max(clients[:50], key=lambda u: sum(b.client_id == u.id for b in bookings[:2000]))
+        owner  = owners[0]
+        return admin, owner, client
+
+    # ── Plans ─────────────────────────────────────────────────────────────────
+    def endpoints(self, admin, owner, client):
+        return [
+            ('guest flight bookings', None,   '/api/v1/flight-bookings/?email=GUEST7@example.com'),
+            ('guest yacht charters',  None,   '/api/v1/yacht-charters/?email=guest7@EXAMPLE.com'),
+            ('client dashboard',      client, '/api/v1/dashboard/client/summary/'),
+            ('owner dashboard',       owner,  '/api/v1/dashboard/owner/summary/'),
+            ('admin dashboard',       admin,  '/api/v1/dashboard/admin/summary/'),
+            ('client bookings',       client, '/api/v1/marketplace/bookings/'),
+            ('owner bookings',        owner,  '/api/v1/marketplace/bookings/'),
+            ('inquiries summary',     admin,  '/api/v1/admin/overview/inquiries_summary/'),
+            ('users summary',         admin,  '/api/v1/admin/overview/users_summary/'),
+            ('admin flight bookings', admin,  '/api/v1/admin/flight-bookings/'),
+            ('admin contacts',        admin,  '/api/v1/admin/contacts/'),
+            ('admin mp bookings',     admin,  '/api/v1/admin/marketplace-bookings/'),
+            ('admin users',           admin,  '/api/v1/admin/users/'),
+        ]
+
+    def explain(self, sql):
+        if connection.vendor == 'sqlite':
+            prefix, pattern = 'EXPLAIN QUERY PLAN ', SQLITE_SCAN
+        elif connection.vendor == 'postgresql':
+            prefix, pattern = 'EXPLAIN ', POSTGRES_SCAN
+        else:
+            raise CommandError(f'No plan parser for {connection.vendor}')
+        with connection.cursor() as cursor:
+            cursor.execute(prefix + sql)
+            lines = [str(row[-1]) if connection.vendor == 'sqlite' else str(row[0]) for row in cursor.fetchall()]
+        aliases = {alias: table for table, alias in ALIAS.findall(sql)}
+        scans   = []
+        for line in lines:
+            match = pattern.search(line)
+            if match:
+                scans.append(aliases.get(match.group(1), match.group(1)))
+        return lines, scans
+
+    def run(self, options):
+        rng = random.Random(options['seed'])
+        t0  = time.perf_counter()
+        admin, owner, client = self.seed(options['rows'], rng)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(f"Seeded {options['rows']:,} rows per table in {time.perf_counter() - t0:.1f}s")
+
+        large = {model._meta.db_table for model in LARGE_MODELS}
+        invalidate_inquiries_summary()
+        invalidate_users_summary()
+        for label, user, url in self.endpoints(admin, owner, client):
+            api = APIClient(SERVER_NAME='localhost')
+            if user is not None:
+                api.force_authenticate(user)
+            with CaptureQueriesContext(connection) as ctx:
+                response = api.get(url)
+            if response.status_code != 200:
+                raise CommandError(f'{label}: {url} returned {response.status_code}')
+
+            selects = [q['sql'] for q in ctx.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+            bad = 0
+            for sql in selects:
+                lines, scans = self.explain(sql)
+                scans = [t for t in scans if t in large]
+                if scans:
+                    bad += 1
+                    self.failures.append(f"  {label}: SCAN {', '.join(scans)}\n    {sql[:300]}")
+                if options['verbose'] or scans:
+                    self.stdout.write(f"    {sql[:160]}")
+                    for line in lines:
+                        self.stdout.write(f"      {line}")
+            style = self.style.ERROR if bad else self.style.SUCCESS
+            self.stdout.write(style(f"{label:<24} {len(selects):>3} queries  {bad} with a sequential scan"))
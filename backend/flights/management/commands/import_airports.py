@@ -0,0 +1,89 @@
+# flights/management/commands/import_airports.py
+"""
+Bulk-load airports from a CSV file.
+
+Usage:
+  python manage.py import_airports airports.csv
+  python manage.py import_airports airports.csv --countries countries.csv --iata-only
+  python manage.py import_airports airports.csv --dry-run
+
+Accepts either our own columns (code, name, city, country, latitude,
+longitude) or an OurAirports airports.csv export (ident, iata_code, name,
+municipality, iso_country, latitude_deg, longitude_deg, type). OurAirports
+rows are keyed on iata_code, falling back to ident; closed airports are
+skipped. Pass the matching OurAirports countries.csv to store country names
+instead of ISO codes.
+"""
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from flights.catalog import bump_catalog_version
+from flights.geo import invalidate_airport_index
+from flights.importers import BATCH_SIZE, read_csv, read_header, upsert
+from flights.models import Airport
+
+FIELDS = ['code', 'name', 'city', 'country', 'latitude', 'longitude']
+
+
+def ourairports_rows(rows, countries, iata_only):
+    for row in rows:
+        if row.get('type') == 'closed':
+            continue
+        code = (row.get('iata_code') or '').strip()
+        if not code:
+            if iata_only:
+                continue
+            code = row.get('ident', '')
+        yield {
+            'code':      code,
+            'name':      row.get('name', ''),
+            'city':      row.get('municipality', ''),
+            'country':   countries.get(row.get('iso_country', ''), row.get('iso_country', '')),
+            'latitude':  row.get('latitude_deg', ''),
+            'longitude': row.get('longitude_deg', ''),
+        }
+
+
+class Command(BaseCommand):
+    help = 'Upsert airports from a CSV (own columns or OurAirports format)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--countries', help='OurAirports countries.csv, maps iso_country to a name')
+        parser.add_argument('--iata-only', action='store_true', help='OurAirports: skip rows without an IATA code')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Diff and report without writing')
+
+    def handle(self, *args, **options):
+        try:
+            header = read_header(options['path'])
+        except OSError as exc:
+            raise CommandError(exc)
+
+        rows = read_csv(options['path'])
+        if 'ident' in header and 'iata_code' in header:
+            countries = {}
+            if options['countries']:
+                countries = {r['code']: r['name'] for r in read_csv(options['countries'])}
+            rows = ourairports_rows(rows, countries, options['iata_only'])
+        elif not {'code', 'name'} <= set(header):
+            raise CommandError('Expected a "code,name,…" header or an OurAirports airports.csv.')
+
+        started = time.perf_counter()
+        try:
+            result = upsert(Airport, rows, 'code', FIELDS,
+                            batch_size=options['batch_size'], dry_run=options['dry_run'])
+        except ValidationError as exc:
+            raise CommandError(exc.messages[0])
+        if not options['dry_run']:
+            invalidate_airport_index()
+            bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Airports{' (dry run)' if options['dry_run'] else ''}: "
+            f'{result.inserted} inserted, {result.updated} updated, {result.unchanged} unchanged, '
+            f'{result.duplicates} duplicate, {result.skipped} without a code '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,59 @@
+# flights/management/commands/import_fleet.py
+"""
+Bulk-load the charter fleet (Aircraft) from a CSV file.
+
+Usage:
+  python manage.py import_fleet fleet.csv [--dry-run]
+
+Columns are Aircraft field names; rows are matched on `name`. `amenities`
+takes a JSON list or a "|"-separated string. Columns missing from the file
+keep their model defaults on insert and are not touched on update.
+"""
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from flights.catalog import bump_catalog_version
+from flights.importers import BATCH_SIZE, read_csv, read_header, upsert
+from flights.models import Aircraft
+
+FIELDS = ['name', 'model', 'category', 'passenger_capacity', 'range_km', 'cruise_speed_kmh',
+          'description', 'amenities', 'image_url', 'hourly_rate_usd', 'is_available']
+REQUIRED = {'name', 'model', 'category', 'passenger_capacity', 'range_km', 'cruise_speed_kmh', 'hourly_rate_usd'}
+
+
+class Command(BaseCommand):
+    help = 'Upsert charter aircraft from a CSV, matched on name'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Diff and report without writing')
+
+    def handle(self, *args, **options):
+        try:
+            header = read_header(options['path'])
+        except OSError as exc:
+            raise CommandError(exc)
+        missing = REQUIRED - set(header)
+        if missing:
+            raise CommandError(f"Missing column(s): {', '.join(sorted(missing))}")
+        fields = [f for f in FIELDS if f in header]
+        rows   = read_csv(options['path'])
+
+        started = time.perf_counter()
+        try:
+            result = upsert(Aircraft, rows, 'name', fields,
+                            batch_size=options['batch_size'], dry_run=options['dry_run'])
+        except ValidationError as exc:
+            raise CommandError(exc.messages[0])
+        if not options['dry_run']:
+            bump_catalog_version()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Aircraft{' (dry run)' if options['dry_run'] else ''}: "
+            f'{result.inserted} inserted, {result.updated} updated, {result.unchanged} unchanged, '
+            f'{result.duplicates} duplicate, {result.skipped} without a name '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
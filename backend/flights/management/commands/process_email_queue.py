@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from flights.emails import process_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued EmailLog rows (the admin email outbox), retrying failures with backoff."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100,
+                            help='Rows claimed per round (default 100)')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='SMTP threads per batch, one connection each (default 4)')
+        parser.add_argument('--sleep', type=float, default=5,
+                            help='Seconds to wait when the queue is empty (default 5)')
+        parser.add_argument('--once', action='store_true',
+                            help='Drain what is due now and exit instead of polling')
+
+    def handle(self, *args, **options):
+        totals = [0, 0, 0]
+        try:
+            while True:
+                sent, retrying, failed = process_outbox(options['batch_size'], options['workers'])
+                totals = [totals[0] + sent, totals[1] + retrying, totals[2] + failed]
+                if sent or retrying or failed:
+                    self.stdout.write(f"  sent {sent}  retrying {retrying}  failed {failed}")
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(
+            f"Done — sent {totals[0]}, scheduled for retry {totals[1]}, failed {totals[2]}"
+        ))
@@ -0,0 +1,26 @@
+# flights/management/commands/rebuild_empty_legs.py
+"""
+Recompute empty legs for every aircraft with upcoming bookings.
+
+Usage:
+  python manage.py rebuild_empty_legs
+
+Run once after migrating, and after any bulk edit that bypassed model saves.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from flights.empty_legs import rebuild_empty_legs
+
+
+class Command(BaseCommand):
+    help = 'Recompute marketplace empty legs from confirmed bookings'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        created, updated, deleted = rebuild_empty_legs()
+        self.stdout.write(self.style.SUCCESS(
+            f'Empty legs: {created} created, {updated} updated, {deleted} removed '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
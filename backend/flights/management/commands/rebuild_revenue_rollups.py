@@ -0,0 +1,25 @@
+# flights/management/commands/rebuild_revenue_rollups.py
+"""
+Recompute the RevenueMonthly rollup from FlightBooking and MarketplaceBooking.
+
+Usage:
+  python manage.py rebuild_revenue_rollups
+
+Run once after migrating, and after any bulk edit that bypassed model saves.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from flights.revenue import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the monthly revenue rollup table from the booking tables'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count   = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {count} revenue rollup row(s) in {time.perf_counter() - started:.2f}s'
+        ))
@@ -2,7 +2,8 @@
 import uuid
 from datetime import datetime, time
 from decimal import Decimal
-from django.core.management.base import BaseCommand
+from time import perf_counter
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from django.db import transaction
 from flights.models import (
@@ -21,14 +22,51 @@ class Command(BaseCommand):
             action='store_true',
             help='Clear existing data before seeding',
         )
+        parser.add_argument(
+            '--scale',
+            type=int,
+            default=0,
+            help='Also generate about N synthetic rows for load testing (see flights/synthetic.py)',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='Random seed for --scale; the same seed gives the same dataset',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=2000,
+            help='Rows per bulk insert for --scale',
+        )
 
     def handle(self, *args, **options):
         if options['clear']:
             self.clear_data()
         
         self.seed_data()
+        if options['scale']:
+            self.seed_synthetic(options['scale'], options['seed'], options['batch_size'])
         self.stdout.write(self.style.SUCCESS('Successfully seeded database'))
 
+    def seed_synthetic(self, scale, seed, batch_size):
+        """Bulk-generate a large synthetic dataset on top of the demo data"""
+        from flights.synthetic import SyntheticDataset
+
+        dataset = SyntheticDataset(scale, seed=seed, batch_size=batch_size, log=self.stdout.write)
+        if dataset.exists():
+            raise CommandError(
+                f'Synthetic data for --seed {seed} is already loaded; use another seed or a fresh database.'
+            )
+        self.stdout.write(f'Generating ~{scale:,} synthetic rows (seed {seed})...')
+        started = perf_counter()
+        with transaction.atomic():
+            counts = dataset.generate()
+        self.stdout.write(self.style.SUCCESS(
+            f'  {sum(counts.values()):,} synthetic rows in {perf_counter() - started:.1f}s'
+        ))
+
     def clear_data(self):
         """Clear existing data from all tables"""
         self.stdout.write('Clearing existing data...')
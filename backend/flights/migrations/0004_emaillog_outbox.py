@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:25
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def mark_existing_logs(apps, schema_editor):
+    # Everything logged before the outbox existed was sent inline
+    EmailLog = apps.get_model('flights', 'EmailLog')
+    EmailLog.objects.filter(success=True).update(status='sent', attempts=1, delivered_at=F('sent_at'))
+    EmailLog.objects.filter(success=False).update(status='failed', attempts=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0003_flightbooking_commission_pct_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emaillog',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='delivered_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='Earliest retry / lease expiry while sending', null=True),
+        ),
+        migrations.AddField(
+            model_name='emaillog',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='emaillog',
+            name='success',
+            field=models.BooleanField(default=False, help_text='True once the message has been delivered'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='emaillog_outbox_idx'),
+        ),
+        migrations.RunPython(mark_existing_logs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:31
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DateField, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def backfill(apps, schema_editor):
+    # A frozen copy of flights.revenue.rebuild_rollups as of this migration
+    FlightBooking      = apps.get_model('flights', 'FlightBooking')
+    MarketplaceBooking = apps.get_model('flights', 'MarketplaceBooking')
+    RevenueMonthly     = apps.get_model('flights', 'RevenueMonthly')
+    zero  = Decimal('0')
+    month = TruncMonth('created_at', output_field=DateField())
+    sources = [
+        ('flight', FlightBooking.objects.filter(quoted_price_usd__isnull=False),
+         'quoted_price_usd', 'commission_usd', 'net_revenue_usd'),
+        ('marketplace', MarketplaceBooking.objects.all(),
+         'gross_amount_usd', 'commission_usd', 'net_owner_usd'),
+    ]
+    rows = []
+    for source, qs, gross, commission, net in sources:
+        grouped = (
+            qs.annotate(month=month)
+            .values('month', 'status')
+            .annotate(
+                n=Count('id'),
+                g=Coalesce(Sum(gross), Value(zero)),
+                c=Coalesce(Sum(commission), Value(zero)),
+                t=Coalesce(Sum(net), Value(zero)),
+            )
+            .order_by()
+        )
+        rows.extend(
+            RevenueMonthly(
+                source=source, status=r['status'], month=r['month'], booking_count=r['n'],
+                gross_usd=r['g'], commission_usd=r['c'], net_usd=r['t'],
+            )
+            for r in grouped
+        )
+    RevenueMonthly.objects.bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0004_emaillog_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueMonthly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('source', models.CharField(choices=[('flight', 'Flight Booking'), ('marketplace', 'Marketplace Booking')], max_length=12)),
+                ('status', models.CharField(max_length=20)),
+                ('booking_count', models.IntegerField(default=0)),
+                ('gross_usd', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('commission_usd', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('net_usd', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['month', 'source', 'status'],
+                'unique_together': {('source', 'status', 'month')},
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
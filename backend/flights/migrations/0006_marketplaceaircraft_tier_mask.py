@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:32
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+# flights.visibility.TIER_BITS as of this migration: one bit per
+# MembershipTier.TIER_CHOICES entry, in order
+TIER_BITS = {'basic': 1, 'premium': 2, 'corporate': 4}
+
+
+def backfill_tier_mask(apps, schema_editor):
+    MarketplaceAircraft = apps.get_model('flights', 'MarketplaceAircraft')
+    Through = MarketplaceAircraft.exclusive_tiers.through
+    masks = defaultdict(int)
+    for aircraft_id, name in Through.objects.values_list('marketplaceaircraft_id', 'membershiptier__name'):
+        masks[aircraft_id] |= TIER_BITS.get(name, 0)
+    by_mask = defaultdict(list)
+    for aircraft_id, mask in masks.items():
+        by_mask[mask].append(aircraft_id)
+    for mask, ids in by_mask.items():
+        MarketplaceAircraft.objects.filter(id__in=ids).update(tier_mask=mask)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0005_revenuemonthly'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketplaceaircraft',
+            name='tier_mask',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, help_text='exclusive_tiers as bits, 0 = all tiers (see visibility.py)'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplaceaircraft',
+            index=models.Index(fields=['is_approved', 'status', 'tier_mask'], name='mpaircraft_visibility_idx'),
+        ),
+        migrations.RunPython(backfill_tier_mask, migrations.RunPython.noop),
+    ]
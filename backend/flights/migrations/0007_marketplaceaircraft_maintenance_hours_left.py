@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:43
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0006_marketplaceaircraft_tier_mask'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketplaceaircraft',
+            name='maintenance_hours_left',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('maintenance_interval_hours'), '-', models.F('total_flight_hours')), '+', models.F('last_maintenance_hours')), help_text='Stored copy of hours_until_maintenance so alerts can filter/sort in SQL', output_field=models.DecimalField(decimal_places=1, max_digits=11)),
+        ),
+        migrations.AddIndex(
+            model_name='marketplaceaircraft',
+            index=models.Index(fields=['owner', 'maintenance_hours_left'], name='mpaircraft_owner_maint_idx'),
+        ),
+    ]
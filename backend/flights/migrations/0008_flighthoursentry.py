@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0007_marketplaceaircraft_maintenance_hours_left'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FlightHoursEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('record_id', models.CharField(help_text="Source system's id — re-sending it is a no-op", max_length=100, unique=True)),
+                ('hours', models.DecimalField(decimal_places=1, max_digits=7)),
+                ('flown_at', models.DateTimeField()),
+                ('batch', models.UUIDField(db_index=True, help_text='Ingestion batch that applied this record')),
+                ('ingested_at', models.DateTimeField(auto_now_add=True)),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flight_hours_entries', to='flights.marketplaceaircraft')),
+                ('ingested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-flown_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:46
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+# flights.availability.TURNAROUND as of this migration
+TURNAROUND = timedelta(hours=1)
+
+
+def backfill_windows(apps, schema_editor):
+    MarketplaceBooking = apps.get_model('flights', 'MarketplaceBooking')
+    bookings = list(MarketplaceBooking.objects.only('departure_datetime', 'return_datetime', 'estimated_hours'))
+    for b in bookings:
+        end = (b.return_datetime or b.departure_datetime) + timedelta(hours=float(b.estimated_hours or 0))
+        b.occupied_from, b.occupied_until = b.departure_datetime, end + TURNAROUND
+    MarketplaceBooking.objects.bulk_update(bookings, ['occupied_from', 'occupied_until'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0008_flighthoursentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketplacebooking',
+            name='occupied_from',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='marketplacebooking',
+            name='occupied_until',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='marketplacebooking',
+            index=models.Index(fields=['aircraft', 'occupied_until'], name='mpbooking_calendar_idx'),
+        ),
+        migrations.RunPython(backfill_windows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('flights', '0009_marketplacebooking_calendar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmptyLeg',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('positioning', 'Positioning'), ('return', 'Return to Base')], max_length=12)),
+                ('origin', models.CharField(max_length=200)),
+                ('destination', models.CharField(max_length=200)),
+                ('available_from', models.DateTimeField(help_text='Earliest departure')),
+                ('available_until', models.DateTimeField(help_text='Latest departure')),
+                ('estimated_hours', models.DecimalField(decimal_places=1, max_digits=6)),
+                ('discount_pct', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('price_usd', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('booked', 'Booked')], default='open', max_length=8)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('aircraft', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='empty_legs', to='flights.marketplaceaircraft')),
+                ('booking', models.OneToOneField(blank=True, help_text='Booking that bought this leg', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='empty_leg', to='flights.marketplacebooking')),
+                ('source_booking', models.ForeignKey(help_text='Booking this leg positions for (or returns from)', on_delete=django.db.models.deletion.CASCADE, related_name='empty_legs', to='flights.marketplacebooking')),
+            ],
+            options={
+                'ordering': ['available_from'],
+                'indexes': [models.Index(fields=['status', 'available_from', 'available_until'], name='emptyleg_feed_idx')],
+                'unique_together': {('source_booking', 'kind')},
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('flights', '0010_emptyleg'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aircargoinquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='aircargo_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aircraftsalesinquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='aircraftsales_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactinquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='contactinquiry_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emaillog',
+            index=models.Index(fields=['-sent_at', '-id'], name='emaillog_sent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightbooking',
+            index=models.Index(fields=['-created_at', '-id'], name='flightbooking_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightinquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='flightinquiry_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupcharterinquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='groupcharter_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaseinquiry',
+            index=models.Index(fields=['-created_at', '-id'], name='leaseinquiry_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplacebooking',
+            index=models.Index(fields=['-created_at', '-id'], name='mpbooking_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-created_at', '-id'], name='user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='yachtcharter',
+            index=models.Index(fields=['-created_at', '-id'], name='yachtcharter_created_idx'),
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:56
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('flights', '0011_admin_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='aircargoinquiry',
+            index=models.Index(fields=['status', 'created_at'], name='aircargo_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aircraftsalesinquiry',
+            index=models.Index(fields=['status', 'created_at'], name='aircraftsales_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['status'], name='dispute_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightbooking',
+            index=models.Index(fields=['status', 'created_at'], name='flightbooking_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='flightbooking',
+            index=models.Index(django.db.models.functions.text.Lower('guest_email'), name='flightbooking_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='groupcharterinquiry',
+            index=models.Index(fields=['status', 'created_at'], name='groupcharter_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaseinquiry',
+            index=models.Index(fields=['status', 'created_at'], name='leaseinquiry_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(fields=['aircraft', 'status', 'scheduled_date'], name='maintlog_schedule_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplacebooking',
+            index=models.Index(fields=['client', 'status', 'departure_datetime'], name='mpbooking_client_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplacebooking',
+            index=models.Index(fields=['aircraft', 'status', 'departure_datetime'], name='mpbooking_aircraft_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='marketplacebooking',
+            index=models.Index(fields=['status', 'departure_datetime'], name='mpbooking_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['status'], name='membership_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role'], name='user_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='yachtcharter',
+            index=models.Index(fields=['status', 'created_at'], name='yachtcharter_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='yachtcharter',
+            index=models.Index(django.db.models.functions.text.Lower('guest_email'), name='yachtcharter_email_idx'),
+        ),
+    ]
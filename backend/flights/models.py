@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 import uuid
 
 
@@ -115,6 +116,13 @@ class FlightBooking(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
  
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='flightbooking_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='flightbooking_status_idx'),
+            models.Index(Lower('guest_email'), name='flightbooking_email_idx'),
+        ]
+
     # ── Auto-calculate commission whenever price/status is saved ─────────────
     def save(self, *args, **kwargs):
         if self.quoted_price_usd is not None:
@@ -176,6 +184,13 @@ class YachtCharter(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='yachtcharter_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='yachtcharter_status_idx'),
+            models.Index(Lower('guest_email'), name='yachtcharter_email_idx'),
+        ]
+
     def __str__(self):
         return f"Yacht {self.reference} | {self.guest_name}"
 
@@ -210,6 +225,12 @@ class LeaseInquiry(models.Model):
     status = models.CharField(max_length=20, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='leaseinquiry_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='leaseinquiry_status_idx'),
+        ]
+
     def __str__(self):
         return f"Lease {self.reference} | {self.asset_type} | {self.guest_name}"
 
@@ -230,6 +251,11 @@ class FlightInquiry(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='flightinquiry_created_idx'),
+        ]
+
     def __str__(self):
         return f"Inquiry {self.reference} | {self.origin_description} → {self.destination_description}"
 
@@ -254,6 +280,11 @@ class ContactInquiry(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contactinquiry_created_idx'),
+        ]
+
     def __str__(self):
         return f"Contact {self.reference} | {self.full_name} | {self.subject}"
 
@@ -291,6 +322,12 @@ class GroupCharterInquiry(models.Model):
     status = models.CharField(max_length=20, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='groupcharter_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='groupcharter_status_idx'),
+        ]
+
     def __str__(self):
         return f"Group Charter {self.reference} | {self.group_type} | {self.group_size} pax"
 
@@ -340,6 +377,12 @@ class AirCargoInquiry(models.Model):
     status = models.CharField(max_length=20, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='aircargo_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='aircargo_status_idx'),
+        ]
+
     def __str__(self):
         return f"Air Cargo {self.reference} | {self.cargo_type} | {self.origin_description} → {self.destination_description}"
 
@@ -387,6 +430,12 @@ class AircraftSalesInquiry(models.Model):
     status = models.CharField(max_length=20, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='aircraftsales_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='aircraftsales_status_idx'),
+        ]
+
     def __str__(self):
         return f"Aircraft Sale {self.reference} | {self.inquiry_type} | {self.contact_name}"
     
@@ -420,6 +469,12 @@ class User(AbstractUser):
     avatar_url = models.URLField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='user_created_idx'),
+            models.Index(fields=['role'], name='user_role_idx'),
+        ]
+
     def __str__(self):
         return self.username
 
@@ -480,6 +535,11 @@ class Membership(models.Model):
     created_at     = models.DateTimeField(auto_now_add=True)
     updated_at     = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='membership_status_idx'),
+        ]
+
     @property
     def is_active(self):
         return self.status == 'active' and (self.end_date is None or self.end_date >= timezone.now().date())
@@ -534,10 +594,20 @@ class MarketplaceAircraft(models.Model):
                                                         help_text="Admin must approve listing")
     exclusive_tiers              = models.ManyToManyField(MembershipTier, blank=True,
                                                            help_text="Leave empty = all tiers")
+    tier_mask                    = models.PositiveSmallIntegerField(default=0, editable=False,
+                                                                     help_text="exclusive_tiers as bits, 0 = all tiers (see visibility.py)")
     # Tracking
     total_flight_hours           = models.DecimalField(max_digits=10, decimal_places=1, default=0)
     maintenance_interval_hours   = models.IntegerField(default=100)
     last_maintenance_hours       = models.DecimalField(max_digits=10, decimal_places=1, default=0)
+    maintenance_hours_left       = models.GeneratedField(
+        expression=models.F('maintenance_interval_hours') - models.F('total_flight_hours')
+                   + models.F('last_maintenance_hours'),
+        output_field=models.DecimalField(max_digits=11, decimal_places=1),
+        db_persist=True,
+        db_index=True,
+        help_text="Stored copy of hours_until_maintenance so alerts can filter/sort in SQL",
+    )
     # Documents / compliance
     insurance_expiry             = models.DateField(null=True, blank=True)
     airworthiness_expiry         = models.DateField(null=True, blank=True)
@@ -548,6 +618,12 @@ class MarketplaceAircraft(models.Model):
     created_at                   = models.DateTimeField(auto_now_add=True)
     updated_at                   = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_approved', 'status', 'tier_mask'], name='mpaircraft_visibility_idx'),
+            models.Index(fields=['owner', 'maintenance_hours_left'], name='mpaircraft_owner_maint_idx'),
+        ]
+
     @property
     def hours_until_maintenance(self):
         return self.maintenance_interval_hours - (
@@ -593,10 +669,37 @@ class MaintenanceLog(models.Model):
     notes             = models.TextField(blank=True)
     created_at        = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['aircraft', 'status', 'scheduled_date'], name='maintlog_schedule_idx'),
+        ]
+
     def __str__(self):
         return f"{self.aircraft.name} – {self.maintenance_type} on {self.scheduled_date}"
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# FLIGHT HOURS ENTRY  (one row per ingested ops-system record — see ingest.py)
+# ─────────────────────────────────────────────────────────────────────────────
+class FlightHoursEntry(models.Model):
+    record_id   = models.CharField(max_length=100, unique=True,
+                                   help_text="Source system's id — re-sending it is a no-op")
+    aircraft    = models.ForeignKey(MarketplaceAircraft, on_delete=models.CASCADE,
+                                    related_name='flight_hours_entries')
+    hours       = models.DecimalField(max_digits=7, decimal_places=1)
+    flown_at    = models.DateTimeField()
+    batch       = models.UUIDField(db_index=True, help_text="Ingestion batch that applied this record")
+    ingested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+                                    null=True, blank=True)
+    ingested_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-flown_at']
+
+    def __str__(self):
+        return f"{self.record_id}: {self.aircraft.registration_number} +{self.hours}h"
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # MARKETPLACE BOOKING
 # ─────────────────────────────────────────────────────────────────────────────
@@ -628,6 +731,9 @@ class MarketplaceBooking(models.Model):
     departure_datetime = models.DateTimeField()
     return_datetime    = models.DateTimeField(null=True, blank=True)
     estimated_hours    = models.DecimalField(max_digits=6, decimal_places=1)
+    # Calendar window this booking blocks the aircraft for (see availability.py)
+    occupied_from      = models.DateTimeField(null=True, editable=False)
+    occupied_until     = models.DateTimeField(null=True, editable=False)
     passenger_count    = models.IntegerField()
     status             = models.CharField(max_length=12, choices=STATUS_CHOICES, default='pending')
     special_requests   = models.TextField(blank=True)
@@ -644,16 +750,93 @@ class MarketplaceBooking(models.Model):
     created_at         = models.DateTimeField(auto_now_add=True)
     updated_at         = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['aircraft', 'occupied_until'], name='mpbooking_calendar_idx'),
+            models.Index(fields=['-created_at', '-id'], name='mpbooking_created_idx'),
+            models.Index(fields=['client', 'status', 'departure_datetime'], name='mpbooking_client_idx'),
+            models.Index(fields=['aircraft', 'status', 'departure_datetime'], name='mpbooking_aircraft_status_idx'),
+            models.Index(fields=['status', 'departure_datetime'], name='mpbooking_status_idx'),
+        ]
+
+    def clean(self):
+        # Admin forms validate inside the changeform transaction, so the
+        # aircraft row lock taken by is_booked() holds until the save
+        from django.core.exceptions import ValidationError
+        from .availability import BLOCKING_STATUSES, booking_window, is_booked
+        if self.status not in BLOCKING_STATUSES or self.aircraft_id is None \
+                or self.departure_datetime is None or self.estimated_hours is None:
+            return
+        start, end = booking_window(self.departure_datetime, self.return_datetime, self.estimated_hours)
+        if is_booked(self.aircraft_id, start, end, exclude_pk=self.pk):
+            raise ValidationError({
+                'aircraft': f'{self.aircraft.name} is already booked between '
+                            f'{start:%Y-%m-%d %H:%M} and {end:%Y-%m-%d %H:%M} UTC.',
+            })
+
     def save(self, *args, **kwargs):
+        from .availability import booking_window
         # Auto-calculate commission and net
         self.commission_usd = round(self.gross_amount_usd * self.commission_pct / 100, 2)
         self.net_owner_usd  = round(self.gross_amount_usd - self.commission_usd, 2)
+        self.occupied_from, self.occupied_until = booking_window(
+            self.departure_datetime, self.return_datetime, self.estimated_hours,
+        )
         super().save(*args, **kwargs)
 
     def __str__(self):
         return f"Booking {str(self.reference)[:8]} | {self.client.username} | {self.origin}→{self.destination}"
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# EMPTY LEG  (derived from confirmed bookings by flights/empty_legs.py)
+# ─────────────────────────────────────────────────────────────────────────────
+class EmptyLeg(models.Model):
+    """
+    A flight the aircraft has to make without passengers — positioning to a
+    booking's origin, or returning to base after the last one — offered
+    to members at a discount. Any departure between available_from and
+    available_until keeps the aircraft's schedule intact.
+    """
+    KIND_CHOICES = [
+        ('positioning', 'Positioning'),
+        ('return',      'Return to Base'),
+    ]
+    STATUS_CHOICES = [
+        ('open',   'Open'),
+        ('booked', 'Booked'),
+    ]
+    aircraft        = models.ForeignKey(MarketplaceAircraft, on_delete=models.CASCADE,
+                                        related_name='empty_legs')
+    source_booking  = models.ForeignKey(MarketplaceBooking, on_delete=models.CASCADE,
+                                        related_name='empty_legs',
+                                        help_text="Booking this leg positions for (or returns from)")
+    kind            = models.CharField(max_length=12, choices=KIND_CHOICES)
+    origin          = models.CharField(max_length=200)
+    destination     = models.CharField(max_length=200)
+    available_from  = models.DateTimeField(help_text="Earliest departure")
+    available_until = models.DateTimeField(help_text="Latest departure")
+    estimated_hours = models.DecimalField(max_digits=6, decimal_places=1)
+    discount_pct    = models.DecimalField(max_digits=5, decimal_places=2)
+    price_usd       = models.DecimalField(max_digits=12, decimal_places=2)
+    status          = models.CharField(max_length=8, choices=STATUS_CHOICES, default='open')
+    booking         = models.OneToOneField(MarketplaceBooking, on_delete=models.SET_NULL,
+                                           null=True, blank=True, related_name='empty_leg',
+                                           help_text="Booking that bought this leg")
+    created_at      = models.DateTimeField(auto_now_add=True)
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering        = ['available_from']
+        unique_together = [('source_booking', 'kind')]
+        indexes = [
+            models.Index(fields=['status', 'available_from', 'available_until'], name='emptyleg_feed_idx'),
+        ]
+
+    def __str__(self):
+        return f"Empty leg {self.origin}→{self.destination} ({self.aircraft.registration_number}) {self.available_from:%Y-%m-%d}"
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # COMMISSION SETTING  (admin-controlled global rate)
 # ─────────────────────────────────────────────────────────────────────────────
@@ -703,6 +886,11 @@ class PaymentRecord(models.Model):
     description       = models.TextField(blank=True)
     created_at        = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='payment_created_idx'),
+        ]
+
     def __str__(self):
         return f"{self.payment_type} – ${self.amount_usd} – {self.status}"
 
@@ -747,6 +935,11 @@ class Dispute(models.Model):
     created_at  = models.DateTimeField(auto_now_add=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='dispute_status_idx'),
+        ]
+
     def __str__(self):
         return f"Dispute {str(self.reference)[:8]} – {self.subject[:40]}"
     
@@ -761,7 +954,17 @@ from django.conf import settings
 
 
 class EmailLog(models.Model):
-    """Tracks all emails sent by admin to inquiry/booking contacts"""
+    """
+    Tracks all emails sent by admin to inquiry/booking contacts.
+    Doubles as the outbound queue: rows are created 'pending' and delivered
+    by the process_email_queue worker (see flights/emails.py).
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent',    'Sent'),
+        ('failed',  'Failed'),
+    ]
     INQUIRY_TYPE_CHOICES = [
         ('flight_booking',      'Flight Booking'),
         ('yacht_charter',       'Yacht Charter'),
@@ -788,11 +991,50 @@ class EmailLog(models.Model):
     inquiry_type = models.CharField(max_length=30, choices=INQUIRY_TYPE_CHOICES, default='general')
     related_id   = models.IntegerField(null=True, blank=True, help_text="PK of the related inquiry/booking")
     sent_at      = models.DateTimeField(auto_now_add=True)
-    success      = models.BooleanField(default=True)
+    success      = models.BooleanField(default=False, help_text="True once the message has been delivered")
     error_msg    = models.TextField(blank=True)
+    # ── Outbox ──
+    status          = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts        = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True,
+                                           help_text="Earliest retry / lease expiry while sending")
+    delivered_at    = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ['-sent_at']
+        indexes  = [
+            models.Index(fields=['status', 'next_attempt_at'], name='emaillog_outbox_idx'),
+            models.Index(fields=['-sent_at', '-id'], name='emaillog_sent_idx'),
+        ]
+
+    def __str__(self):
+        return f"Email to {self.to_email} re: {self.inquiry_type} [{self.sent_at:%Y-%m-%d}]"
+
+# ─────────────────────────────────────────────────────────────────────────────
+# REVENUE ROLLUP  (maintained by flights/revenue.py — never edit by hand)
+# ─────────────────────────────────────────────────────────────────────────────
+class RevenueMonthly(models.Model):
+    """
+    Priced bookings summed per calendar month (of created_at), source and
+    status. Kept current by booking save/delete signals; rebuild with
+    `manage.py rebuild_revenue_rollups`.
+    """
+    SOURCE_CHOICES = [
+        ('flight',      'Flight Booking'),
+        ('marketplace', 'Marketplace Booking'),
+    ]
+    month          = models.DateField(help_text="First day of the month")
+    source         = models.CharField(max_length=12, choices=SOURCE_CHOICES)
+    status         = models.CharField(max_length=20)
+    booking_count  = models.IntegerField(default=0)
+    gross_usd      = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    commission_usd = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    net_usd        = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at     = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering        = ['month', 'source', 'status']
+        unique_together = [('source', 'status', 'month')]
 
     def __str__(self):
-        return f"Email to {self.to_email} re: {self.inquiry_type} [{self.sent_at:%Y-%m-%d}]"
\ No newline at end of file
+        return f"{self.month:%Y-%m} {self.source}/{self.status}: {self.booking_count} · ${self.gross_usd}"
@@ -0,0 +1,41 @@
+# flights/pagination.py
+"""
+Keyset (cursor) pagination for the admin list endpoints.
+
+PageNumberPagination costs a COUNT(*) plus an OFFSET scan that grows with
+the page number. The admin lists instead page on (-created_at, -id)
+through the matching composite index, so every page is an index seek,
+however deep. Responses carry `next` / `previous` cursor links and no
+`count`.
+
+?paginate=offset keeps the old page-number behaviour (?page=, count) for
+clients that still need it.
+"""
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class AdminCursorPagination(CursorPagination):
+    ordering              = ('-created_at', '-id')
+    page_size             = 20
+    page_size_query_param = 'page_size'
+    max_page_size         = 200
+
+
+class AdminPageNumberPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size         = 200
+
+
+class AdminPaginationMixin:
+    """Cursor pagination on cursor_ordering; ?paginate=offset falls back to page numbers."""
+    cursor_ordering = AdminCursorPagination.ordering
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.request.query_params.get('paginate') == 'offset':
+                self._paginator = AdminPageNumberPagination()
+            else:
+                self._paginator = AdminCursorPagination()
+                self._paginator.ordering = self.cursor_ordering
+        return self._paginator
@@ -0,0 +1,197 @@
+# flights/perf.py
+"""
+Per-request performance instrumentation.
+
+PerfMiddleware times every request and counts the SQL it runs (through
+connection.execute_wrapper — no DEBUG query log), then:
+  • adds a Server-Timing header (db / serializer / app), so browser dev
+    tools show where a slow response spent its time;
+  • folds the numbers into per-route stats, keyed "<METHOD> <url name>",
+    that /admin/perf/ reports as the slowest routes by p95 and the
+    heaviest by queries per request.
+
+SerializerTimingMixin (on the API viewsets) adds the time spent turning
+objects into primitives — get_serializer(...).data, including any lazy
+queries that fire on the way — so N+1 serializers stand out.
+
+Stats live in the worker process: each worker reports its own traffic,
+and a restart clears them. Per request the cost is one wrapper call per
+query plus a lock-protected update of a few counters, cheap enough to
+leave on. PERF_INSTRUMENTATION = False turns it off.
+
+Timings say something about the data behind a response, so the header is
+only sent with DEBUG on, or with PERF_SERVER_TIMING = True to admin and
+staff users; the stats are collected either way.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+SAMPLE_SIZE = getattr(settings, 'PERF_SAMPLE_SIZE', 500)   # recent durations kept per route
+
+_lock   = threading.Lock()
+_routes = {}
+_since  = timezone.now()
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_ms', 'serializer_ms')
+
+    def __init__(self):
+        self.queries       = 0
+        self.db_ms         = 0.0
+        self.serializer_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """connection.execute_wrapper hook."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_ms   += (time.perf_counter() - started) * 1000
+            self.queries += 1
+
+
+class RouteStats:
+    __slots__ = ('requests', 'errors', 'queries', 'max_queries', 'db_ms', 'serializer_ms',
+                 'bytes', 'total_ms', 'durations')
+
+    def __init__(self):
+        self.requests      = 0
+        self.errors        = 0
+        self.queries       = 0
+        self.max_queries   = 0
+        self.db_ms         = 0.0
+        self.serializer_ms = 0.0
+        self.bytes         = 0
+        self.total_ms      = 0.0
+        self.durations     = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, stats, duration_ms, size, status):
+        self.requests      += 1
+        self.errors        += status >= 500
+        self.queries       += stats.queries
+        self.max_queries    = max(self.max_queries, stats.queries)
+        self.db_ms         += stats.db_ms
+        self.serializer_ms += stats.serializer_ms
+        self.bytes         += size
+        self.total_ms      += duration_ms
+        self.durations.append(duration_ms)
+
+    def as_dict(self, route):
+        ordered = sorted(self.durations)
+
+        def pct(p):
+            return round(ordered[min(int(len(ordered) * p / 100), len(ordered) - 1)], 2)
+
+        n = self.requests
+        return {
+            'route':               route,
+            'requests':            n,
+            'errors':              self.errors,
+            'p50_ms':              pct(50),
+            'p95_ms':              pct(95),
+            'p99_ms':              pct(99),
+            'mean_ms':             round(self.total_ms / n, 2),
+            'queries_per_request': round(self.queries / n, 2),
+            'max_queries':         self.max_queries,
+            'db_ms_per_request':   round(self.db_ms / n, 2),
+            'serializer_ms_per_request': round(self.serializer_ms / n, 2),
+            'bytes_per_request':   round(self.bytes / n),
+        }
+
+
+def record(route, stats, duration_ms, size, status):
+    with _lock:
+        entry = _routes.get(route)
+        if entry is None:
+            entry = _routes[route] = RouteStats()
+        entry.add(stats, duration_ms, size, status)
+
+
+def snapshot(limit=20):
+    """Top routes by p95 latency and by queries per request."""
+    with _lock:
+        rows = [entry.as_dict(route) for route, entry in _routes.items()]
+    return {
+        'since':      _since,
+        'routes':     len(rows),
+        'requests':   sum(r['requests'] for r in rows),
+        'by_p95':     sorted(rows, key=lambda r: r['p95_ms'], reverse=True)[:limit],
+        'by_queries': sorted(rows, key=lambda r: r['queries_per_request'], reverse=True)[:limit],
+    }
+
+
+def reset():
+    global _since
+    with _lock:
+        _routes.clear()
+        _since = timezone.now()
+
+
+def server_timing(stats, duration_ms):
+    return (f'db;dur={stats.db_ms:.1f};desc="{stats.queries} quer{"y" if stats.queries == 1 else "ies"}", '
+            f'serializer;dur={stats.serializer_ms:.1f}, app;dur={duration_ms:.1f}')
+
+
+class PerfMiddleware:
+    def __init__(self, get_response):
+        self.get_response  = get_response
+        self.enabled       = getattr(settings, 'PERF_INSTRUMENTATION', True)
+        self.server_timing = getattr(settings, 'PERF_SERVER_TIMING', False)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        stats        = RequestStats()
+        request.perf = stats
+        started      = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(stats))
+            response = self.get_response(request)
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if self.show_timing(request):
+            response['Server-Timing'] = server_timing(stats, duration_ms)
+        match = request.resolver_match
+        if match is not None and match.view_name:
+            size = 0 if response.streaming else len(response.content)
+            record(f'{request.method} {match.view_name}', stats, duration_ms, size, response.status_code)
+        return response
+
+
+    def show_timing(self, request):
+        if settings.DEBUG:
+            return True
+        # DRF copies the token-authenticated user back onto the HttpRequest
+        user = getattr(request, 'user', None)
+        return self.server_timing and user is not None and user.is_authenticated and (
+            user.is_staff or getattr(user, 'role', None) == 'admin'
+        )
+
+
+class SerializerTimingMixin:
+    """Adds time spent in serializer.data to the request's perf stats."""
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        stats      = getattr(self.request, 'perf', None)
+        if stats is not None:
+            to_representation = serializer.to_representation
+
+            def timed(instance):
+                started = time.perf_counter()
+                try:
+                    return to_representation(instance)
+                finally:
+                    stats.serializer_ms += (time.perf_counter() - started) * 1000
+
+            serializer.to_representation = timed
+        return serializer
@@ -0,0 +1,237 @@
+# flights/pricing.py
+"""
+Shared quote maths. Anything that prints an estimated price for a route must
+go through here so the quick quote, batch quote and itinerary tools agree.
+"""
+import threading
+import time
+from bisect import bisect_right
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.utils import timezone
+
+from .cache_versions import bump_version, current_version
+
+QUOTE_OVERHEAD = 1.25   # 25% overhead on top of raw block time
+
+
+def estimate_quote(distance_km, cruise_speed_kmh, hourly_rate_usd):
+    """
+    Returns (flight_hours, price_usd) as floats, or (None, None) when the
+    distance is unknown. Same formula QuickQuoteView has always used.
+    """
+    if distance_km is None:
+        return None, None
+    flight_hours = distance_km / float(cruise_speed_kmh)
+    return flight_hours, float(hourly_rate_usd) * flight_hours * QUOTE_OVERHEAD
+
+
+def format_quote(flight_hours, price_usd):
+    """Rounds an estimate the way the public quote endpoints return it."""
+    return (
+        round(flight_hours, 1) if flight_hours else None,
+        round(price_usd, 0) if price_usd else None,
+    )
+
+
+# ── FULL BREAKDOWN (admin price calculator & itineraries) ────────────────────
+CATERING_PER_PAX_USD  = Decimal('500')
+GROUND_TRANSPORT_USD  = Decimal('800')
+CONCIERGE_USD         = Decimal('400')
+
+
+def price_breakdown(hourly_rate, hours, passenger_count, catering=False,
+                    ground_transport=False, concierge=False,
+                    discount_pct=Decimal('0'), commission_pct=Decimal('10')):
+    """
+    Extras → discount → commission breakdown, as returned by
+    PriceCalculatorViewSet.calculate. All maths in Decimal; output in floats.
+    """
+    hours      = Decimal(str(hours))
+    base       = hourly_rate * hours
+    catering   = CATERING_PER_PAX_USD * passenger_count if catering else Decimal('0')
+    ground     = GROUND_TRANSPORT_USD if ground_transport else Decimal('0')
+    concierge  = CONCIERGE_USD if concierge else Decimal('0')
+    subtotal   = base + catering + ground + concierge
+    discount   = (subtotal * Decimal(str(discount_pct)) / 100).quantize(Decimal('0.01'), ROUND_HALF_UP)
+    after_disc = subtotal - discount
+    comm_amt   = (after_disc * Decimal(str(commission_pct)) / 100).quantize(Decimal('0.01'), ROUND_HALF_UP)
+    owner_net  = after_disc - comm_amt
+
+    return {
+        'hourly_rate_usd':    float(hourly_rate),
+        'estimated_hours':    float(hours),
+        'base_flight_cost':   float(base),
+        'catering_cost':      float(catering),
+        'ground_transport':   float(ground),
+        'concierge_cost':     float(concierge),
+        'subtotal':           float(subtotal),
+        'discount_pct':       float(discount_pct),
+        'discount_amount':    float(discount),
+        'total_after_discount': float(after_disc),
+        'commission_pct':     float(commission_pct),
+        'commission_amount':  float(comm_amt),
+        'owner_net_usd':      float(owner_net),
+        'grand_total_usd':    float(after_disc),
+    }
+
+
+# ── MULTI-LEG ITINERARIES ─────────────────────────────────────────────────────
+def itinerary_legs(index, legs, base_airport_id=None):
+    """
+    Expands an ordered list of (origin_id, destination_id) into priced legs.
+    With a base airport, adds an empty positioning leg from base to the
+    first origin and from the last destination back to base, plus one between
+    any two legs that do not connect. Returns a list of dicts with
+    origin / destination / distance_km / is_positioning.
+    """
+    def leg(origin_id, destination_id, positioning):
+        return {
+            'origin':         origin_id,
+            'destination':    destination_id,
+            'distance_km':    index.distance_km(origin_id, destination_id),
+            'is_positioning': positioning,
+        }
+
+    out, here = [], base_airport_id
+    for origin_id, destination_id in legs:
+        if here is not None and here != origin_id:
+            out.append(leg(here, origin_id, True))
+        out.append(leg(origin_id, destination_id, False))
+        here = destination_id
+    if base_airport_id is not None and here != base_airport_id:
+        out.append(leg(here, base_airport_id, True))
+    return out
+
+
+def price_itinerary(legs, fleet, passenger_count, **extras):
+    """
+    Prices expanded legs for every aircraft in `fleet` — values() rows with
+    id, cruise_speed_kmh, hourly_rate_usd and range_km — in one pass. Leg
+    distances are summed once; leg hours are worked out once per cruise
+    speed and the breakdown once per (hourly rate, block hours), so
+    aircraft of the same type share both.
+
+    Block hours are flight time plus the same 25% overhead the quick quote
+    applies, rounded to 0.01 h before pricing. Each option also lists the
+    block hours of every leg (positioning included), in leg order; the
+    price is on the unrounded total, so the per-leg figures may not add up
+    to block_hours in the last digit.
+    """
+    if any(l['distance_km'] is None for l in legs):
+        raise ValueError('Every airport on the itinerary needs coordinates.')
+    total_km   = sum(l['distance_km'] for l in legs) * QUOTE_OVERHEAD
+    longest_km = max((l['distance_km'] for l in legs), default=0)
+    leg_km     = [l['distance_km'] * QUOTE_OVERHEAD for l in legs]
+
+    by_cruise, breakdowns, options = {}, {}, []
+    for ac in fleet:
+        cruise = float(ac['cruise_speed_kmh'])
+        if cruise not in by_cruise:
+            by_cruise[cruise] = (
+                round(total_km / cruise, 2),
+                [{'leg_number': n, 'block_hours': round(km / cruise, 2)} for n, km in enumerate(leg_km, 1)],
+            )
+        block_hours, per_leg = by_cruise[cruise]
+        key = (ac['hourly_rate_usd'], block_hours)
+        if key not in breakdowns:
+            breakdowns[key] = price_breakdown(key[0], block_hours, passenger_count, **extras)
+        options.append({
+            'aircraft':    {**ac, 'hourly_rate_usd': float(ac['hourly_rate_usd'])},
+            'in_range':    ac['range_km'] >= longest_km,
+            'block_hours': block_hours,
+            'legs':        per_leg,
+            'breakdown':   breakdowns[key],
+        })
+    options.sort(key=lambda o: (not o['in_range'], o['breakdown']['grand_total_usd']))
+    return options
+
+
+# ── COMMISSION SCHEDULE ───────────────────────────────────────────────────────
+DEFAULT_COMMISSION_PCT = Decimal('10')
+
+SCHEDULE_MAX_AGE_SECONDS = getattr(settings, 'COMMISSION_SCHEDULE_MAX_AGE_SECONDS', 30)
+SCHEDULE_VERSION_KEY     = 'flights:pricing:commission_schedule:version'
+
+
+class CommissionSchedule:
+    """
+    Every CommissionSetting sorted by (effective_from, id). rate_on(date)
+    returns the rate of the latest row already in effect on that date, so a
+    future-dated row only applies once its date arrives.
+    """
+
+    def __init__(self, settings, version=None):
+        rows = sorted(settings, key=lambda s: (s.effective_from, s.id))
+        self._dates   = [s.effective_from for s in rows]
+        self._rows    = rows
+        self.version  = version
+        self.built_at = time.monotonic()
+
+    def is_current(self, version):
+        return self.version == version and time.monotonic() - self.built_at < SCHEDULE_MAX_AGE_SECONDS
+
+    def setting_on(self, day):
+        i = bisect_right(self._dates, day)
+        return self._rows[i - 1] if i else None
+
+    def rate_on(self, day):
+        setting = self.setting_on(day)
+        return setting.rate_pct if setting else DEFAULT_COMMISSION_PCT
+
+
+_schedule       = None
+_schedule_lock  = threading.Lock()
+_stats_lock     = threading.Lock()
+commission_cache_stats = {'hits': 0, 'misses': 0}
+
+
+def _count(outcome):
+    with _stats_lock:
+        commission_cache_stats[outcome] += 1
+
+
+def commission_cache_counts():
+    """A consistent copy of the hit / miss counters."""
+    with _stats_lock:
+        return dict(commission_cache_stats)
+
+
+def get_commission_schedule():
+    """
+    Process-local schedule. Rebuilt when CommissionSetting signals bump the
+    shared version (in any worker — see cache_versions.py), and at the
+    latest after COMMISSION_SCHEDULE_MAX_AGE_SECONDS.
+    """
+    global _schedule
+    version  = current_version(SCHEDULE_VERSION_KEY)
+    schedule = _schedule
+    if schedule is not None and schedule.is_current(version):
+        _count('hits')
+        return schedule
+    with _schedule_lock:
+        schedule = _schedule
+        if schedule is None or not schedule.is_current(version):
+            from .models import CommissionSetting
+            _count('misses')
+            schedule = _schedule = CommissionSchedule(CommissionSetting.objects.all(), version)
+        else:
+            _count('hits')
+        return schedule
+
+
+def invalidate_commission_schedule(**kwargs):
+    """Signal receiver — drop the schedule here and, on commit, in every other worker."""
+    global _schedule
+    _schedule = None
+    bump_version(SCHEDULE_VERSION_KEY)
+
+
+def current_commission_setting():
+    return get_commission_schedule().setting_on(timezone.localdate())
+
+
+def current_commission_rate():
+    """Platform commission % in effect today (10% if nothing is configured)."""
+    return get_commission_schedule().rate_on(timezone.localdate())
@@ -0,0 +1,232 @@
+# flights/revenue.py
+"""
+Monthly revenue rollups.
+
+Every priced FlightBooking and every MarketplaceBooking contributes one
+booking (plus its gross / commission / net) to the RevenueMonthly row for
+its (source, status, month of created_at). Saves and deletes move that
+contribution between rows with F() increments (see flights/signals.py),
+so the chart endpoints read a few dozen rollup rows instead of
+re-aggregating every booking ever made.
+
+Bulk writes (QuerySet.update, bulk_create, raw SQL) bypass the signals —
+call refresh_rollups() for the rows touched (the admin bulk actions do),
+or run `manage.py rebuild_revenue_rollups` afterwards.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import DateField, Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from .models import FlightBooking, MarketplaceBooking, RevenueMonthly
+
+# Statuses the revenue chart has always counted as booked revenue
+FLIGHT_REVENUE_STATUSES      = ['confirmed', 'in_flight', 'completed']
+MARKETPLACE_REVENUE_STATUSES = ['completed']
+
+ZERO = Decimal('0')
+
+
+def month_of(dt):
+    return timezone.localtime(dt).date().replace(day=1)
+
+
+def contribution(instance):
+    """(source, status, month, gross, commission, net) for a booking, or None."""
+    if instance.created_at is None:
+        return None
+    if isinstance(instance, FlightBooking):
+        if instance.quoted_price_usd is None:
+            return None
+        return ('flight', instance.status, month_of(instance.created_at),
+                Decimal(instance.quoted_price_usd),
+                Decimal(instance.commission_usd or 0),
+                Decimal(instance.net_revenue_usd or 0))
+    return ('marketplace', instance.status, month_of(instance.created_at),
+            Decimal(instance.gross_amount_usd),
+            Decimal(instance.commission_usd),
+            Decimal(instance.net_owner_usd))
+
+
+def _apply(contrib, sign):
+    source, status, month, gross, commission, net = contrib
+    row, _ = RevenueMonthly.objects.get_or_create(source=source, status=status, month=month)
+    RevenueMonthly.objects.filter(pk=row.pk).update(
+        booking_count =F('booking_count')  + sign,
+        gross_usd     =F('gross_usd')      + sign * gross,
+        commission_usd=F('commission_usd') + sign * commission,
+        net_usd       =F('net_usd')        + sign * net,
+        updated_at    =timezone.now(),
+    )
+
+
+# ── Signal receivers ──────────────────────────────────────────────────────────
+def remember_revenue(sender, instance, raw=False, **kwargs):
+    """pre_save — note what the row contributed before this save."""
+    if raw or instance.pk is None:
+        instance._revenue_before = None
+        return
+    before = sender.objects.filter(pk=instance.pk).first()
+    instance._revenue_before = contribution(before) if before else None
+
+
+def update_revenue(sender, instance, raw=False, **kwargs):
+    """post_save — move the booking's contribution to its current row."""
+    if raw:
+        return
+    before = getattr(instance, '_revenue_before', None)
+    after  = contribution(instance)
+    instance._revenue_before = after
+    if before == after:
+        return
+    with transaction.atomic():
+        if before:
+            _apply(before, -1)
+        if after:
+            _apply(after, 1)
+
+
+def remove_revenue(sender, instance, **kwargs):
+    """post_delete — take the booking's contribution back out."""
+    contrib = contribution(instance)
+    if contrib:
+        _apply(contrib, -1)
+
+
+# ── Backfill ──────────────────────────────────────────────────────────────────
+SOURCES = {
+    'flight':      (FlightBooking, {'quoted_price_usd__isnull': False},
+                    'quoted_price_usd', 'commission_usd', 'net_revenue_usd'),
+    'marketplace': (MarketplaceBooking, {},
+                    'gross_amount_usd', 'commission_usd', 'net_owner_usd'),
+}
+
+
+def _rollup_rows(source, months=None):
+    """RevenueMonthly rows for one source, aggregated from its booking table."""
+    model, where, gross, commission, net = SOURCES[source]
+    qs = model.objects.filter(**where).annotate(month=TruncMonth('created_at', output_field=DateField()))
+    if months is not None:
+        qs = qs.filter(month__in=months)
+    grouped = (
+        qs.values('month', 'status')
+        .annotate(
+            n=Count('id'),
+            g=Coalesce(Sum(gross), Value(ZERO)),
+            c=Coalesce(Sum(commission), Value(ZERO)),
+            t=Coalesce(Sum(net), Value(ZERO)),
+        )
+        .order_by()
+    )
+    return [
+        RevenueMonthly(
+            source=source, status=r['status'], month=r['month'], booking_count=r['n'],
+            gross_usd=r['g'], commission_usd=r['c'], net_usd=r['t'],
+        )
+        for r in grouped
+    ]
+
+
+def rebuild_rollups():
+    """Recompute every RevenueMonthly row from the booking tables. Returns the row count."""
+    rows = _rollup_rows('flight') + _rollup_rows('marketplace')
+    with transaction.atomic():
+        RevenueMonthly.objects.all().delete()
+        RevenueMonthly.objects.bulk_create(rows)
+    return len(rows)
+
+
+def refresh_rollups(model, pks):
+    """
+    Recompute the RevenueMonthly rows for the months the given bookings
+    were created in — for QuerySet.update() callers, which skip the signals.
+    """
+    source = 'flight' if model is FlightBooking else 'marketplace'
+    months = {month_of(dt) for dt in model.objects.filter(pk__in=pks).values_list('created_at', flat=True)}
+    if not months:
+        return 0
+    rows = _rollup_rows(source, months)
+    with transaction.atomic():
+        RevenueMonthly.objects.filter(source=source, month__in=months).delete()
+        RevenueMonthly.objects.bulk_create(rows)
+    return len(rows)
+
+
+# ── Readers ───────────────────────────────────────────────────────────────────
+def revenue_chart(months=12):
+    """Payload for the admin revenue_chart endpoints (booked flight revenue)."""
+    since = month_of(timezone.now() - timedelta(days=months * 31))
+    booked = RevenueMonthly.objects.filter(source='flight', status__in=FLIGHT_REVENUE_STATUSES)
+    chart = (
+        booked.filter(month__gte=since)
+        .values('month')
+        .annotate(
+            confirmed_count=Sum('booking_count'),
+            gross_usd      =Sum('gross_usd'),
+            commission_usd =Sum('commission_usd'),
+            net_usd        =Sum('net_usd'),
+        )
+        .filter(confirmed_count__gt=0)
+        .order_by('month')
+    )
+    totals = booked.aggregate(
+        total_bookings  =Sum('booking_count'),
+        total_gross     =Sum('gross_usd'),
+        total_commission=Sum('commission_usd'),
+        total_net       =Sum('net_usd'),
+    )
+    return {
+        'chart': [
+            {
+                'month':            row['month'].strftime('%Y-%m'),
+                'label':            row['month'].strftime('%b %Y'),
+                'confirmed_count':  row['confirmed_count'],
+                'gross_usd':        float(row['gross_usd']        or 0),
+                'commission_usd':   float(row['commission_usd']   or 0),
+                'net_usd':          float(row['net_usd']          or 0),
+            }
+            for row in chart
+        ],
+        'totals': {
+            'total_bookings':   totals['total_bookings']   or 0,
+            'total_gross':      float(totals['total_gross']      or 0),
+            'total_commission': float(totals['total_commission'] or 0),
+            'total_net':        float(totals['total_net']        or 0),
+        },
+    }
+
+
+def combined_revenue():
+    """Payload for combined_revenue — booked flight plus completed marketplace revenue."""
+    flight_q = Q(source='flight', status__in=FLIGHT_REVENUE_STATUSES)
+    mp_q     = Q(source='marketplace', status__in=MARKETPLACE_REVENUE_STATUSES)
+    agg = RevenueMonthly.objects.filter(flight_q | mp_q).aggregate(
+        flight_gross     =Sum('gross_usd',      filter=flight_q),
+        flight_commission=Sum('commission_usd', filter=flight_q),
+        mp_gross         =Sum('gross_usd',      filter=mp_q),
+        mp_commission    =Sum('commission_usd', filter=mp_q),
+    )
+    flight_gross      = float(agg['flight_gross']      or 0)
+    flight_commission = float(agg['flight_commission'] or 0)
+    mp_gross          = float(agg['mp_gross']          or 0)
+    mp_commission     = float(agg['mp_commission']     or 0)
+    total_gross       = flight_gross + mp_gross
+    total_commission  = flight_commission + mp_commission
+    return {
+        'flight_bookings': {
+            'gross':      flight_gross,
+            'commission': flight_commission,
+        },
+        'marketplace_bookings': {
+            'gross':      mp_gross,
+            'commission': mp_commission,
+        },
+        'combined': {
+            'gross':      total_gross,
+            'commission': total_commission,
+            'net':        total_gross - total_commission,
+        },
+    }
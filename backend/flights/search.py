@@ -0,0 +1,139 @@
+# flights/search.py
+"""
+In-memory airport autocomplete.
+
+Built from the rows already held by the airport index in geo.py, so it is
+rebuilt whenever that index is (Airport post_save / post_delete). Matches are
+ranked:
+
+    0  exact IATA / ICAO code
+    1  code prefix
+    2  city prefix (any word of the city)
+    3  name prefix (any word of the name)
+    4  substring of name or city (trigram lookup, queries of 3+ chars)
+    5  country prefix
+
+Ties break on city then code, the order AirportViewSet lists airports in.
+"""
+import heapq
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+
+from .geo import get_airport_index
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse punctuation to single spaces."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_ALNUM.sub(' ', text.lower()).strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _PrefixIndex:
+    """Sorted (key, id) pairs — a flattened trie answered with bisect."""
+
+    def __init__(self, pairs):
+        pairs = sorted(set(pairs))
+        self._keys = [k for k, _ in pairs]
+        self._ids  = [i for _, i in pairs]
+
+    def startswith(self, prefix):
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + '\uffff', lo)
+        return self._ids[lo:hi]
+
+
+class AirportSearchIndex:
+    def __init__(self, airports):
+        airports = list(airports)
+        self.airports = {a.id: a for a in airports}
+        self._order   = {}   # id -> tie-break position (city, code)
+        self._text    = {}   # id -> normalized "name city" for substring checks
+        self._codes   = {}   # exact code -> [ids]
+        code_pairs, city_pairs, name_pairs, country_pairs = [], [], [], []
+        self._trigram = {}
+
+        for pos, a in enumerate(sorted(airports, key=lambda a: (a.city.lower(), a.code))):
+            self._order[a.id] = pos
+            code = a.code.lower()
+            self._codes.setdefault(code, []).append(a.id)
+            code_pairs.append((code, a.id))
+            city, name = normalize(a.city), normalize(a.name)
+            city_pairs.extend((w, a.id) for w in city.split())
+            city_pairs.append((city, a.id))
+            name_pairs.extend((w, a.id) for w in name.split())
+            country_pairs.append((normalize(a.country), a.id))
+            text = f'{name} {city}'
+            self._text[a.id] = text
+            for tri in _trigrams(text):
+                self._trigram.setdefault(tri, []).append(a.id)
+
+        self._code_prefix    = _PrefixIndex(code_pairs)
+        self._city_prefix    = _PrefixIndex(city_pairs)
+        self._name_prefix    = _PrefixIndex(name_pairs)
+        self._country_prefix = _PrefixIndex(country_pairs)
+
+    def search(self, query, limit=10):
+        """Return up to `limit` Airport objects ranked for autocomplete."""
+        q = normalize(query)
+        if not q or limit <= 0:
+            return []
+
+        # Walk the ranks best-first and stop once the page is full, so a
+        # one-letter query never sorts thousands of weaker matches.
+        tiers = [lambda: self._codes.get(q, ())]
+        if ' ' not in q:
+            tiers.append(lambda: self._code_prefix.startswith(q))
+        tiers.append(lambda: self._city_prefix.startswith(q))
+        tiers.append(lambda: self._name_prefix.startswith(q))
+        if len(q) >= 3:
+            tiers.append(lambda: self._substring(q))
+        tiers.append(lambda: self._country_prefix.startswith(q))
+
+        found, seen = [], set()
+        for tier in tiers:
+            fresh = set(tier()) - seen
+            if not fresh:
+                continue
+            take = heapq.nsmallest(limit - len(found), fresh, key=self._order.__getitem__)
+            found.extend(take)
+            if len(found) >= limit:
+                break
+            seen.update(take)
+        return [self.airports[pk] for pk in found]
+
+    def _substring(self, q):
+        postings = [self._trigram.get(t) for t in _trigrams(q)]
+        if not postings or any(p is None for p in postings):
+            return ()
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates.intersection_update(p)
+            if not candidates:
+                return ()
+        return [pk for pk in candidates if q in self._text[pk]]
+
+
+_search      = None
+_search_src  = None
+_search_lock = threading.Lock()
+
+
+def get_airport_search_index():
+    """Return the autocomplete index, rebuilding it when the airport index changed."""
+    global _search, _search_src
+    source = get_airport_index()
+    if _search is None or _search_src is not source:
+        with _search_lock:
+            if _search is None or _search_src is not source:
+                _search, _search_src = AirportSearchIndex(source.airports.values()), source
+    return _search
@@ -124,7 +124,40 @@ class FlightInquirySerializer(serializers.ModelSerializer):
 class BookingStatusSerializer(serializers.Serializer):
     """Used for tracking bookings by reference"""
     reference = serializers.UUIDField()
-    
+
+
+class QuoteRouteSerializer(serializers.Serializer):
+    origin      = serializers.IntegerField()
+    destination = serializers.IntegerField()
+
+
+class QuickQuoteBatchSerializer(serializers.Serializer):
+    """Input for quick-quote/batch — routes × (optionally filtered) fleet"""
+    routes               = QuoteRouteSerializer(many=True, allow_empty=False, max_length=50)
+    aircraft             = serializers.ListField(child=serializers.IntegerField(), required=False)
+    category             = serializers.ChoiceField(choices=Aircraft.CATEGORY_CHOICES, required=False)
+    min_capacity         = serializers.IntegerField(min_value=1, required=False)
+    exclude_out_of_range = serializers.BooleanField(default=False)
+
+
+class NearbyPointSerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    ref = serializers.CharField(required=False, allow_blank=True, help_text="Echoed back, e.g. an inquiry reference")
+
+
+class NearbyAirportQuerySerializer(NearbyPointSerializer):
+    """?lat=&lon=&radius_km=&k= for airports/nearby"""
+    radius_km = serializers.FloatField(min_value=0, required=False)
+    k         = serializers.IntegerField(min_value=1, max_value=50, default=5)
+
+
+class NearbyAirportBulkSerializer(serializers.Serializer):
+    """Many points resolved in one call — same radius_km / k for all"""
+    points    = NearbyPointSerializer(many=True, allow_empty=False, max_length=500)
+    radius_km = serializers.FloatField(min_value=0, required=False)
+    k         = serializers.IntegerField(min_value=1, max_value=50, default=5)
+
     
 
 # ── ADD THESE IMPORTS to the top of serializers.py ───────────────────────────
@@ -190,11 +223,12 @@ class AircraftSalesInquirySerializer(serializers.ModelSerializer):
 
 from rest_framework import serializers
 from django.contrib.auth import authenticate
+from decimal import Decimal
 from .models import (
     User, MembershipTier, Membership,
     MarketplaceAircraft, MaintenanceLog,
     MarketplaceBooking, CommissionSetting,
-    PaymentRecord, SavedRoute, Dispute,
+    PaymentRecord, SavedRoute, Dispute, EmptyLeg,
 )
 
 
@@ -298,9 +332,54 @@ class MarketplaceAircraftSerializer(serializers.ModelSerializer):
 
     class Meta:
         model  = MarketplaceAircraft
-        fields = '__all__'
+        # tier_mask and maintenance_hours_left are internal index columns
+        exclude = ['tier_mask', 'maintenance_hours_left']
         read_only_fields = ['reference', 'owner', 'is_approved', 'created_at', 'updated_at']
 
+    def validate_exclusive_tiers(self, tiers):
+        from django.core.exceptions import ValidationError as DjangoValidationError
+        from .visibility import tier_bit
+        for tier in tiers:
+            try:
+                tier_bit(tier.name)
+            except DjangoValidationError as exc:
+                raise serializers.ValidationError(exc.messages)
+        return tiers
+
+
+# ── FLIGHT HOURS INGESTION ────────────────────────────────────────────────────
+class FlightHoursRecordSerializer(serializers.Serializer):
+    record_id           = serializers.CharField(max_length=100)
+    registration_number = serializers.CharField(max_length=50)
+    hours               = serializers.DecimalField(max_digits=7, decimal_places=1, min_value=Decimal('0.1'))
+    timestamp           = serializers.DateTimeField()
+
+
+# ── FLEET SEARCH ──────────────────────────────────────────────────────────────
+class FleetSearchSerializer(serializers.Serializer):
+    """Query parameters for marketplace fleet search — airports by id or code"""
+    origin      = serializers.CharField()
+    destination = serializers.CharField()
+    date        = serializers.DateField()
+    time        = serializers.TimeField(required=False, allow_null=True,
+                                        help_text="UTC departure time; leave blank for any time that day.")
+    passengers  = serializers.IntegerField(min_value=1)
+    limit       = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+    def validate(self, data):
+        from .geo import get_airport_index, resolve_airport
+        origin      = resolve_airport(data['origin'])
+        destination = resolve_airport(data['destination'])
+        if origin is None or destination is None:
+            raise serializers.ValidationError('Unknown origin or destination airport.')
+        if origin.id == destination.id:
+            raise serializers.ValidationError('Origin and destination must differ.')
+        distance = get_airport_index().distance_km(origin.id, destination.id)
+        if distance is None:
+            raise serializers.ValidationError('Distance unavailable for this route.')
+        data.update(origin=origin, destination=destination, distance_km=distance)
+        return data
+
 
 # ── MAINTENANCE LOG ───────────────────────────────────────────────────────────
 class MaintenanceLogSerializer(serializers.ModelSerializer):
@@ -320,7 +399,7 @@ class MarketplaceBookingSerializer(serializers.ModelSerializer):
     aircraft_name  = serializers.CharField(source='aircraft.name', read_only=True)
     aircraft_reg   = serializers.CharField(source='aircraft.registration_number', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
-    tier_name      = serializers.SerializerMethodField()
+    tier_name      = serializers.CharField(source='membership.tier.display_name', read_only=True, allow_null=True)
 
     class Meta:
         model  = MarketplaceBooking
@@ -330,9 +409,6 @@ class MarketplaceBookingSerializer(serializers.ModelSerializer):
             'commission_usd', 'net_owner_usd', 'created_at', 'updated_at'
         ]
 
-    def get_tier_name(self, obj):
-        return obj.membership.tier.display_name if obj.membership else None
-
     def validate(self, data):
         user = self.context['request'].user
         # Ensure membership is active before booking
@@ -355,6 +431,30 @@ class MarketplaceBookingCreateSerializer(serializers.ModelSerializer):
         ]
 
 
+# ── EMPTY LEGS ────────────────────────────────────────────────────────────────
+class EmptyLegSerializer(serializers.ModelSerializer):
+    aircraft_name  = serializers.CharField(source='aircraft.name', read_only=True)
+    aircraft_model = serializers.CharField(source='aircraft.model', read_only=True)
+    category       = serializers.CharField(source='aircraft.get_category_display', read_only=True)
+    seats          = serializers.IntegerField(source='aircraft.passenger_capacity', read_only=True)
+    image_url      = serializers.URLField(source='aircraft.image_url', read_only=True)
+    kind_display   = serializers.CharField(source='get_kind_display', read_only=True)
+
+    class Meta:
+        model  = EmptyLeg
+        fields = [
+            'id', 'aircraft', 'aircraft_name', 'aircraft_model', 'category', 'seats', 'image_url',
+            'kind', 'kind_display', 'origin', 'destination', 'available_from', 'available_until',
+            'estimated_hours', 'discount_pct', 'price_usd', 'status',
+        ]
+
+
+class EmptyLegBookSerializer(serializers.Serializer):
+    departure_datetime = serializers.DateTimeField(help_text="Within the leg's available window")
+    passenger_count    = serializers.IntegerField(min_value=1)
+    special_requests   = serializers.CharField(required=False, allow_blank=True, default='')
+
+
 # ── COMMISSION ────────────────────────────────────────────────────────────────
 class CommissionSettingSerializer(serializers.ModelSerializer):
     class Meta:
@@ -450,7 +550,8 @@ from .models import (
 
 # ── EMAIL LOG SERIALIZER ──────────────────────────────────────────────────────
 class EmailLogSerializer(serializers.ModelSerializer):
-    sent_by_name = serializers.CharField(source='sent_by.get_full_name', read_only=True)
+    sent_by_name   = serializers.CharField(source='sent_by.get_full_name', read_only=True)
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
 
     class Meta:
         model  = EmailLog          # see models_additions.py
@@ -483,6 +584,46 @@ class SendEmailSerializer(serializers.Serializer):
     related_id  = serializers.IntegerField(required=False, allow_null=True)
 
 
+# ── BULK EMAIL SERIALIZER ────────────────────────────────────────────────────
+class BulkRecipientSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    name  = serializers.CharField(max_length=200, required=False, default='')
+
+
+class BulkEmailSerializer(serializers.Serializer):
+    """
+    Either an explicit `recipients` list or at least one member filter.
+    subject/body may use {name}, {first_name}, {email} and {tier}.
+    """
+    recipients        = BulkRecipientSerializer(many=True, required=False)
+    role              = serializers.ChoiceField(choices=User.ROLE_CHOICES, required=False)
+    membership_status = serializers.ChoiceField(choices=Membership.STATUS_CHOICES, required=False)
+    tier              = serializers.ChoiceField(choices=MembershipTier.TIER_CHOICES, required=False)
+    subject           = serializers.CharField(max_length=500)
+    body              = serializers.CharField()
+    inquiry_type      = serializers.ChoiceField(choices=EmailLog.INQUIRY_TYPE_CHOICES, default='general')
+    chunk_size        = serializers.IntegerField(min_value=1, max_value=500, default=100)
+
+    def validate(self, data):
+        from .emails import BULK_PLACEHOLDERS, template_fields
+        has_filter = any(data.get(k) for k in ('role', 'membership_status', 'tier'))
+        if data.get('recipients') and has_filter:
+            raise serializers.ValidationError("Send either recipients or filters, not both.")
+        if not data.get('recipients') and not has_filter:
+            raise serializers.ValidationError("Provide recipients or at least one of role, membership_status, tier.")
+        for field in ('subject', 'body'):
+            try:
+                unknown = template_fields(data[field]) - BULK_PLACEHOLDERS
+            except ValueError as e:
+                raise serializers.ValidationError({field: f"Invalid template: {e}"})
+            if unknown:
+                raise serializers.ValidationError({
+                    field: f"Unknown placeholder(s): {', '.join(sorted(unknown))}. "
+                           f"Allowed: {', '.join(sorted(BULK_PLACEHOLDERS))}."
+                })
+        return data
+
+
 # ── FLIGHT BOOKING ADMIN SERIALIZERS ─────────────────────────────────────────
 # ── PATCH: Replace FlightBookingAdminSerializer & FlightBookingPriceSerializer
 # in your existing serializers.py with these versions.
@@ -494,7 +635,7 @@ from .models import CommissionSetting
 
 class FlightBookingAdminSerializer(serializers.ModelSerializer):
     """Full admin view — includes commission breakdown."""
-    legs              = serializers.SerializerMethodField()
+    legs              = FlightLegSerializer(many=True, read_only=True)
     origin_detail     = serializers.SerializerMethodField()
     dest_detail       = serializers.SerializerMethodField()
     status_display    = serializers.CharField(source='get_status_display',    read_only=True)
@@ -508,10 +649,6 @@ class FlightBookingAdminSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['reference', 'commission_usd', 'net_revenue_usd', 'created_at', 'updated_at']
 
-    def get_legs(self, obj):
-        from .serializers import FlightLegSerializer
-        return FlightLegSerializer(obj.legs.all(), many=True).data
-
     def get_origin_detail(self, obj):
         if obj.origin:
             return {'id': obj.origin.id, 'code': obj.origin.code, 'city': obj.origin.city}
@@ -547,8 +684,8 @@ class FlightBookingPriceSerializer(serializers.Serializer):
     def validate(self, data):
         # Auto-fill commission_pct from the active CommissionSetting
         if not data.get('commission_pct'):
-            setting = CommissionSetting.objects.order_by('-effective_from').first()
-            data['commission_pct'] = setting.rate_pct if setting else Decimal('10')
+            from .pricing import current_commission_rate
+            data['commission_pct'] = current_commission_rate()
         return data
 
 
@@ -660,6 +797,32 @@ class PriceCalculatorSerializer(serializers.Serializer):
     notes            = serializers.CharField(required=False, default='')
 
 
+class ItineraryLegInputSerializer(serializers.Serializer):
+    origin      = serializers.IntegerField()
+    destination = serializers.IntegerField()
+
+
+class ItineraryPriceSerializer(serializers.Serializer):
+    """Multi-leg pricing — either explicit legs or an existing FlightBooking"""
+    legs             = ItineraryLegInputSerializer(many=True, required=False, max_length=20)
+    booking_id       = serializers.IntegerField(required=False)
+    aircraft_id      = serializers.IntegerField(required=False, allow_null=True,
+                                                help_text="Leave blank to price the available fleet.")
+    base_airport     = serializers.IntegerField(required=False, allow_null=True,
+                                                help_text="Aircraft have no stored base; adds positioning legs to/from this airport.")
+    passenger_count  = serializers.IntegerField(min_value=1)
+    catering         = serializers.BooleanField(default=False)
+    ground_transport = serializers.BooleanField(default=False)
+    concierge        = serializers.BooleanField(default=False)
+    discount_pct     = serializers.DecimalField(max_digits=5, decimal_places=2, default=0)
+    commission_pct   = serializers.DecimalField(max_digits=5, decimal_places=2, required=False)
+
+    def validate(self, data):
+        if not data.get('legs') and not data.get('booking_id'):
+            raise serializers.ValidationError('Provide either legs or booking_id.')
+        return data
+
+
 # ── MARKETPLACE BOOKING ADMIN RESPONSE ───────────────────────────────────────
 class MarketplaceBookingAdminSerializer(serializers.ModelSerializer):
     client_name    = serializers.CharField(source='client.get_full_name', read_only=True)
@@ -669,16 +832,13 @@ class MarketplaceBookingAdminSerializer(serializers.ModelSerializer):
     owner_name     = serializers.CharField(source='aircraft.owner.get_full_name', read_only=True)
     owner_email    = serializers.EmailField(source='aircraft.owner.email', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
-    tier_name      = serializers.SerializerMethodField()
+    tier_name      = serializers.CharField(source='membership.tier.display_name', read_only=True, allow_null=True)
 
     class Meta:
         model  = MarketplaceBooking
         fields = '__all__'
         read_only_fields = ['reference', 'client', 'commission_usd', 'net_owner_usd', 'created_at', 'updated_at']
 
-    def get_tier_name(self, obj):
-        return obj.membership.tier.display_name if obj.membership else None
-
 
 class MarketplaceBookingCreateAdminSerializer(serializers.ModelSerializer):
     """Admin creates a marketplace booking on behalf of a client"""
@@ -694,8 +854,8 @@ class MarketplaceBookingCreateAdminSerializer(serializers.ModelSerializer):
 
 # ── USER MANAGEMENT ───────────────────────────────────────────────────────────
 class UserAdminSerializer(serializers.ModelSerializer):
-    membership_status = serializers.SerializerMethodField()
-    membership_tier   = serializers.SerializerMethodField()
+    membership_status = serializers.CharField(source='membership.status', read_only=True, allow_null=True)
+    membership_tier   = serializers.CharField(source='membership.tier.display_name', read_only=True, allow_null=True)
     full_name         = serializers.SerializerMethodField()
 
     class Meta:
@@ -706,18 +866,6 @@ class UserAdminSerializer(serializers.ModelSerializer):
             'membership_status', 'membership_tier',
         ]
 
-    def get_membership_status(self, obj):
-        try:
-            return obj.membership.status
-        except Exception:
-            return None
-
-    def get_membership_tier(self, obj):
-        try:
-            return obj.membership.tier.display_name
-        except Exception:
-            return None
-
     def get_full_name(self, obj):
         return obj.get_full_name() or obj.username
 
@@ -0,0 +1,62 @@
+# flights/signals.py
+# Keeps caches, rollups and denormalised columns in sync with the rows they mirror.
+# Connected from FlightsConfig.ready().
+
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, m2m_changed
+
+from .models import (
+    Airport, Aircraft, Yacht, CommissionSetting, User, Membership, MembershipTier,
+    FlightBooking, MarketplaceBooking, MarketplaceAircraft,
+)
+from .catalog import bump_catalog_version
+from .geo import invalidate_airport_index
+from .pricing import invalidate_commission_schedule
+from .revenue import remember_revenue, update_revenue, remove_revenue
+from .empty_legs import booking_changed, aircraft_changed
+from .visibility import exclusive_tiers_changed, tier_saved, tier_deleting, tier_deleted
+from .summaries import INQUIRY_MODELS, invalidate_inquiries_summary, invalidate_users_summary
+
+
+def connect_signals():
+    # ── Airport distance index (geo.py) ──────────────────────────────────────
+    post_save.connect(invalidate_airport_index,   sender=Airport, dispatch_uid='geo_airport_saved')
+    post_delete.connect(invalidate_airport_index, sender=Airport, dispatch_uid='geo_airport_deleted')
+
+    # ── Public catalog lists (catalog.py) ────────────────────────────────────
+    for model in (Airport, Aircraft, Yacht, MembershipTier):
+        label = model._meta.model_name
+        post_save.connect(bump_catalog_version,   sender=model, dispatch_uid=f'catalog_{label}_saved')
+        post_delete.connect(bump_catalog_version, sender=model, dispatch_uid=f'catalog_{label}_deleted')
+
+    # ── Commission schedule (pricing.py) ─────────────────────────────────────
+    post_save.connect(invalidate_commission_schedule,   sender=CommissionSetting, dispatch_uid='commission_saved')
+    post_delete.connect(invalidate_commission_schedule, sender=CommissionSetting, dispatch_uid='commission_deleted')
+
+    # ── Admin overview counters (summaries.py) ───────────────────────────────
+    for model in INQUIRY_MODELS:
+        label = model._meta.model_name
+        post_save.connect(invalidate_inquiries_summary,   sender=model, dispatch_uid=f'summary_{label}_saved')
+        post_delete.connect(invalidate_inquiries_summary, sender=model, dispatch_uid=f'summary_{label}_deleted')
+    for model in (User, Membership):
+        label = model._meta.model_name
+        post_save.connect(invalidate_users_summary,   sender=model, dispatch_uid=f'summary_{label}_saved')
+        post_delete.connect(invalidate_users_summary, sender=model, dispatch_uid=f'summary_{label}_deleted')
+
+    # ── Monthly revenue rollups (revenue.py) ─────────────────────────────────
+    for model in (FlightBooking, MarketplaceBooking):
+        label = model._meta.model_name
+        pre_save.connect(remember_revenue,  sender=model, dispatch_uid=f'revenue_{label}_presave')
+        post_save.connect(update_revenue,   sender=model, dispatch_uid=f'revenue_{label}_saved')
+        post_delete.connect(remove_revenue, sender=model, dispatch_uid=f'revenue_{label}_deleted')
+
+    # ── Marketplace tier visibility mask (visibility.py) ─────────────────────
+    m2m_changed.connect(exclusive_tiers_changed, sender=MarketplaceAircraft.exclusive_tiers.through,
+                        dispatch_uid='visibility_tiers_changed')
+    post_save.connect(tier_saved,      sender=MembershipTier, dispatch_uid='visibility_tier_saved')
+    pre_delete.connect(tier_deleting,  sender=MembershipTier, dispatch_uid='visibility_tier_deleting')
+    post_delete.connect(tier_deleted,  sender=MembershipTier, dispatch_uid='visibility_tier_deleted')
+
+    # ── Empty legs (empty_legs.py) ───────────────────────────────────────────
+    post_save.connect(booking_changed,   sender=MarketplaceBooking,  dispatch_uid='empty_legs_booking_saved')
+    post_delete.connect(booking_changed, sender=MarketplaceBooking,  dispatch_uid='empty_legs_booking_deleted')
+    post_save.connect(aircraft_changed,  sender=MarketplaceAircraft, dispatch_uid='empty_legs_aircraft_saved')
@@ -0,0 +1,97 @@
+# flights/summaries.py
+"""
+Counters for the admin overview tabs.
+
+Each inquiry table is reduced to one (key, total, pending) row with
+conditional aggregates and the rows are UNIONed, so inquiries_summary is a
+single query however many tables it covers; users_summary is two. Results
+sit in the Django cache for ADMIN_SUMMARY_CACHE_SECONDS and are dropped by
+post_save / post_delete on the underlying models (see flights/signals.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import CharField, Count, Q, Value
+
+from .models import (
+    FlightBooking, YachtCharter, LeaseInquiry, FlightInquiry, ContactInquiry,
+    GroupCharterInquiry, AirCargoInquiry, AircraftSalesInquiry, User, Membership,
+)
+
+CACHE_SECONDS = getattr(settings, 'ADMIN_SUMMARY_CACHE_SECONDS', 30)
+
+INQUIRIES_CACHE_KEY = 'flights:admin:inquiries_summary'
+USERS_CACHE_KEY     = 'flights:admin:users_summary'
+
+# (total key, pending key, model, what counts as pending)
+INQUIRY_TABLES = [
+    ('flight_bookings',  'pending_flight_bookings', FlightBooking,        Q(status='inquiry')),
+    ('yacht_charters',   'pending_yacht_charters',  YachtCharter,         Q(status='inquiry')),
+    ('lease_inquiries',  'pending_lease',           LeaseInquiry,         Q(status='pending')),
+    ('flight_inquiries', None,                      FlightInquiry,        None),
+    ('contacts',         'pending_contacts',        ContactInquiry,       Q()),   # no status column
+    ('group_charters',   'pending_group_charters',  GroupCharterInquiry,  Q(status='pending')),
+    ('air_cargo',        'pending_air_cargo',       AirCargoInquiry,      Q(status='pending')),
+    ('aircraft_sales',   'pending_aircraft_sales',  AircraftSalesInquiry, Q(status='pending')),
+]
+
+INQUIRY_MODELS = [model for _, _, model, _ in INQUIRY_TABLES]
+
+
+def _counts(key, model, pending):
+    return model.objects.annotate(
+        key=Value(key, output_field=CharField()),
+    ).values('key').annotate(
+        total=Count('pk'),
+        pending=Count('pk', filter=pending) if pending is not None else Value(0),
+    ).values_list('key', 'total', 'pending').order_by()
+
+
+def compute_inquiries_summary():
+    parts = [_counts(key, model, pending) for key, _, model, pending in INQUIRY_TABLES]
+    rows  = {key: (total, pending) for key, total, pending in parts[0].union(*parts[1:], all=True)}
+    result = {}
+    for key, _, _, _ in INQUIRY_TABLES:
+        result[key] = rows.get(key, (0, 0))[0]
+    for key, pending_key, _, _ in INQUIRY_TABLES:
+        if pending_key:
+            result[pending_key] = rows.get(key, (0, 0))[1]
+    return result
+
+
+def compute_users_summary():
+    users = User.objects.aggregate(
+        total_users=Count('pk'),
+        clients=Count('pk', filter=Q(role='client')),
+        owners=Count('pk', filter=Q(role='owner')),
+    )
+    members = Membership.objects.aggregate(
+        active_members=Count('pk', filter=Q(status='active')),
+        expired=Count('pk', filter=Q(status='expired')),
+    )
+    return {**users, **members}
+
+
+def inquiries_summary():
+    result = cache.get(INQUIRIES_CACHE_KEY)
+    if result is None:
+        result = compute_inquiries_summary()
+        cache.set(INQUIRIES_CACHE_KEY, result, CACHE_SECONDS)
+    return result
+
+
+def users_summary():
+    result = cache.get(USERS_CACHE_KEY)
+    if result is None:
+        result = compute_users_summary()
+        cache.set(USERS_CACHE_KEY, result, CACHE_SECONDS)
+    return result
+
+
+def invalidate_inquiries_summary(**kwargs):
+    """Signal receiver — an inquiry row changed."""
+    cache.delete(INQUIRIES_CACHE_KEY)
+
+
+def invalidate_users_summary(**kwargs):
+    """Signal receiver — a User or Membership row changed."""
+    cache.delete(USERS_CACHE_KEY)
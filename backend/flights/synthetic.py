@@ -0,0 +1,436 @@
+# flights/synthetic.py
+"""
+Large synthetic datasets for load testing (seed_data --scale N).
+
+Generates roughly N rows spread across members, fleet owners, marketplace
+aircraft, maintenance logs, marketplace bookings, payments, flight
+bookings, yacht charters and the inquiry tables. Everything is written
+with bulk_create in batches and drawn from one seeded random.Random, so
+the same --scale/--seed pair gives the same dataset, references included.
+
+bulk_create skips Model.save() and signals, so this module fills in what
+they would have: booking commission/net amounts and calendar windows,
+and — once everything is inserted — the revenue rollup, empty legs and the
+cached admin summaries. created_at is spread over the last two years,
+with auto_now/auto_now_add switched off while the rows go in.
+"""
+import random
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+from datetime import time as dt_time
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from .availability import booking_window
+from .models import (
+    AirCargoInquiry, Aircraft, AircraftSalesInquiry, Airport, ContactInquiry, FlightBooking,
+    FlightInquiry, GroupCharterInquiry, LeaseInquiry, MaintenanceLog, MarketplaceAircraft,
+    MarketplaceBooking, Membership, MembershipTier, PaymentRecord, User, Yacht, YachtCharter,
+)
+
+BATCH_SIZE = 2000
+HISTORY    = timedelta(days=730)
+PASSWORD   = 'synthetic-load'
+CENT       = Decimal('0.01')
+
+# Share of the requested row count each table gets (sums to 100)
+SHARES = {
+    'clients':              8,
+    'owners':               0.5,
+    'memberships':          6,
+    'marketplace_aircraft': 1,
+    'maintenance_logs':     5,
+    'marketplace_bookings': 20,
+    'payments':             14,
+    'flight_bookings':      25,
+    'yacht_charters':       4,
+    'lease_inquiries':      3,
+    'flight_inquiries':     4,
+    'contact_inquiries':    4,
+    'group_charters':       2,
+    'air_cargo':            2,
+    'aircraft_sales':       1.5,
+}
+
+FIRST_NAMES = ['James', 'Amina', 'Wanjiru', 'Oliver', 'Sofia', 'Kamau', 'Liam', 'Zara', 'Noah',
+               'Achieng', 'Mateo', 'Fatima', 'Lucas', 'Nia', 'Ethan', 'Mei', 'Omar', 'Grace']
+LAST_NAMES  = ['Smith', 'Otieno', 'Mwangi', 'Garcia', 'Kariuki', 'Chen', 'Okafor', 'Müller',
+               'Njoroge', 'Rossi', 'Patel', 'Wambui', 'Dubois', 'Kim', 'Haddad', 'Silva']
+COMPANIES   = ['', '', 'Safari Holdings', 'Acacia Capital', 'Rift Valley Mining', 'Blue Nile Media',
+               'Kilimanjaro Ventures', 'Savannah Logistics', 'Coastline Hotels', 'Equator Energy']
+PORTS       = ['Monaco', 'Antibes', 'Mombasa', 'Zanzibar', 'Mahé', 'Dubai Marina', 'Phuket', 'Split']
+TIERS       = [('basic', 'Basic', '99.00', '990.00', '0'),
+               ('premium', 'Premium', '299.00', '2990.00', '10'),
+               ('corporate', 'Corporate', '999.00', '9990.00', '15')]
+TIMESTAMPS  = [User, Membership, MarketplaceAircraft, MaintenanceLog, MarketplaceBooking,
+               PaymentRecord, FlightBooking, YachtCharter, LeaseInquiry, FlightInquiry,
+               ContactInquiry, GroupCharterInquiry, AirCargoInquiry, AircraftSalesInquiry]
+
+
+@contextmanager
+def historical_timestamps(models):
+    """Lets bulk_create keep the created_at/updated_at values we set."""
+    fields = [f for m in models for f in m._meta.concrete_fields
+              if getattr(f, 'auto_now', False) or getattr(f, 'auto_now_add', False)]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
+def money(value):
+    return Decimal(value).quantize(CENT, ROUND_HALF_UP)
+
+
+class SyntheticDataset:
+    """
+    generate() writes the dataset and returns {table: rows inserted}.
+    `log` is called with one progress line per table.
+    """
+
+    def __init__(self, scale, seed=42, batch_size=BATCH_SIZE, log=print):
+        self.rng        = random.Random(seed)
+        self.prefix     = f'syn{seed}'
+        self.batch_size = batch_size
+        self.log        = log
+        self.now        = timezone.now()
+        self.counts     = {name: max(1, int(scale * share / 100)) for name, share in SHARES.items()}
+        self.counts['memberships'] = min(self.counts['memberships'], self.counts['clients'])
+
+    def exists(self):
+        return User.objects.filter(username__startswith=f'{self.prefix}_').exists()
+
+    # ── helpers ───────────────────────────────────────────────────────────────
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past(self):
+        return self.now - timedelta(seconds=self.rng.randrange(int(HISTORY.total_seconds())))
+
+    def person(self):
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        n = self.rng.randrange(10 ** 6)
+        return f'{first} {last}', f'{first}.{last}{n}@example.com'.lower(), f'+2547{n:08d}'
+
+    def insert(self, model, objects):
+        """bulk_create in batches; returns the new primary keys in order."""
+        pks, batch = [], []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                pks.extend(o.pk for o in model.objects.bulk_create(batch))
+                batch = []
+        if batch:
+            pks.extend(o.pk for o in model.objects.bulk_create(batch))
+        return pks
+
+    def step(self, label, model, objects):
+        started = time.perf_counter()
+        pks = self.insert(model, objects)
+        self.log(f'  {label}: {len(pks):,} in {time.perf_counter() - started:.1f}s')
+        return pks
+
+    # ── generation ────────────────────────────────────────────────────────────
+    def generate(self):
+        from .empty_legs import rebuild_empty_legs
+        from .revenue import rebuild_rollups
+        from .summaries import invalidate_inquiries_summary, invalidate_users_summary
+
+        self.airports = list(Airport.objects.values_list('pk', 'code', 'city'))
+        self.aircraft = list(Aircraft.objects.values_list('pk', 'hourly_rate_usd', 'passenger_capacity'))
+        self.yachts   = list(Yacht.objects.values_list('pk', flat=True))
+        if len(self.airports) < 2:
+            raise ValueError('Synthetic data needs at least two airports — seed them first.')
+        self.tiers    = self.ensure_tiers()
+        self.password = make_password(PASSWORD)
+
+        with historical_timestamps(TIMESTAMPS):
+            clients     = self.step('Clients', User, self.users('client', self.counts['clients']))
+            owners      = self.step('Fleet owners', User, self.users('owner', self.counts['owners']))
+            memberships = self.step('Memberships', Membership, self.memberships(clients))
+            self.member_of = dict(zip(clients, memberships))
+            planes      = self.step('Marketplace aircraft', MarketplaceAircraft, self.planes(owners))
+            self.step('Maintenance logs', MaintenanceLog, self.maintenance_logs(planes))
+            self.paid   = []
+            bookings    = self.step('Marketplace bookings', MarketplaceBooking, self.marketplace_bookings(clients, planes))
+            self.paid   = [(pk, *row) for pk, row in zip(bookings, self.paid) if row]
+            self.step('Payments', PaymentRecord, self.payments(memberships))
+            self.step('Flight bookings', FlightBooking, self.flight_bookings())
+            self.step('Yacht charters', YachtCharter, self.yacht_charters())
+            self.step('Lease inquiries', LeaseInquiry, self.lease_inquiries())
+            self.step('Flight inquiries', FlightInquiry, self.flight_inquiries())
+            self.step('Contact inquiries', ContactInquiry, self.contact_inquiries())
+            self.step('Group charters', GroupCharterInquiry, self.group_charters())
+            self.step('Air cargo', AirCargoInquiry, self.air_cargo())
+            self.step('Aircraft sales', AircraftSalesInquiry, self.aircraft_sales())
+
+        started = time.perf_counter()
+        rebuild_rollups()
+        rebuild_empty_legs()
+        invalidate_inquiries_summary()
+        invalidate_users_summary()
+        self.log(f'  Rollups and empty legs rebuilt in {time.perf_counter() - started:.1f}s')
+        return dict(self.counts)
+
+    def ensure_tiers(self):
+        for name, display, monthly, annual, discount in TIERS:
+            MembershipTier.objects.get_or_create(name=name, defaults={
+                'display_name': display, 'monthly_fee_usd': monthly,
+                'annual_fee_usd': annual, 'hourly_discount_pct': discount,
+            })
+        return list(MembershipTier.objects.values_list('pk', 'monthly_fee_usd', 'annual_fee_usd', 'hourly_discount_pct'))
+
+    def users(self, role, count):
+        for i in range(count):
+            name, email, phone = self.person()
+            first, last = name.split(' ', 1)
+            joined = self.past()
+            yield User(
+                username=f'{self.prefix}_{role}_{i}', email=email, password=self.password,
+                first_name=first, last_name=last, role=role, phone=phone,
+                company=self.rng.choice(COMPANIES), date_joined=joined, created_at=joined,
+            )
+
+    def memberships(self, clients):
+        rng = self.rng
+        for user_id in clients[:self.counts['memberships']]:
+            tier_id, monthly, annual, _ = rng.choice(self.tiers)
+            cycle   = rng.choice(['monthly', 'annual', 'annual'])
+            created = self.past()
+            start   = created.date()
+            end     = start + timedelta(days=30 if cycle == 'monthly' else 365)
+            status  = 'active' if end >= self.now.date() else rng.choice(['expired', 'expired', 'cancelled'])
+            if rng.random() < 0.05:
+                status = rng.choice(['pending', 'suspended'])
+            yield Membership(
+                reference=self.uuid(), user_id=user_id, tier_id=tier_id, status=status,
+                billing_cycle=cycle, start_date=start, end_date=end, auto_renew=rng.random() < 0.7,
+                amount_paid=monthly if cycle == 'monthly' else annual,
+                created_at=created, updated_at=created,
+            )
+
+    def planes(self, owners):
+        rng = self.rng
+        for i in range(self.counts['marketplace_aircraft']):
+            _, rate, seats = rng.choice(self.aircraft) if self.aircraft else (None, Decimal('5000'), 8)
+            category = rng.choice(MarketplaceAircraft.CATEGORY_CHOICES)[0]
+            created  = self.past()
+            hours    = Decimal(rng.randrange(0, 50000)) / 10
+            yield MarketplaceAircraft(
+                reference=self.uuid(), owner_id=rng.choice(owners),
+                name=f'{category.replace("_", " ").title()} {i}', model=f'Model {rng.randrange(100, 999)}',
+                category=category, registration_number=f'{self.prefix.upper()}-{i:07d}',
+                base_location=rng.choice(self.airports)[2], passenger_capacity=seats,
+                range_km=rng.randrange(2000, 14000, 100), cruise_speed_kmh=rng.randrange(650, 950, 10),
+                hourly_rate_usd=money(rate * Decimal(rng.uniform(0.8, 1.2))),
+                status=rng.choices(['available', 'maintenance', 'inactive', 'pending'], [85, 5, 5, 5])[0],
+                is_approved=rng.random() < 0.9, total_flight_hours=hours,
+                last_maintenance_hours=max(Decimal(0), hours - rng.randrange(0, 120)),
+                created_at=created, updated_at=created,
+            )
+
+    def maintenance_logs(self, planes):
+        rng   = self.rng
+        today = self.now.date()
+        for _ in range(self.counts['maintenance_logs']):
+            scheduled = today + timedelta(days=rng.randrange(-700, 90))
+            status    = ('scheduled' if scheduled > today
+                         else rng.choices(['completed', 'cancelled', 'in_progress'], [90, 5, 5])[0])
+            created   = self.now - timedelta(days=max(0, (today - scheduled).days) + rng.randrange(1, 30))
+            yield MaintenanceLog(
+                aircraft_id=rng.choice(planes), maintenance_type=rng.choice(MaintenanceLog.TYPE_CHOICES)[0],
+                status=status, scheduled_date=scheduled,
+                completed_date=scheduled if status == 'completed' else None,
+                flight_hours_at=Decimal(rng.randrange(0, 50000)) / 10,
+                description='Scheduled service', technician=rng.choice(['AeroTech', 'JetCare', 'Skyline MRO']),
+                cost_usd=money(rng.uniform(500, 80000)), created_at=created,
+            )
+
+    def marketplace_bookings(self, clients, planes):
+        """Bookings never overlap on one aircraft: each plane's calendar is filled in time order."""
+        rng    = self.rng
+        cursor = {pk: self.now - HISTORY for pk in planes}
+        # Spread each plane's share of bookings over the history plus ~3 months ahead
+        mean_gap = (HISTORY + timedelta(days=90)) * len(planes) / self.counts['marketplace_bookings']
+        for _ in range(self.counts['marketplace_bookings']):
+            plane     = rng.choice(planes)
+            departure = cursor[plane] + mean_gap * rng.uniform(0.1, 1.6)
+            hours     = Decimal(rng.randrange(10, 140)) / 10
+            returning = departure + timedelta(days=rng.randrange(1, 8)) if rng.random() < 0.3 else None
+            occupied_from, occupied_until = booking_window(departure, returning, hours)
+            cursor[plane] = occupied_until
+            if departure > self.now:
+                status = rng.choices(['pending', 'confirmed', 'cancelled'], [30, 65, 5])[0]
+            else:
+                status = rng.choices(['completed', 'cancelled', 'disputed'], [88, 10, 2])[0]
+            client   = rng.choice(clients)
+            discount = Decimal(rng.choice(['0', '0', '10', '15']))
+            gross    = money(Decimal(rng.randrange(3000, 20000)) * hours * (1 - discount / 100))
+            pct      = Decimal(rng.choice(['10', '10', '12', '8']))
+            commission = round(gross * pct / 100, 2)   # as MarketplaceBooking.save() rounds
+            created  = max(self.now - HISTORY, departure - timedelta(days=rng.randrange(1, 60)))
+            created  = min(created, self.now)
+            paid     = status in ('confirmed', 'completed', 'disputed')
+            obj = MarketplaceBooking(
+                reference=self.uuid(), client_id=client, aircraft_id=plane,
+                membership_id=self.member_of.get(client),
+                trip_type='round_trip' if returning else 'one_way',
+                origin=rng.choice(self.airports)[2], destination=rng.choice(self.airports)[2],
+                departure_datetime=departure, return_datetime=returning, estimated_hours=hours,
+                occupied_from=occupied_from, occupied_until=occupied_until,
+                passenger_count=rng.randrange(1, 12), status=status,
+                gross_amount_usd=gross, commission_pct=pct, commission_usd=commission,
+                net_owner_usd=gross - commission, discount_applied=discount,
+                payment_status='paid' if paid else 'unpaid',
+                created_at=created, updated_at=created,
+            )
+            self.paid.append((client, gross, created) if paid else None)
+            yield obj
+
+    def payments(self, memberships):
+        rng    = self.rng
+        member = {m: u for u, m in self.member_of.items()}
+        for _ in range(self.counts['payments']):
+            if self.paid and rng.random() < 0.7:
+                booking, user, amount, created = rng.choice(self.paid)
+                kind, links = 'booking', {'booking_id': booking}
+            else:
+                membership = rng.choice(memberships)
+                kind, user, amount, created = 'membership', member[membership], money(rng.choice([99, 299, 999, 990, 2990, 9990])), self.past()
+                links = {'membership_id': membership}
+            status = rng.choices(['succeeded', 'failed', 'refunded', 'pending'], [90, 4, 3, 3])[0]
+            yield PaymentRecord(
+                reference=self.uuid(), user_id=user, payment_type=kind, amount_usd=amount,
+                status=status, stripe_payment_id=f'pi_{self.uuid().hex[:24]}',
+                description=f'{kind.title()} payment', created_at=created, **links,
+            )
+
+    def flight_bookings(self):
+        rng = self.rng
+        for _ in range(self.counts['flight_bookings']):
+            name, email, phone = self.person()
+            (origin, *_), (destination, *_) = rng.sample(self.airports, 2)
+            created   = self.past()
+            departure = (created + timedelta(days=rng.randrange(3, 120))).date()
+            status    = rng.choices(['inquiry', 'quoted', 'confirmed', 'completed', 'cancelled'], [30, 20, 20, 20, 10])[0]
+            aircraft, rate, seats = rng.choice(self.aircraft) if self.aircraft else (None, Decimal('5000'), 8)
+            price = money(rate * Decimal(rng.randrange(15, 140)) / 10) if status != 'inquiry' else None
+            pct   = Decimal('10')
+            commission = money(price * pct / 100) if price is not None else None
+            round_trip = rng.random() < 0.35
+            yield FlightBooking(
+                reference=self.uuid(), guest_name=name, guest_email=email, guest_phone=phone,
+                company=rng.choice(COMPANIES), trip_type='round_trip' if round_trip else 'one_way',
+                origin_id=origin, destination_id=destination, departure_date=departure,
+                departure_time=dt_time(rng.randrange(6, 22), rng.choice([0, 15, 30, 45])),
+                return_date=departure + timedelta(days=rng.randrange(1, 14)) if round_trip else None,
+                passenger_count=rng.randrange(1, max(2, seats)), aircraft_id=aircraft,
+                catering_requested=rng.random() < 0.4, quoted_price_usd=price, commission_pct=pct,
+                commission_usd=commission, net_revenue_usd=price - commission if price is not None else None,
+                status=status, created_at=created, updated_at=created,
+            )
+
+    def yacht_charters(self):
+        rng = self.rng
+        for _ in range(self.counts['yacht_charters']):
+            name, email, phone = self.person()
+            created = self.past()
+            start   = (created + timedelta(days=rng.randrange(7, 180))).date()
+            status  = rng.choices(['inquiry', 'quoted', 'confirmed', 'completed', 'cancelled'], [35, 20, 15, 20, 10])[0]
+            yield YachtCharter(
+                reference=self.uuid(), guest_name=name, guest_email=email, guest_phone=phone,
+                yacht_id=rng.choice(self.yachts) if self.yachts else None,
+                departure_port=rng.choice(PORTS), destination_port=rng.choice(PORTS),
+                charter_start=start, charter_end=start + timedelta(days=rng.randrange(2, 15)),
+                guest_count=rng.randrange(2, 24),
+                quoted_price_usd=money(rng.uniform(20000, 900000)) if status != 'inquiry' else None,
+                status=status, created_at=created, updated_at=created,
+            )
+
+    def inquiry_status(self):
+        return self.rng.choices(['pending', 'contacted', 'completed'], [50, 30, 20])[0]
+
+    def lease_inquiries(self):
+        rng = self.rng
+        for _ in range(self.counts['lease_inquiries']):
+            name, email, phone = self.person()
+            created = self.past()
+            asset   = rng.choice(['aircraft', 'yacht'])
+            yield LeaseInquiry(
+                reference=self.uuid(), guest_name=name, guest_email=email, guest_phone=phone,
+                asset_type=asset, lease_duration=rng.choice(LeaseInquiry.LEASE_DURATION_CHOICES)[0],
+                aircraft_id=rng.choice(self.aircraft)[0] if asset == 'aircraft' and self.aircraft else None,
+                yacht_id=rng.choice(self.yachts) if asset == 'yacht' and self.yachts else None,
+                preferred_start_date=(created + timedelta(days=rng.randrange(14, 120))).date(),
+                budget_range=rng.choice(['$50k–$100k/mo', '$100k–$250k/mo', '$250k+/mo']),
+                status=self.inquiry_status(), created_at=created,
+            )
+
+    def flight_inquiries(self):
+        rng = self.rng
+        for _ in range(self.counts['flight_inquiries']):
+            name, email, phone = self.person()
+            yield FlightInquiry(
+                reference=self.uuid(), guest_name=name, guest_email=email, guest_phone=phone,
+                origin_description=rng.choice(self.airports)[2], destination_description=rng.choice(self.airports)[2],
+                approximate_date=rng.choice(['Next month', 'This summer', 'Flexible', 'Early December']),
+                passenger_count=rng.randrange(1, 14), message='Exploring options for an upcoming trip.',
+                created_at=self.past(),
+            )
+
+    def contact_inquiries(self):
+        rng = self.rng
+        for _ in range(self.counts['contact_inquiries']):
+            name, email, phone = self.person()
+            yield ContactInquiry(
+                reference=self.uuid(), full_name=name, email=email, phone=phone,
+                company=rng.choice(COMPANIES), subject=rng.choice(ContactInquiry.SUBJECT_CHOICES)[0],
+                message='Please get in touch.', created_at=self.past(),
+            )
+
+    def group_charters(self):
+        rng = self.rng
+        for _ in range(self.counts['group_charters']):
+            name, email, phone = self.person()
+            created = self.past()
+            yield GroupCharterInquiry(
+                reference=self.uuid(), contact_name=name, email=email, phone=phone,
+                group_type=rng.choice(GroupCharterInquiry.GROUP_TYPE_CHOICES)[0], group_size=rng.randrange(15, 300),
+                origin_description=rng.choice(self.airports)[2], destination_description=rng.choice(self.airports)[2],
+                departure_date=(created + timedelta(days=rng.randrange(14, 200))).date(),
+                is_round_trip=rng.random() < 0.6, status=self.inquiry_status(), created_at=created,
+            )
+
+    def air_cargo(self):
+        rng = self.rng
+        for _ in range(self.counts['air_cargo']):
+            name, email, phone = self.person()
+            created = self.past()
+            yield AirCargoInquiry(
+                reference=self.uuid(), contact_name=name, email=email, phone=phone,
+                cargo_type=rng.choice(AirCargoInquiry.CARGO_TYPE_CHOICES)[0], cargo_description='Palletised freight',
+                weight_kg=money(rng.uniform(50, 40000)),
+                origin_description=rng.choice(self.airports)[2], destination_description=rng.choice(self.airports)[2],
+                pickup_date=(created + timedelta(days=rng.randrange(1, 30))).date(),
+                urgency=rng.choice(AirCargoInquiry.URGENCY_CHOICES)[0], status=self.inquiry_status(),
+                created_at=created,
+            )
+
+    def aircraft_sales(self):
+        rng = self.rng
+        for _ in range(self.counts['aircraft_sales']):
+            name, email, phone = self.person()
+            yield AircraftSalesInquiry(
+                reference=self.uuid(), contact_name=name, email=email, phone=phone,
+                inquiry_type=rng.choice(AircraftSalesInquiry.INQUIRY_TYPE_CHOICES)[0],
+                budget_range=rng.choice(AircraftSalesInquiry.BUDGET_CHOICES)[0],
+                status=self.inquiry_status(), created_at=self.past(),
+            )
@@ -1,3 +1,980 @@
-from django.test import TestCase
+from datetime import datetime, timedelta, timezone as dt_timezone
+import math
+import random
+from decimal import Decimal
 
-# Create your tests here.
+from io import StringIO
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.test import TestCase, override_settings, tag
+from rest_framework.mixins import ListModelMixin
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
+from rest_framework.test import APIClient
+
+from django.utils import timezone
+
+from . import catalog, emails, empty_legs, exports, fleet, geo, importers, ingest, pricing, revenue, search, visibility
+from .models import (
+    Aircraft, Airport, CommissionSetting, ContactInquiry, EmailLog, EmptyLeg, FlightBooking,
+    MarketplaceAircraft, MarketplaceBooking, Membership, MembershipTier, RevenueMonthly, User, Yacht,
+)
+from .views import AirportViewSet
+
+
+# ── AIRPORT INDEX (geo.py) ────────────────────────────────────────────────────
+class AirportIndexTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        geo._index = None
+
+    def test_equator_and_greenwich_airports_have_distances(self):
+        a = Airport.objects.create(code='ZERO', name='Null Island', city='-', country='-',
+                                   latitude=Decimal('0'), longitude=Decimal('0'))
+        b = Airport.objects.create(code='GRNW', name='Greenwich', city='London', country='UK',
+                                   latitude=Decimal('51.4769'), longitude=Decimal('0'))
+        km = geo.get_airport_index().distance_km(a.id, b.id)
+        self.assertAlmostEqual(km, 5724, delta=5)
+
+    def test_rebuilds_when_another_worker_bumps_the_version(self):
+        first = geo.get_airport_index()
+        # A bulk write elsewhere: no signal in this process, only the shared bump
+        Airport.objects.bulk_create([Airport(code='BULK', name='Bulk', city='-', country='-')])
+        cache.incr(geo.VERSION_KEY)
+        index = geo.get_airport_index()
+        self.assertIsNot(index, first)
+        self.assertIsNotNone(index.get_by_code('BULK'))
+
+    def test_save_bumps_the_version_on_commit(self):
+        version = geo.current_version(geo.VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            Airport.objects.create(code='NEWA', name='New', city='-', country='-')
+        self.assertNotEqual(geo.current_version(geo.VERSION_KEY), version)
+
+
+class NearbyAirportTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        geo._index = None
+        rng = random.Random(7)
+        Airport.objects.bulk_create([
+            Airport(code=f'R{i:03d}', name=f'Random {i}', city='-', country='-',
+                    latitude=Decimal(f'{rng.uniform(-60, 60):.4f}'),
+                    longitude=Decimal(f'{rng.uniform(-180, 180):.4f}'))
+            for i in range(300)
+        ] + [Airport(code='NONE', name='No coordinates', city='-', country='-')])
+
+    def brute_force(self, lat, lon):
+        def km(a):
+            p1, p2 = math.radians(lat), math.radians(float(a.latitude))
+            dl     = math.radians(float(a.longitude) - lon)
+            h = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+            return geo.EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(h))
+        return sorted((km(a), a.code) for a in Airport.objects.exclude(latitude=None))
+
+    def test_tree_matches_a_full_scan(self):
+        index = geo.get_airport_index()
+        for lat, lon in [(-1.3, 36.9), (51.5, -0.1), (0, 179.9), (-59, -179)]:
+            expected = self.brute_force(lat, lon)[:5]
+            found    = index.nearest(lat, lon, k=5)
+            self.assertEqual([a.code for a, _ in found], [code for _, code in expected])
+            for (_, got), (want, _) in zip(found, expected):
+                self.assertAlmostEqual(got, want, places=3)
+
+    def test_radius_limits_the_result(self):
+        index    = geo.get_airport_index()
+        expected = [code for km, code in self.brute_force(10, 10) if km <= 1500]
+        self.assertEqual([a.code for a, _ in index.nearest(10, 10, k=50, radius_km=1500)], expected[:50])
+
+    def test_endpoint_resolves_single_and_bulk_points(self):
+        client = APIClient()
+        res = client.get('/api/v1/airports/nearby/', {'lat': '-1.3', 'lon': '36.9', 'k': 2})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([row['code'] for row in res.data],
+                         [code for _, code in self.brute_force(-1.3, 36.9)[:2]])
+        res = client.post('/api/v1/airports/nearby/', {
+            'points': [{'lat': 0, 'lon': 0, 'ref': 'a'}, {'lat': 45, 'lon': 90, 'ref': 'b'}], 'k': 1,
+        }, format='json')
+        self.assertEqual([(p['ref'], len(p['airports'])) for p in res.data], [('a', 1), ('b', 1)])
+        self.assertEqual(client.get('/api/v1/airports/nearby/', {'lat': '91', 'lon': '0'}).status_code, 400)
+
+
+# ── AIRPORT AUTOCOMPLETE (search.py) ──────────────────────────────────────────
+class AirportSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        geo._index = None
+        for code, name, city, country in [
+            ('ZZC', 'Field C',           'Alpha',   'Mbadeland'),   # 5 country prefix
+            ('ZZB', 'Kumba Field',       'Kumba',   'Cameroon'),    # 4 substring
+            ('ZZA', 'Mbaise Airstrip',   'Owerri',  'Nigeria'),     # 3 name prefix
+            ('SHO', 'King Mswati III',   'Mbabane', 'Eswatini'),    # 2 city prefix
+            ('MBAQ', 'Quarry Strip',     'Zulu',    'Kenya'),       # 1 code prefix
+            ('MBA', 'Moi International', 'Mombasa', 'Kenya'),       # 0 exact code
+            ('GRU', 'Guarulhos',         'São Paulo', 'Brazil'),
+        ]:
+            Airport.objects.create(code=code, name=name, city=city, country=country)
+
+    def codes(self, query, limit=10):
+        return [a.code for a in search.get_airport_search_index().search(query, limit)]
+
+    def test_ranks_code_then_city_then_name_then_substring_then_country(self):
+        self.assertEqual(self.codes('mba'), ['MBA', 'MBAQ', 'SHO', 'ZZA', 'ZZB', 'ZZC'])
+        self.assertEqual(self.codes('mba', limit=3), ['MBA', 'MBAQ', 'SHO'])
+
+    def test_matches_ignore_case_and_accents(self):
+        self.assertEqual(self.codes('SAO PAULO'), ['GRU'])
+        self.assertEqual(self.codes('  '), [])
+
+    def test_rebuilds_when_the_airport_index_changes(self):
+        first = search.get_airport_search_index()
+        self.assertIs(search.get_airport_search_index(), first)
+        with self.captureOnCommitCallbacks(execute=True):
+            Airport.objects.create(code='MBB', name='New Field', city='Mbarara', country='Uganda')
+        self.assertIsNot(search.get_airport_search_index(), first)
+        self.assertIn('MBB', self.codes('mbarara'))
+
+    def test_endpoint_clamps_limit(self):
+        client = APIClient()
+        res = client.get('/api/v1/airports/autocomplete/', {'q': 'mba', 'limit': 2})
+        self.assertEqual([row['code'] for row in res.data], ['MBA', 'MBAQ'])
+        self.assertEqual(client.get('/api/v1/airports/autocomplete/', {'limit': 'x'}).status_code, 400)
+
+
+def make_aircraft(**kwargs):
+    fields = dict(name='Test Jet', model='TJ-1', category='midsize', passenger_capacity=8,
+                  range_km=5000, cruise_speed_kmh=800, hourly_rate_usd=Decimal('5000'))
+    fields.update(kwargs)
+    return Aircraft.objects.create(**fields)
+
+
+# ── CATALOG LISTS (catalog.py) ────────────────────────────────────────────────
+class CatalogListTests(TestCase):
+    URLS = ['/api/v1/airports/', '/api/v1/aircraft/', '/api/v1/yachts/', '/api/v1/membership-tiers/',
+            '/api/v1/airports/?page=2']
+
+    def setUp(self):
+        cache.clear()
+        Airport.objects.bulk_create([
+            Airport(code=f'T{i:02d}', name=f'Test {i}', city=f'City {i}', country='-',
+                    latitude=Decimal(i) / 3, longitude=Decimal(i))
+            for i in range(25)
+        ])
+        make_aircraft(amenities=['wifi'])
+        Yacht.objects.create(name='Blue', size_category='medium', length_meters=Decimal('42.50'),
+                             guest_capacity=10, crew_count=6, daily_rate_usd=Decimal('25000'),
+                             home_port='Lamu', amenities=['jacuzzi'])
+        MembershipTier.objects.create(name='basic', display_name='Basic', monthly_fee_usd=100,
+                                      annual_fee_usd=1000, features_list=['priority'])
+        self.client = APIClient()
+
+    def drf(self, url):
+        """The same request through DRF's own list() — no fast path, no cache."""
+        with mock.patch.object(catalog.CatalogListMixin, 'list', ListModelMixin.list):
+            return self.client.get(url)
+
+    def assertSameResponse(self, res, expected):
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(res.content, expected.content)
+        for header in ('Content-Type', 'Allow', 'Vary'):
+            self.assertEqual(res.get(header), expected.get(header), header)
+
+    def test_fast_and_cached_bytes_match_drf(self):
+        for url in self.URLS:
+            with self.subTest(url):
+                fast = self.client.get(url)
+                self.assertSameResponse(fast, self.drf(url))
+                with self.assertNumQueries(0):
+                    self.assertSameResponse(self.client.get(url), fast)
+
+    @mock.patch.object(AirportViewSet, 'renderer_classes', [JSONRenderer, BrowsableAPIRenderer])
+    def test_keeps_vary_accept_with_several_renderers(self):
+        res = self.client.get('/api/v1/airports/', HTTP_ACCEPT='application/json')
+        self.assertIn('Accept', res['Vary'])
+        self.assertSameResponse(res, self.drf('/api/v1/airports/'))
+
+    def test_save_invalidates_on_commit(self):
+        self.client.get('/api/v1/yachts/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Yacht.objects.update_or_create(name='Blue', defaults={'home_port': 'Kilifi'})
+        self.assertContains(self.client.get('/api/v1/yachts/'), 'Kilifi')
+
+
+# ── QUICK QUOTE BATCH ─────────────────────────────────────────────────────────
+class QuickQuoteBatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        geo._index = None
+        self.api = APIClient()
+        self.nbo = Airport.objects.create(code='NBO', name='Nairobi', city='Nairobi', country='KE',
+                                          latitude=Decimal('-1.3192'), longitude=Decimal('36.9278'))
+        self.mba = Airport.objects.create(code='MBA', name='Mombasa', city='Mombasa', country='KE',
+                                          latitude=Decimal('-4.0348'), longitude=Decimal('39.5942'))
+        self.lhr = Airport.objects.create(code='LHR', name='Heathrow', city='London', country='UK',
+                                          latitude=Decimal('51.4700'), longitude=Decimal('-0.4543'))
+
+    def quote(self, **body):
+        response = self.api.post('/api/v1/quick-quote/batch/', body, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_out_of_range_aircraft_dropped_per_route(self):
+        short = make_aircraft(name='Short', range_km=2000)
+        long  = make_aircraft(name='Long', range_km=9000)
+        data = self.quote(exclude_out_of_range=True, routes=[
+            {'origin': self.nbo.id, 'destination': self.mba.id},
+            {'origin': self.nbo.id, 'destination': self.lhr.id},
+        ])
+        per_route = [[c['aircraft'] for c in row['quotes']] for row in data['routes']]
+        self.assertEqual(per_route, [[short.id, long.id], [long.id]])
+        self.assertEqual([a['id'] for a in data['aircraft']], [short.id, long.id])
+
+    def test_explicit_ids_include_unavailable_aircraft_like_quick_quote(self):
+        parked = make_aircraft(name='Parked', is_available=False)
+        data = self.quote(aircraft=[parked.id], routes=[{'origin': self.nbo.id, 'destination': self.mba.id}])
+        self.assertEqual([a['id'] for a in data['aircraft']], [parked.id])
+        data = self.quote(routes=[{'origin': self.nbo.id, 'destination': self.mba.id}])
+        self.assertEqual(data['aircraft'], [])
+
+
+# ── ITINERARY PRICING ─────────────────────────────────────────────────────────
+class ItineraryPricingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        geo._index = None
+        self.api = APIClient()
+        self.api.force_authenticate(User.objects.create(username='ops', role='admin'))
+        self.a = Airport.objects.create(code='NBO', name='Nairobi', city='Nairobi', country='KE',
+                                        latitude=Decimal('-1.3192'), longitude=Decimal('36.9278'))
+        self.b = Airport.objects.create(code='MBA', name='Mombasa', city='Mombasa', country='KE',
+                                        latitude=Decimal('-4.0348'), longitude=Decimal('39.5942'))
+        self.c = Airport.objects.create(code='ZNZ', name='Zanzibar', city='Zanzibar', country='TZ',
+                                        latitude=Decimal('-6.2220'), longitude=Decimal('39.2249'))
+        self.jet = make_aircraft()
+
+    def test_block_hours_per_leg_including_positioning(self):
+        response = self.api.post('/api/v1/admin/price-calculator/itinerary/', {
+            'legs': [{'origin': self.b.id, 'destination': self.c.id}],
+            'base_airport': self.a.id, 'aircraft_id': self.jet.id, 'passenger_count': 2,
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        data   = response.json()
+        option = data['options'][0]
+        self.assertEqual([l['leg_number'] for l in option['legs']], [1, 2, 3])
+        for leg, priced in zip(data['legs'], option['legs']):
+            self.assertAlmostEqual(priced['block_hours'], leg['distance_km'] / 800 * 1.25, places=1)
+        self.assertAlmostEqual(sum(l['block_hours'] for l in option['legs']), option['block_hours'], delta=0.02)
+
+
+    def test_prices_the_fleet_from_values_rows_in_one_pass(self):
+        legs  = [{'distance_km': km} for km in (440.0, 260.0, 700.0)]
+        fleet = [
+            {'id': 1, 'cruise_speed_kmh': 800, 'hourly_rate_usd': Decimal('5000'), 'range_km': 5000},
+            {'id': 2, 'cruise_speed_kmh': 800, 'hourly_rate_usd': Decimal('5000'), 'range_km': 5000},
+            {'id': 3, 'cruise_speed_kmh': 600, 'hourly_rate_usd': Decimal('2500'), 'range_km': 600},
+        ]
+        options = pricing.price_itinerary(legs, fleet, 2, catering=True, commission_pct=Decimal('12'))
+        self.assertEqual([o['aircraft']['id'] for o in options], [1, 2, 3])   # 3 cannot fly the 700 km leg
+        for option in options:
+            ac    = next(a for a in fleet if a['id'] == option['aircraft']['id'])
+            hours = round(1400 * 1.25 / ac['cruise_speed_kmh'], 2)
+            self.assertEqual(option['block_hours'], hours)
+            self.assertEqual(option['breakdown'], pricing.price_breakdown(
+                ac['hourly_rate_usd'], hours, 2, catering=True, commission_pct=Decimal('12')))
+            self.assertIsInstance(option['aircraft']['hourly_rate_usd'], float)
+        self.assertEqual([l['block_hours'] for l in options[2]['legs']], [0.92, 0.54, 1.46])
+        self.assertIs(options[0]['breakdown'], options[1]['breakdown'])
+
+
+# ── COMMISSION SCHEDULE (pricing.py) ──────────────────────────────────────────
+class CommissionScheduleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        pricing._schedule = None
+
+    def test_other_worker_change_is_picked_up_via_the_shared_version(self):
+        self.assertEqual(pricing.current_commission_rate(), pricing.DEFAULT_COMMISSION_PCT)
+        # Saved in another worker: its signal never runs here, only its bump reaches the cache
+        CommissionSetting.objects.bulk_create([CommissionSetting(rate_pct=Decimal('12.5'))])
+        cache.incr(pricing.SCHEDULE_VERSION_KEY)
+        self.assertEqual(pricing.current_commission_rate(), Decimal('12.5'))
+
+
+# ── EMAIL OUTBOX (emails.py) ──────────────────────────────────────────────────
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailOutboxTests(TestCase):
+    def test_queued_row_is_not_marked_successful(self):
+        log = emails.queue_email(None, 'guest@example.com', 'Guest', 'Hi', 'Body')
+        log.refresh_from_db()
+        self.assertEqual(log.status, 'pending')
+        self.assertFalse(log.success)
+
+    def test_worker_marks_delivered_rows_successful(self):
+        log = emails.queue_email(None, 'guest@example.com', 'Guest', 'Hi', 'Body')
+        self.assertEqual(emails.process_outbox(workers=1), (1, 0, 0))
+        log.refresh_from_db()
+        self.assertEqual(log.status, 'sent')
+        self.assertTrue(log.success)
+
+    @override_settings(EMAIL_QUEUE_EAGER=True)
+    def test_eager_send_skips_a_row_the_worker_already_claimed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            log = emails.queue_email(None, 'guest@example.com', 'Guest', 'Hi', 'Body')
+        self.assertEqual(len(emails.claim_batch(10)), 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailLog.objects.get(pk=log.pk).status, 'sending')
+
+    def test_bulk_send_only_queues(self):
+        admin  = User.objects.create(username='ops', role='admin', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        res = client.post('/api/v1/admin/email-logs/send_bulk/', {
+            'recipients': [{'email': 'a@example.com', 'name': 'A'}, {'email': 'b@example.com'}],
+            'subject': 'Hello {first_name}', 'body': 'News',
+        }, format='json')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data['queued'], 2)
+        self.assertNotIn('recipients', res.data)
+        self.assertIn('queued_per_second', res.data)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailLog.objects.filter(status='pending').count(), 2)
+
+
+# ── ADMIN OVERVIEW SUMMARIES ──────────────────────────────────────────────────
+class AdminOverviewSummaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='ops', role='admin', is_staff=True))
+
+    def test_inquiries_summary_is_one_query_then_cached(self):
+        with self.assertNumQueries(1):
+            res = self.client.get('/api/v1/admin/overview/inquiries_summary/')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data['flight_bookings'], 0)
+        with self.assertNumQueries(0):
+            self.client.get('/api/v1/admin/overview/inquiries_summary/')
+
+    def test_users_summary_is_two_queries(self):
+        User.objects.create(username='member', role='client')
+        with self.assertNumQueries(2):
+            res = self.client.get('/api/v1/admin/overview/users_summary/')
+        self.assertEqual(res.status_code, 200)
+
+
+# ── ADMIN PAGINATION (pagination.py) ──────────────────────────────────────────
+class AdminPaginationTests(TestCase):
+    URL = '/api/v1/admin/contacts/'
+
+    def setUp(self):
+        ContactInquiry.objects.bulk_create([
+            ContactInquiry(full_name=f'Guest {i}', email=f'g{i}@example.com', message='Hi') for i in range(25)
+        ])
+        # Ties on created_at must still page cleanly on id
+        ContactInquiry.objects.filter(id__lte=10).update(created_at=datetime(2030, 1, 1, tzinfo=dt_timezone.utc))
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='ops', role='admin', is_staff=True))
+
+    def test_cursor_pages_are_the_default(self):
+        expected = list(ContactInquiry.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        seen, url = [], f'{self.URL}?page_size=10'
+        while url:
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            self.assertNotIn('count', res.data)
+            seen.extend(row['id'] for row in res.data['results'])
+            url = res.data['next']
+        self.assertEqual(seen, expected)
+
+    def test_offset_fallback_keeps_page_numbers_and_count(self):
+        res = self.client.get(self.URL, {'paginate': 'offset', 'page': 3, 'page_size': 10})
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data['count'], 25)
+        self.assertEqual(len(res.data['results']), 5)
+        self.assertIsNone(res.data['next'])
+
+
+# ── REVENUE ROLLUPS (revenue.py) ──────────────────────────────────────────────
+class RevenueRollupTests(TestCase):
+    def setUp(self):
+        nbo = Airport.objects.create(code='NBO', name='Jomo Kenyatta', city='Nairobi', country='Kenya',
+                                     latitude=Decimal('-1.3192'), longitude=Decimal('36.9278'))
+        mba = Airport.objects.create(code='MBA', name='Moi', city='Mombasa', country='Kenya',
+                                     latitude=Decimal('-4.0348'), longitude=Decimal('39.5942'))
+        self.bookings = [
+            FlightBooking.objects.create(guest_name='Guest', guest_email='guest@example.com', origin=nbo,
+                                         destination=mba, departure_date=datetime(2030, 1, 10).date(),
+                                         passenger_count=2, quoted_price_usd=Decimal(price), status='quoted')
+            for price in ('10000', '5000')
+        ]
+        self.client.force_login(User.objects.create(username='ops', role='admin', is_staff=True,
+                                                    is_superuser=True))
+
+    def booked(self):
+        return revenue.revenue_chart()['totals']
+
+    def test_admin_bulk_action_moves_the_rollup(self):
+        self.assertEqual(self.booked()['total_bookings'], 0)
+        res = self.client.post('/admin-system/flights/flightbooking/', {
+            'action': 'mark_confirmed', '_selected_action': [b.pk for b in self.bookings],
+        })
+        self.assertEqual(res.status_code, 302)
+        self.assertEqual(FlightBooking.objects.filter(status='confirmed').count(), 2)
+        totals = self.booked()
+        self.assertEqual(totals['total_bookings'], 2)
+        self.assertEqual(totals['total_gross'], 15000.0)
+        self.assertFalse(RevenueMonthly.objects.filter(status='quoted', booking_count__gt=0).exists())
+
+    def test_flight_booking_routes_match_the_overview(self):
+        api = APIClient()
+        api.force_authenticate(User.objects.create(username='admin', role='admin', is_staff=True))
+        for name in ('revenue_chart', 'combined_revenue'):
+            res = api.get(f'/api/v1/admin/flight-bookings/{name}/')
+            self.assertEqual(res.status_code, 200)
+            self.assertEqual(res.data, api.get(f'/api/v1/admin/overview/{name}/').data)
+
+    def test_refresh_matches_a_full_rebuild(self):
+        FlightBooking.objects.filter(pk=self.bookings[0].pk).update(status='completed')
+        revenue.refresh_rollups(FlightBooking, [self.bookings[0].pk])
+        refreshed = sorted(RevenueMonthly.objects.values_list('status', 'month', 'booking_count', 'gross_usd'))
+        revenue.rebuild_rollups()
+        rebuilt = sorted(RevenueMonthly.objects.values_list('status', 'month', 'booking_count', 'gross_usd'))
+        self.assertEqual(refreshed, rebuilt)
+
+
+# ── MARKETPLACE AIRCRAFT ──────────────────────────────────────────────────────
+def make_listing(**kwargs):
+    fields = dict(name='Phenom', model='Phenom 300', category='light', registration_number='5Y-NJH',
+                  base_location='Nairobi', passenger_capacity=7, range_km=3600,
+                  hourly_rate_usd=Decimal('3500'), status='available', is_approved=True)
+    fields.update(kwargs)
+    if 'owner' not in fields:
+        fields['owner'] = User.objects.create(username='owner', role='owner')
+    return MarketplaceAircraft.objects.create(**fields)
+
+
+class MarketplaceAircraftTests(TestCase):
+    def setUp(self):
+        make_listing()
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='member', role='client'))
+
+    def test_listing_hides_internal_columns(self):
+        res = self.client.get('/api/v1/marketplace/aircraft/')
+        self.assertEqual(res.status_code, 200)
+        rows = res.data['results'] if isinstance(res.data, dict) else res.data
+        self.assertEqual(len(rows), 1)
+        self.assertNotIn('tier_mask', rows[0])
+        self.assertNotIn('maintenance_hours_left', rows[0])
+
+
+# ── TIER VISIBILITY (visibility.py) ───────────────────────────────────────────
+class TierVisibilityTests(TestCase):
+    def setUp(self):
+        self.listing = make_listing()
+        self.premium = MembershipTier.objects.create(name='premium', display_name='Premium',
+                                                     monthly_fee_usd=300, annual_fee_usd=3000)
+        # Written around the choices, as a bulk load or raw SQL could
+        self.unknown = MembershipTier.objects.create(name='gold', display_name='Gold',
+                                                     monthly_fee_usd=500, annual_fee_usd=5000)
+
+    def visible(self, tier_name):
+        return self.listing.pk in {
+            pk for pk in MarketplaceAircraft.objects.filter(tier_mask__in=visibility.masks_visible_to(tier_name))
+            .values_list('pk', flat=True)
+        }
+
+    def test_exclusive_listing_hidden_from_other_tiers(self):
+        self.listing.exclusive_tiers.add(self.premium)
+        self.assertTrue(self.visible('premium'))
+        self.assertFalse(self.visible('basic'))
+        self.assertFalse(self.visible(None))
+
+    def test_unknown_tier_is_refused_not_opened_to_all(self):
+        self.listing.exclusive_tiers.add(self.premium)
+        with self.assertRaisesMessage(ValidationError, "Unknown membership tier 'gold'"), transaction.atomic():
+            self.listing.exclusive_tiers.add(self.unknown)
+        with self.assertRaises(ValidationError), transaction.atomic():
+            self.unknown.marketplaceaircraft_set.add(self.listing)
+        self.assertEqual(list(self.listing.exclusive_tiers.all()), [self.premium])
+        self.assertFalse(self.visible('basic'))
+
+    def test_renaming_a_linked_tier_to_an_unknown_name_is_refused(self):
+        self.listing.exclusive_tiers.add(self.premium)
+        MembershipTier.objects.filter(pk=self.premium.pk).update(name='gold2')
+        with self.assertRaises(ValidationError):
+            visibility.refresh_tier_masks([self.listing.pk])
+
+    def test_api_rejects_an_unknown_tier(self):
+        client = APIClient()
+        client.force_authenticate(self.listing.owner)
+        res = client.patch(f'/api/v1/marketplace/aircraft/{self.listing.pk}/',
+                           {'exclusive_tiers': [self.unknown.pk]}, format='json')
+        self.assertEqual(res.status_code, 400)
+        self.assertIn('exclusive_tiers', res.data)
+
+
+# ── FLIGHT HOURS ──────────────────────────────────────────────────────────────
+class FlightHoursTests(TestCase):
+    def setUp(self):
+        self.aircraft = make_listing()
+        self.client   = APIClient()
+        self.saved    = []
+        receiver = lambda sender, instance, **kwargs: self.saved.append(instance.pk)
+        post_save.connect(receiver, sender=MarketplaceAircraft, weak=False, dispatch_uid='test_hours')
+        self.addCleanup(post_save.disconnect, sender=MarketplaceAircraft, dispatch_uid='test_hours')
+
+    def test_logging_hours_saves_the_aircraft(self):
+        self.client.force_authenticate(self.aircraft.owner)
+        res = self.client.post(f'/api/v1/marketplace/aircraft/{self.aircraft.pk}/log_flight_hours/',
+                               {'hours': '2.5'}, format='json')
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data['total_flight_hours'], 2.5)
+        self.assertEqual(self.saved, [self.aircraft.pk])
+        self.aircraft.refresh_from_db()
+        self.assertGreater(self.aircraft.updated_at, self.aircraft.created_at)
+
+    def test_batch_ingest_stamps_updated_at(self):
+        before = self.aircraft.updated_at
+        applied, duplicates, crossed = ingest.ingest([
+            {'record_id': 'r1', 'aircraft_id': self.aircraft.pk, 'hours': Decimal('1.5'),
+             'timestamp': self.aircraft.created_at},
+        ])
+        self.assertEqual((applied, duplicates), (1, 0))
+        self.aircraft.refresh_from_db()
+        self.assertEqual(self.aircraft.total_flight_hours, Decimal('1.5'))
+        self.assertGreater(self.aircraft.updated_at, before)
+
+
+# ── MARKETPLACE CALENDAR (availability.py) ────────────────────────────────────
+class BookingConflictTests(TestCase):
+    URL = '/api/v1/admin/marketplace-bookings/'
+
+    def setUp(self):
+        self.aircraft = make_listing()
+        self.member   = User.objects.create(username='member', role='client')
+        self.start    = datetime(2030, 1, 10, 9, tzinfo=dt_timezone.utc)
+        self.client   = APIClient()
+        self.client.force_authenticate(User.objects.create(username='ops', role='admin', is_staff=True))
+
+    def book(self, departure, hours='2.0'):
+        return self.client.post(self.URL, {
+            'client': self.member.pk, 'aircraft': self.aircraft.pk, 'origin': 'NBO', 'destination': 'MBA',
+            'departure_datetime': departure.isoformat(), 'estimated_hours': hours,
+            'passenger_count': 2, 'gross_amount_usd': '7000.00',
+        }, format='json')
+
+    def test_admin_create_rejects_an_overlapping_window(self):
+        self.assertEqual(self.book(self.start).status_code, 201)
+        self.assertEqual(self.book(self.start + timedelta(hours=1)).status_code, 400)
+        self.assertEqual(self.book(self.start + timedelta(hours=4)).status_code, 201)
+
+    def test_update_cannot_move_onto_another_booking(self):
+        self.book(self.start)
+        self.book(self.start + timedelta(days=1))
+        later = MarketplaceBooking.objects.order_by('departure_datetime').last()
+        res = self.client.patch(f'{self.URL}{later.pk}/',
+                                {'departure_datetime': self.start.isoformat()}, format='json')
+        self.assertEqual(res.status_code, 400)
+        res = self.client.patch(f'{self.URL}{later.pk}/',
+                                {'departure_datetime': (self.start + timedelta(days=2)).isoformat()}, format='json')
+        self.assertEqual(res.status_code, 200)
+
+    def test_reinstating_a_cancelled_booking_checks_the_calendar(self):
+        self.book(self.start)
+        first = MarketplaceBooking.objects.get()
+        first.status = 'cancelled'
+        first.save()
+        self.book(self.start)
+        res = self.client.patch(f'{self.URL}{first.pk}/update_status/', {'status': 'confirmed'}, format='json')
+        self.assertEqual(res.status_code, 409)
+
+
+class AdminBookingConflictTests(TestCase):
+    URL = '/admin-system/flights/marketplacebooking/'
+
+    def setUp(self):
+        self.aircraft = make_listing()
+        self.member   = User.objects.create(username='member', role='client')
+        self.start    = datetime(2030, 1, 10, 9, tzinfo=dt_timezone.utc)
+        self.client.force_login(User.objects.create(username='ops', role='admin', is_staff=True,
+                                                    is_superuser=True))
+
+    def booking(self, status, hours_later=0):
+        return MarketplaceBooking.objects.create(
+            client=self.member, aircraft=self.aircraft, origin='NBO', destination='MBA',
+            departure_datetime=self.start + timedelta(hours=hours_later), estimated_hours=Decimal('2.0'),
+            passenger_count=2, gross_amount_usd=Decimal('7000'), status=status,
+        )
+
+    def act(self, action, *bookings):
+        return self.client.post(self.URL, {'action': action, '_selected_action': [b.pk for b in bookings]})
+
+    def test_bulk_dispute_does_not_reinstate_clashing_bookings(self):
+        first, second = self.booking('cancelled'), self.booking('cancelled', hours_later=1)
+        self.act('mark_disputed', first, second)
+        self.assertEqual(sorted(MarketplaceBooking.objects.values_list('status', flat=True)),
+                         ['cancelled', 'disputed'])
+
+    def test_bulk_confirm_skips_a_clash(self):
+        clash = self.booking('pending')
+        self.booking('confirmed', hours_later=1)
+        free = self.booking('pending', hours_later=48)
+        self.act('mark_confirmed', clash, free)
+        clash.refresh_from_db()
+        free.refresh_from_db()
+        self.assertEqual((clash.status, free.status), ('pending', 'confirmed'))
+
+    def test_change_form_rejects_an_overlapping_window(self):
+        self.booking('confirmed')
+        res = self.client.post(f'{self.URL}add/', {
+            'status': 'pending', 'payment_status': 'unpaid', 'client': self.member.pk,
+            'aircraft': self.aircraft.pk, 'trip_type': 'one_way', 'origin': 'NBO', 'destination': 'MBA',
+            'departure_datetime_0': '2030-01-10', 'departure_datetime_1': '10:00:00',
+            'estimated_hours': '2.0', 'passenger_count': 2, 'gross_amount_usd': '7000',
+            'commission_pct': '10', 'discount_applied': '0',
+        })
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('already booked', res.content.decode())
+        self.assertEqual(MarketplaceBooking.objects.count(), 1)
+
+
+# ── FLEET SEARCH (fleet.py) ───────────────────────────────────────────────────
+class FleetSearchTests(TestCase):
+    DAY = datetime(2030, 3, 1).date()
+
+    def setUp(self):
+        owner = User.objects.create(username='owner', role='owner')
+        make = lambda reg, **kw: make_listing(owner=owner, registration_number=reg, cruise_speed_kmh=800, **kw)
+        self.cheap  = make('5Y-CHP', hourly_rate_usd=Decimal('3000'), range_km=3000, passenger_capacity=6)
+        self.pricey = make('5Y-PRC', hourly_rate_usd=Decimal('6000'), range_km=8000, passenger_capacity=12)
+        make('5Y-SHT', hourly_rate_usd=Decimal('1000'), range_km=500)
+        make('5Y-MNT', hourly_rate_usd=Decimal('1000'), range_km=9000, status='maintenance')
+        self.member = User.objects.create(username='member', role='client')
+        tier = MembershipTier.objects.create(name='basic', display_name='Basic', monthly_fee_usd=100,
+                                             annual_fee_usd=1000, hourly_discount_pct=Decimal('10'))
+        Membership.objects.create(user=self.member, tier=tier, status='active')
+
+    def ids(self, distance_km, passengers=2, **kwargs):
+        results, _ = fleet.search_fleet(self.member, distance_km, self.DAY, passengers, **kwargs)
+        return [r['id'] for r in results]
+
+    def block(self, aircraft, hour, hours):
+        MarketplaceBooking.objects.create(
+            client=self.member, aircraft=aircraft, origin='NBO', destination='MBA',
+            departure_datetime=datetime.combine(self.DAY, datetime.min.time(), dt_timezone.utc) + timedelta(hours=hour),
+            estimated_hours=Decimal(hours), passenger_count=2, gross_amount_usd=Decimal('7000'), status='confirmed',
+        )
+
+    def test_filters_on_range_and_seats_and_ranks_by_price(self):
+        self.assertEqual(self.ids(1000), [self.cheap.pk, self.pricey.pk])
+        self.assertEqual(self.ids(1000, passengers=8), [self.pricey.pk])
+        self.assertEqual(self.ids(4000), [self.pricey.pk])
+
+    def test_member_price_carries_the_tier_discount(self):
+        results, discount = fleet.search_fleet(self.member, 1600, self.DAY, 2)
+        self.assertEqual(discount, Decimal('10'))
+        self.assertEqual(results[0]['estimated_hours'], 2.0)
+        self.assertEqual(results[0]['member_price_usd'], round(results[0]['list_price_usd'] * 0.9, 0))
+
+    def test_calendar_excludes_busy_aircraft(self):
+        self.block(self.cheap, 0, '8.0')
+        self.assertEqual(self.ids(1000, departure_time=datetime(2030, 3, 1, 5).time()), [self.pricey.pk])
+        results, _ = fleet.search_fleet(self.member, 1000, self.DAY, 2)
+        self.assertEqual(results[0]['id'], self.cheap.pk)
+        self.assertEqual(results[0]['earliest_departure'].hour, 9)
+        self.block(self.cheap, 9, '14.0')
+        self.assertEqual(self.ids(1000), [self.pricey.pk])
+
+    def test_query_count_does_not_grow_with_the_fleet(self):
+        with self.assertNumQueries(4) as first:
+            fleet.search_fleet(self.member, 1000, self.DAY, 2)
+        for i in range(10):
+            make_listing(owner=self.cheap.owner, registration_number=f'5Y-X{i:02d}', range_km=9000)
+        with self.assertNumQueries(len(first)):
+            fleet.search_fleet(self.member, 1000, self.DAY, 2)
+
+
+# ── EMPTY LEGS (empty_legs.py) ────────────────────────────────────────────────
+class EmptyLegTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        geo._index = None
+        self.aircraft = make_listing(base_location='Nairobi')
+        self.member   = User.objects.create(username='member', role='client')
+        self.booking  = MarketplaceBooking.objects.create(
+            client=self.member, aircraft=self.aircraft, origin='Mombasa', destination='Zanzibar',
+            departure_datetime=timezone.now() + timedelta(days=10), estimated_hours=Decimal('2.0'),
+            passenger_count=2, gross_amount_usd=Decimal('7000'), status='confirmed',
+        )
+
+    def legs(self):
+        return sorted(EmptyLeg.objects.values_list('kind', 'origin', 'destination', 'status'))
+
+    def test_confirmed_booking_opens_positioning_and_return_legs(self):
+        self.assertEqual(self.legs(), [
+            ('positioning', 'Nairobi', 'Mombasa', 'open'),
+            ('return', 'Zanzibar', 'Nairobi', 'open'),
+        ])
+
+    def test_refresh_writes_only_the_difference(self):
+        self.assertEqual(empty_legs.refresh_empty_legs(self.aircraft.pk), (0, 0, 0))
+        MarketplaceBooking.objects.filter(pk=self.booking.pk).update(destination='Nairobi')
+        self.assertEqual(empty_legs.refresh_empty_legs(self.aircraft.pk), (0, 0, 1))
+        self.assertEqual(self.legs(), [('positioning', 'Nairobi', 'Mombasa', 'open')])
+        self.booking.refresh_from_db()
+        self.booking.departure_datetime += timedelta(days=1)
+        self.booking.save()
+        leg = EmptyLeg.objects.get()
+        self.assertEqual(leg.available_until + timedelta(hours=3), self.booking.occupied_from)
+
+    def test_admin_cancel_action_withdraws_the_legs(self):
+        self.client.force_login(User.objects.create(username='ops', role='admin', is_staff=True,
+                                                    is_superuser=True))
+        res = self.client.post('/admin-system/flights/marketplacebooking/', {
+            'action': 'mark_cancelled', '_selected_action': [self.booking.pk],
+        })
+        self.assertEqual(res.status_code, 302)
+        self.assertEqual(self.legs(), [])
+
+    def test_rebuild_recreates_missing_legs(self):
+        EmptyLeg.objects.all().delete()
+        self.assertEqual(empty_legs.rebuild_empty_legs(), (2, 0, 0))
+        self.assertEqual(len(self.legs()), 2)
+        self.assertEqual(empty_legs.rebuild_empty_legs(), (0, 0, 0))
+
+    def test_member_books_a_leg_once(self):
+        tier = MembershipTier.objects.create(name='basic', display_name='Basic', monthly_fee_usd=100,
+                                             annual_fee_usd=1000)
+        Membership.objects.create(user=self.member, tier=tier, status='active')
+        leg = EmptyLeg.objects.get(kind='positioning')
+        client = APIClient()
+        client.force_authenticate(self.member)
+        url  = f'/api/v1/marketplace/empty-legs/{leg.pk}/book/'
+        body = {'departure_datetime': leg.available_from.isoformat(), 'passenger_count': 2}
+        res  = client.post(url, body, format='json')
+        self.assertEqual(res.status_code, 201)
+        leg.refresh_from_db()
+        self.assertEqual(leg.status, 'booked')
+        self.assertEqual(leg.booking.gross_amount_usd, leg.price_usd)
+        self.assertEqual(client.post(url, body, format='json').status_code, 404)
+
+
+# ── EXPORTS (exports.py) ──────────────────────────────────────────────────────
+class CsvExportTests(TestCase):
+    def test_formula_like_text_is_escaped(self):
+        rows  = [('=HYPERLINK("http://x")', '+1', '@SUM(A1)', 'plain', Decimal('-12.50'), -3)]
+        lines = list(exports.csv_lines(['a', 'b', 'c', 'd', 'e', 'f'], rows))
+        self.assertEqual(lines[1], '"\'=HYPERLINK(""http://x"")",\'+1,\'@SUM(A1),plain,-12.50,-3\r\n')
+
+    def test_jsonl_is_left_as_is(self):
+        line = next(exports.jsonl_lines(['a'], [('=1+1',)]))
+        self.assertEqual(line, '{"a":"=1+1"}\n')
+
+
+# ── CSV IMPORTS (importers.py) ────────────────────────────────────────────────
+class ImporterTests(TestCase):
+    FIELDS = ['name', 'model', 'category', 'passenger_capacity', 'range_km', 'cruise_speed_kmh',
+              'hourly_rate_usd']
+
+    def row(self, **kwargs):
+        row = {'name': 'Citation CJ4', 'model': 'CJ4', 'category': 'light',
+               'passenger_capacity': '8', 'range_km': '3200', 'cruise_speed_kmh': '778',
+               'hourly_rate_usd': '4500'}
+        row.update(kwargs)
+        return row
+
+    def test_blank_required_number_names_the_row(self):
+        rows = [self.row(), self.row(name='Phenom 300', passenger_capacity='')]
+        with self.assertRaisesMessage(ValidationError, 'Row 3: passenger_capacity is required.'):
+            importers.upsert(Aircraft, rows, 'name', self.FIELDS)
+        self.assertFalse(Aircraft.objects.exists())
+
+    def test_overlong_text_is_rejected_not_truncated(self):
+        rows = [self.row(model='X' * 101)]
+        with self.assertRaisesMessage(ValidationError, 'Row 2: model is longer than 100 characters.'):
+            importers.upsert(Aircraft, rows, 'name', self.FIELDS)
+
+    def test_blank_key_is_skipped(self):
+        result = importers.upsert(Aircraft, [self.row(), self.row(name=' ')], 'name', self.FIELDS)
+        self.assertEqual((result.inserted, result.skipped), (1, 1))
+
+
+# ── SERVER-TIMING (perf.py) ───────────────────────────────────────────────────
+@override_settings(PERF_INSTRUMENTATION=True, PERF_SERVER_TIMING=True)
+class ServerTimingTests(TestCase):
+    URL = '/api/v1/admin/overview/users_summary/'
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create(username='ops', role='admin')
+
+    def test_header_only_for_admins(self):
+        client = APIClient()
+        self.assertNotIn('Server-Timing', client.get('/api/v1/airports/'))
+        client.force_authenticate(self.admin)
+        self.assertIn('db;dur=', client.get(self.URL)['Server-Timing'])
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_off_by_setting(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.assertNotIn('Server-Timing', client.get(self.URL))
+
+
+# ── SYNTHETIC DATA (synthetic.py) ─────────────────────────────────────────────
+class SyntheticDatasetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from .synthetic import SyntheticDataset
+        Airport.objects.bulk_create([
+            Airport(code=f'S{i:02d}', name=f'Seed {i}', city=f'City {i}', country='-',
+                    latitude=Decimal(i), longitude=Decimal(i))
+            for i in range(5)
+        ])
+        make_aircraft()
+        cls.counts = SyntheticDataset(500, seed=3, batch_size=40, log=lambda line: None).generate()
+
+    def test_row_counts_follow_the_shares(self):
+        self.assertEqual(MarketplaceBooking.objects.count(), self.counts['marketplace_bookings'])
+        self.assertEqual(FlightBooking.objects.count(), self.counts['flight_bookings'])
+        self.assertEqual(ContactInquiry.objects.count(), self.counts['contact_inquiries'])
+        self.assertEqual(User.objects.filter(role='client').count(), self.counts['clients'])
+        self.assertEqual(self.counts['marketplace_bookings'], 100)
+
+    def test_fills_in_what_save_and_signals_would_have(self):
+        from .availability import booking_window
+        for b in MarketplaceBooking.objects.all()[:50]:
+            self.assertEqual(b.commission_usd, round(b.gross_amount_usd * b.commission_pct / 100, 2))
+            self.assertEqual((b.occupied_from, b.occupied_until),
+                             booking_window(b.departure_datetime, b.return_datetime, b.estimated_hours))
+        generated = sorted(RevenueMonthly.objects.values_list('source', 'status', 'month', 'booking_count', 'gross_usd'))
+        revenue.rebuild_rollups()
+        self.assertEqual(generated, sorted(RevenueMonthly.objects.values_list(
+            'source', 'status', 'month', 'booking_count', 'gross_usd')))
+
+    def test_history_is_spread_and_auto_now_restored(self):
+        created = FlightBooking.objects.order_by('created_at').values_list('created_at', flat=True)
+        self.assertLess(created.first(), timezone.now() - timedelta(days=90))
+        self.assertTrue(FlightBooking._meta.get_field('created_at').auto_now_add)
+        self.assertTrue(FlightBooking._meta.get_field('updated_at').auto_now)
+
+    def test_same_seed_same_rows(self):
+        from .synthetic import SyntheticDataset
+        rows = lambda seed: [SyntheticDataset(500, seed=seed).person() for _ in range(5)]
+        self.assertEqual(rows(1), rows(1))
+        self.assertNotEqual(rows(1), rows(2))
+
+
+
+class SyntheticDatasetGuardTests(TestCase):
+    def test_needs_two_airports(self):
+        from .synthetic import SyntheticDataset
+        Airport.objects.create(code='ONE', name='Only', city='-', country='-')
+        with self.assertRaisesMessage(ValueError, 'at least two airports'):
+            SyntheticDataset(10, log=lambda line: None).generate()
+        self.assertFalse(User.objects.exists())
+
+
+# ── LIST QUERY COUNTS (check_query_counts) ────────────────────────────────────
+class ListQueryCountTests(TestCase):
+    """Every list endpoint costs the same queries for SMALL rows as for LARGE."""
+    SMALL, LARGE = 2, 20
+
+    @classmethod
+    def setUpTestData(cls):
+        from .synthetic import SyntheticDataset
+        Airport.objects.bulk_create([
+            Airport(code=f'T{i:02d}', name=f'Test {i}', city=f'City {i}', country='-',
+                    latitude=Decimal(i), longitude=Decimal(i))
+            for i in range(25)
+        ])
+        for i in range(25):
+            make_aircraft(name=f'Test Jet {i}')
+        SyntheticDataset(3000, log=lambda line: None).generate()
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        from .management.commands.check_query_counts import Command
+        command = Command(stdout=StringIO())
+        checked = []
+        for label, view in command.list_views():
+            if view.get_queryset()[:self.LARGE].count() < self.LARGE:
+                continue
+            few, _ = command.count(view, self.SMALL)
+            with self.subTest(label), self.assertNumQueries(few):
+                view.get_serializer(list(view.get_queryset()[:self.LARGE]), many=True).data
+            checked.append(label)
+        self.assertGreaterEqual(len(checked), 15, checked)
+
+
+# ── ENDPOINT BENCHMARK (benchmark_endpoints) ──────────────────────────────────
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class BenchmarkEndpointsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        from .synthetic import SyntheticDataset
+        Airport.objects.bulk_create([
+            Airport(code=f'B{i:02d}', name=f'Bench {i}', city=f'City {i}', country='-',
+                    latitude=Decimal(i), longitude=Decimal(i))
+            for i in range(5)
+        ])
+        make_aircraft()
+        SyntheticDataset(300, log=lambda line: None).generate()
+
+    def setUp(self):
+        cache.clear()
+
+    def benchmark(self, **options):
+        handle, path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        call_command('benchmark_endpoints', iterations=2, warmup=0, output=path, stdout=StringIO(), **options)
+        with open(path) as f:
+            return path, json.load(f)
+
+    def test_covers_every_router_registration_and_rolls_back(self):
+        from .urls import router
+        users = User.objects.count()
+        _, report = self.benchmark()
+        self.assertEqual(User.objects.count(), users)
+        routes = report['routes'].values()
+        failing = [r['name'] for r in routes if r['status'] >= 400]
+        self.assertEqual(failing, [])
+        measured = {r['name'] for r in routes}
+        for _, _, basename in router.registry:
+            with self.subTest(basename):
+                self.assertTrue(any(name.startswith(f'{basename}-') for name in measured))
+        self.assertIn('admin-price-calc-calculate', measured)
+
+    def test_compare_fails_on_more_queries(self):
+        path, report = self.benchmark(only='/airports/')
+        self.assertTrue(report['routes'])
+        compare = lambda: call_command('benchmark_endpoints', iterations=2, warmup=0, only='/airports/',
+                                       compare=path, min_delta_ms=1000, stdout=StringIO())
+        compare()
+        route = next(r for r in report['routes'].values() if r['queries'])
+        route['queries'] -= 1
+        with open(path, 'w') as f:
+            json.dump(report, f)
+        with self.assertRaisesMessage(CommandError, 'queries'):
+            compare()
+
+
+# ── QUERY PLANS (check_query_plans) ───────────────────────────────────────────
+# Seeds 5k rows per table; skip with `manage.py test --exclude-tag slow`
+@tag('slow')
+@override_settings(ALLOWED_HOSTS=['localhost'])
+class QueryPlanTests(TestCase):
+    def test_hot_endpoints_avoid_sequential_scans(self):
+        # Raises CommandError listing every plan with a full scan of a seeded table
+        call_command('check_query_plans', rows=5000, stdout=StringIO())
@@ -10,13 +10,13 @@ from .views import (
     AirportViewSet, AircraftViewSet, YachtViewSet,
     FlightBookingViewSet, YachtCharterViewSet,
     LeaseInquiryViewSet, FlightInquiryViewSet,
-    QuickQuoteView,
+    QuickQuoteView, QuickQuoteBatchView,
     ContactInquiryViewSet, GroupCharterInquiryViewSet,
     AirCargoInquiryViewSet, AircraftSalesInquiryViewSet,
     # Membership
     AuthViewSet, MembershipTierViewSet, MembershipViewSet,
     MarketplaceAircraftViewSet, MaintenanceLogViewSet,
-    MarketplaceBookingViewSet, CommissionSettingViewSet,
+    MarketplaceBookingViewSet, EmptyLegViewSet, CommissionSettingViewSet,
     PaymentRecordViewSet, SavedRouteViewSet, DisputeViewSet,
     ClientDashboardViewSet, OwnerDashboardViewSet, AdminDashboardViewSet,
 )
@@ -34,6 +34,8 @@ from .views import (
     MarketplaceBookingAdminViewSet,
     UserAdminViewSet,
     AdminOverviewViewSet,
+    ExportViewSet,
+    PerfViewSet,
 )
 
 router = DefaultRouter()
@@ -60,6 +62,7 @@ router.register(r'memberships',        MembershipViewSet,         basename='memb
 router.register(r'marketplace/aircraft',    MarketplaceAircraftViewSet, basename='marketplace-aircraft')
 router.register(r'marketplace/maintenance', MaintenanceLogViewSet,      basename='maintenance')
 router.register(r'marketplace/bookings',    MarketplaceBookingViewSet,  basename='marketplace-bookings')
+router.register(r'marketplace/empty-legs',  EmptyLegViewSet,            basename='empty-legs')
 
 # ── PLATFORM ──────────────────────────────────────────────────────────────────
 router.register(r'commissions',  CommissionSettingViewSet, basename='commissions')
@@ -86,9 +89,12 @@ router.register(r'admin/flight-inquiries',   FlightInquiryAdminViewSet,     base
 router.register(r'admin/marketplace-bookings', MarketplaceBookingAdminViewSet, basename='admin-mp-bookings')
 router.register(r'admin/users',              UserAdminViewSet,              basename='admin-users')
 router.register(r'admin/overview',           AdminOverviewViewSet,          basename='admin-overview')
+router.register(r'admin/exports',            ExportViewSet,                 basename='admin-exports')
+router.register(r'admin/perf',               PerfViewSet,                   basename='admin-perf')
 
 urlpatterns = [
     path('', include(router.urls)),
     path('quick-quote/',          QuickQuoteView.as_view(), name='quick-quote'),
+    path('quick-quote/batch/',    QuickQuoteBatchView.as_view(), name='quick-quote-batch'),
     path('auth/token/refresh/',   TokenRefreshView.as_view(), name='token-refresh'),
 ]
\ No newline at end of file
@@ -4,11 +4,14 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Prefetch, Q, Value
+from django.db.models.functions import Lower
 
+from .perf import SerializerTimingMixin
+from .catalog import CatalogListMixin
 from .models import (
     Airport, Aircraft, Yacht,
-    FlightBooking, YachtCharter,
+    FlightBooking, FlightLeg, YachtCharter,
     LeaseInquiry, FlightInquiry
 )
 from .serializers import (
@@ -19,7 +22,12 @@ from .serializers import (
 )
 
 
-class AirportViewSet(viewsets.ReadOnlyModelViewSet):
+def _legs_with_airports():
+    """Prefetch for booking.legs with each leg's airports joined in (FlightLegSerializer nests both)."""
+    return Prefetch('legs', queryset=FlightLeg.objects.select_related('origin', 'destination'))
+
+
+class AirportViewSet(SerializerTimingMixin, CatalogListMixin, viewsets.ReadOnlyModelViewSet):
     """Public read-only list of airports for autocomplete"""
     queryset = Airport.objects.all().order_by('city')
     serializer_class = AirportSerializer
@@ -27,8 +35,59 @@ class AirportViewSet(viewsets.ReadOnlyModelViewSet):
     filter_backends = [filters.SearchFilter]
     search_fields = ['code', 'name', 'city', 'country']
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Ranked airport suggestions served from memory (see search.py).
+        ?q=<text>&limit=<1-50, default 10>
+        """
+        from .search import get_airport_search_index
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        matches = get_airport_search_index().search(request.query_params.get('q', ''), limit)
+        return Response(AirportSerializer(matches, many=True).data)
+
+    @action(detail=False, methods=['get', 'post'])
+    def nearby(self, request):
+        """
+        Nearest airports to a coordinate (k-d tree in geo.py, no table scan).
+        GET  ?lat=&lon=&radius_km=&k=
+        POST {"points": [{"lat", "lon", "ref"?}, ...], "radius_km"?, "k"?}
+             resolves many locations at once, e.g. a batch of inquiries.
+        """
+        from .geo import get_airport_index
+        from .serializers import NearbyAirportQuerySerializer, NearbyAirportBulkSerializer
+
+        def resolve(index, lat, lon, k, radius_km):
+            return [
+                {**AirportSerializer(airport).data, 'distance_km': round(km, 1)}
+                for airport, km in index.nearest(lat, lon, k=k, radius_km=radius_km)
+            ]
+
+        if request.method == 'GET':
+            ser = NearbyAirportQuerySerializer(data=request.query_params)
+            if not ser.is_valid():
+                return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
+            d = ser.validated_data
+            return Response(resolve(get_airport_index(), d['lat'], d['lon'], d['k'], d.get('radius_km')))
+
+        ser = NearbyAirportBulkSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(ser.errors, status=status.HTTP_400_BAD_REQUEST)
+        d = ser.validated_data
+        index = get_airport_index()
+        return Response([
+            {
+                'lat': p['lat'], 'lon': p['lon'], 'ref': p.get('ref', ''),
+                'airports': resolve(index, p['lat'], p['lon'], d['k'], d.get('radius_km')),
+            }
+            for p in d['points']
+        ])
+
 
-class AircraftViewSet(viewsets.ReadOnlyModelViewSet):
+class AircraftViewSet(SerializerTimingMixin, CatalogListMixin, viewsets.ReadOnlyModelViewSet):
     """Public aircraft catalog"""
     queryset = Aircraft.objects.filter(is_available=True).order_by('category')
     serializer_class = AircraftSerializer
@@ -38,7 +97,7 @@ class AircraftViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['name', 'model', 'category']
 
 
-class YachtViewSet(viewsets.ReadOnlyModelViewSet):
+class YachtViewSet(SerializerTimingMixin, CatalogListMixin, viewsets.ReadOnlyModelViewSet):
     """Public yacht catalog"""
     queryset = Yacht.objects.filter(is_available=True).order_by('size_category')
     serializer_class = YachtSerializer
@@ -47,7 +106,7 @@ class YachtViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ['size_category']
 
 
-class FlightBookingViewSet(viewsets.ModelViewSet):
+class FlightBookingViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """
     Flight booking — no auth required.
     Guests can create bookings and track by reference UUID.
@@ -59,7 +118,7 @@ class FlightBookingViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return FlightBooking.objects.select_related(
             'origin', 'destination', 'aircraft'
-        ).prefetch_related('legs').order_by('-created_at')
+        ).prefetch_related(_legs_with_airports()).order_by('-created_at')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -86,7 +145,7 @@ class FlightBookingViewSet(viewsets.ModelViewSet):
         try:
             booking = FlightBooking.objects.select_related(
                 'origin', 'destination', 'aircraft'
-            ).prefetch_related('legs').get(reference=reference)
+            ).prefetch_related(_legs_with_airports()).get(reference=reference)
             serializer = FlightBookingSerializer(booking)
             return Response(serializer.data)
         except FlightBooking.DoesNotExist:
@@ -100,12 +159,13 @@ class FlightBookingViewSet(viewsets.ModelViewSet):
                 {'error': 'Please provide your email to retrieve bookings.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        qs = self.get_queryset().filter(guest_email__iexact=email)
+        # Case-insensitive match written as LOWER(col) = LOWER(%s) so it hits the functional index
+        qs = self.get_queryset().alias(email_lower=Lower('guest_email')).filter(email_lower=Lower(Value(email)))
         serializer = FlightBookingSerializer(qs, many=True)
         return Response(serializer.data)
 
 
-class YachtCharterViewSet(viewsets.ModelViewSet):
+class YachtCharterViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Yacht charter bookings"""
     permission_classes = [AllowAny]
 
@@ -140,11 +200,11 @@ class YachtCharterViewSet(viewsets.ModelViewSet):
         email = request.query_params.get('email')
         if not email:
             return Response({'error': 'Please provide your email.'}, status=status.HTTP_400_BAD_REQUEST)
-        qs = self.get_queryset().filter(guest_email__iexact=email)
+        qs = self.get_queryset().alias(email_lower=Lower('guest_email')).filter(email_lower=Lower(Value(email)))
         return Response(YachtCharterSerializer(qs, many=True).data)
 
 
-class LeaseInquiryViewSet(viewsets.ModelViewSet):
+class LeaseInquiryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Asset lease inquiries"""
     permission_classes = [AllowAny]
     serializer_class = LeaseInquirySerializer
@@ -165,7 +225,7 @@ class LeaseInquiryViewSet(viewsets.ModelViewSet):
         )
 
 
-class FlightInquiryViewSet(viewsets.ModelViewSet):
+class FlightInquiryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """General open-ended flight inquiries"""
     permission_classes = [AllowAny]
     serializer_class = FlightInquirySerializer
@@ -199,37 +259,116 @@ class QuickQuoteView(APIView):
             return Response({'error': 'origin, destination and aircraft are required.'}, status=400)
 
         try:
-            from .models import Airport, Aircraft
-            import math
-            origin = Airport.objects.get(id=origin_id)
-            destination = Airport.objects.get(id=destination_id)
+            from .geo import get_airport_index, resolve_airport_id
+            from .pricing import estimate_quote, format_quote
+            # Airports come from the in-memory index — no DB round-trip
+            airports = get_airport_index()
+            origin_id = resolve_airport_id(origin_id)
+            destination_id = resolve_airport_id(destination_id)
+            origin = airports.get(origin_id)
+            destination = airports.get(destination_id)
+            if origin is None or destination is None:
+                raise Airport.DoesNotExist('Airport matching query does not exist.')
             aircraft = Aircraft.objects.get(id=aircraft_id)
 
-            # Haversine distance estimate
-            if origin.latitude and destination.latitude:
-                lat1, lon1 = float(origin.latitude), float(origin.longitude)
-                lat2, lon2 = float(destination.latitude), float(destination.longitude)
-                R = 6371
-                dlat = math.radians(lat2 - lat1)
-                dlon = math.radians(lon2 - lon1)
-                a = math.sin(dlat/2)**2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon/2)**2
-                distance_km = R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-                flight_hours = distance_km / float(aircraft.cruise_speed_kmh)
-                estimated_price = float(aircraft.hourly_rate_usd) * flight_hours * 1.25  # 25% overhead
-            else:
-                estimated_price = None
-                flight_hours = None
+            # Great-circle distance estimate (memoised per airport pair)
+            distance_km = airports.distance_km(origin_id, destination_id)
+            flight_hours, estimated_price = estimate_quote(
+                distance_km, aircraft.cruise_speed_kmh, aircraft.hourly_rate_usd
+            )
+            flight_hours, estimated_price = format_quote(flight_hours, estimated_price)
 
             return Response({
                 'origin': AirportSerializer(origin).data,
                 'destination': AirportSerializer(destination).data,
                 'aircraft': AircraftSerializer(aircraft).data,
-                'estimated_flight_hours': round(flight_hours, 1) if flight_hours else None,
-                'estimated_price_usd': round(estimated_price, 0) if estimated_price else None,
+                'estimated_flight_hours': flight_hours,
+                'estimated_price_usd': estimated_price,
                 'note': 'Estimate only. Final pricing confirmed by our team.'
             })
         except Exception as e:
             return Response({'error': str(e)}, status=400)
+
+
+class QuickQuoteBatchView(APIView):
+    """
+    Price many routes against many aircraft in one call.
+    Body: {"routes": [{"origin": id, "destination": id}, ...],
+           "aircraft": [ids]?, "category": str?, "min_capacity": int?,
+           "exclude_out_of_range": bool?}
+    Returns a routes × aircraft matrix using the same formula as QuickQuoteView.
+    Aircraft named by id are quoted whatever their availability, like
+    QuickQuoteView; otherwise the available fleet is used.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        from .geo import get_airport_index
+        from .pricing import estimate_quote, format_quote
+        from .serializers import QuickQuoteBatchSerializer
+
+        ser = QuickQuoteBatchSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        d = ser.validated_data
+
+        airports = get_airport_index()
+        missing = sorted({
+            pk for r in d['routes'] for pk in (r['origin'], r['destination'])
+            if airports.get(pk) is None
+        })
+        if missing:
+            return Response({'error': f'Unknown airport id(s): {missing}'}, status=400)
+
+        if d.get('aircraft'):
+            aircraft_qs = Aircraft.objects.filter(id__in=d['aircraft'])
+        else:
+            aircraft_qs = Aircraft.objects.filter(is_available=True)
+        if d.get('category'):
+            aircraft_qs = aircraft_qs.filter(category=d['category'])
+        if d.get('min_capacity'):
+            aircraft_qs = aircraft_qs.filter(passenger_capacity__gte=d['min_capacity'])
+        fleet = list(aircraft_qs.order_by('category', 'id').values_list(
+            'id', 'name', 'category', 'passenger_capacity', 'range_km',
+            'cruise_speed_kmh', 'hourly_rate_usd',
+        ))
+
+        distances = [airports.distance_km(r['origin'], r['destination']) for r in d['routes']]
+        # Routes longer than an aircraft's range are flagged, or, with
+        # exclude_out_of_range, left out of that route's quotes only.
+        rows   = []
+        quoted = set()
+        for route, km in zip(d['routes'], distances):
+            cells = []
+            for ac_id, _, _, _, range_km, cruise, rate in fleet:
+                if d['exclude_out_of_range'] and km is not None and range_km < km:
+                    continue
+                quoted.add(ac_id)
+                hours, price = format_quote(*estimate_quote(km, cruise, rate))
+                cells.append({
+                    'aircraft':               ac_id,
+                    'estimated_flight_hours': hours,
+                    'estimated_price_usd':    price,
+                    'in_range':               km is not None and range_km >= km,
+                })
+            origin, dest = airports.get(route['origin']), airports.get(route['destination'])
+            rows.append({
+                'origin':      {'id': origin.id, 'code': origin.code, 'city': origin.city},
+                'destination': {'id': dest.id,   'code': dest.code,   'city': dest.city},
+                'distance_km': round(km, 0) if km is not None else None,
+                'quotes':      cells,
+            })
+
+        return Response({
+            'aircraft': [
+                {'id': a[0], 'name': a[1], 'category': a[2],
+                 'passenger_capacity': a[3], 'range_km': a[4]}
+                for a in fleet if a[0] in quoted
+            ],
+            'routes': rows,
+            'note': 'Estimate only. Final pricing confirmed by our team.',
+        })
+
         
         
 # ── ADD THESE IMPORTS to views.py ─────────────────────────────────────────────
@@ -237,7 +376,7 @@ from .models import (ContactInquiry, GroupCharterInquiry, AirCargoInquiry, Aircr
 from .serializers import (ContactInquirySerializer, GroupCharterInquirySerializer, AirCargoInquirySerializer, AircraftSalesInquirySerializer)
 
 
-class ContactInquiryViewSet(viewsets.ModelViewSet):
+class ContactInquiryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Contact form submissions"""
     permission_classes = [AllowAny]
     serializer_class = ContactInquirySerializer
@@ -258,7 +397,7 @@ class ContactInquiryViewSet(viewsets.ModelViewSet):
         )
 
 
-class GroupCharterInquiryViewSet(viewsets.ModelViewSet):
+class GroupCharterInquiryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Group charter inquiries"""
     permission_classes = [AllowAny]
     serializer_class = GroupCharterInquirySerializer
@@ -287,7 +426,7 @@ class GroupCharterInquiryViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Inquiry not found.'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class AirCargoInquiryViewSet(viewsets.ModelViewSet):
+class AirCargoInquiryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Air cargo inquiries"""
     permission_classes = [AllowAny]
     serializer_class = AirCargoInquirySerializer
@@ -316,7 +455,7 @@ class AirCargoInquiryViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Inquiry not found.'}, status=status.HTTP_404_NOT_FOUND)
 
 
-class AircraftSalesInquiryViewSet(viewsets.ModelViewSet):
+class AircraftSalesInquiryViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     """Aircraft buy/sell/trade inquiries"""
     permission_classes = [AllowAny]
     serializer_class = AircraftSalesInquirySerializer
@@ -354,18 +493,24 @@ class AircraftSalesInquiryViewSet(viewsets.ModelViewSet):
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
-from django.db.models import Sum, Count, Q
+from django.db import transaction
+from django.db.models import Sum, Count, Q, F
 from django.utils import timezone
-from datetime import timedelta
-from decimal import Decimal
+from django.utils.dateparse import parse_date, parse_datetime
+from django.shortcuts import get_object_or_404
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
 
 from .models import (
     User, MembershipTier, Membership,
     MarketplaceAircraft, MaintenanceLog,
     MarketplaceBooking, CommissionSetting,
-    PaymentRecord, SavedRoute, Dispute,
+    PaymentRecord, SavedRoute, Dispute, EmptyLeg,
 )
 from .serializers import (
     UserRegistrationSerializer, UserProfileSerializer,
@@ -455,14 +600,14 @@ class AuthViewSet(viewsets.ViewSet):
 
 
 # ── MEMBERSHIP TIER VIEWSET ───────────────────────────────────────────────────
-class MembershipTierViewSet(viewsets.ReadOnlyModelViewSet):
+class MembershipTierViewSet(SerializerTimingMixin, CatalogListMixin, viewsets.ReadOnlyModelViewSet):
     queryset           = MembershipTier.objects.filter(is_active=True)
     serializer_class   = MembershipTierSerializer
     permission_classes = [permissions.AllowAny]
 
 
 # ── MEMBERSHIP VIEWSET ────────────────────────────────────────────────────────
-class MembershipViewSet(viewsets.ModelViewSet):
+class MembershipViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class   = MembershipSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -470,7 +615,7 @@ class MembershipViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if user.role == 'admin':
             return Membership.objects.select_related('user', 'tier').all()
-        return Membership.objects.filter(user=user)
+        return Membership.objects.filter(user=user).select_related('user', 'tier')
 
     @action(detail=False, methods=['post'])
     def subscribe(self, request):
@@ -522,31 +667,28 @@ class MembershipViewSet(viewsets.ModelViewSet):
 
 
 # ── MARKETPLACE AIRCRAFT VIEWSET ──────────────────────────────────────────────
-class MarketplaceAircraftViewSet(viewsets.ModelViewSet):
+class MarketplaceAircraftViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class = MarketplaceAircraftSerializer
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', 'availability', 'search']:
             return [permissions.IsAuthenticated()]
-        if self.action in ['approve', 'set_commission']:
+        if self.action in ['approve', 'set_commission', 'ingest_flight_hours']:
             return [IsAdminUser()]
         return [IsOwnerOrAdmin()]
 
     def get_queryset(self):
         user = self.request.user
+        qs   = MarketplaceAircraft.objects.select_related('owner')
+        if self.action in ('list', 'retrieve', 'update', 'partial_update'):
+            qs = qs.prefetch_related('exclusive_tiers')   # serialized as a list of tier ids
         if user.role == 'owner':
-            return MarketplaceAircraft.objects.filter(owner=user)
+            return qs.filter(owner=user)
         if user.role == 'admin':
-            return MarketplaceAircraft.objects.all()
-        # Clients only see approved & available
-        return MarketplaceAircraft.objects.filter(
-            is_approved=True, status='available'
-        ).exclude(
-            exclusive_tiers__isnull=False
-        ) | MarketplaceAircraft.objects.filter(
-            is_approved=True, status='available',
-            exclusive_tiers__membership__user=user
-        )
+            return qs
+        # Clients only see approved & available listings open to their tier
+        from .visibility import visible_to
+        return visible_to(user, qs)
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
@@ -574,8 +716,11 @@ class MarketplaceAircraftViewSet(viewsets.ModelViewSet):
     def log_flight_hours(self, request, pk=None):
         aircraft = self.get_object()
         hours = Decimal(str(request.data.get('hours', 0)))
-        aircraft.total_flight_hours += hours
-        aircraft.save()
+        # F() keeps concurrent logs from losing hours; save() still stamps
+        # updated_at and fires post_save (empty legs)
+        aircraft.total_flight_hours = F('total_flight_hours') + hours
+        aircraft.save(update_fields=['total_flight_hours', 'updated_at'])
+        aircraft.refresh_from_db()
         alert = aircraft.maintenance_due
         return Response({
             'total_flight_hours':     float(aircraft.total_flight_hours),
@@ -585,8 +730,124 @@ class MarketplaceAircraftViewSet(viewsets.ModelViewSet):
         })
 
 
+    @action(detail=True, methods=['get'])
+    def availability(self, request, pk=None):
+        """
+        Busy and free windows for ?from=&to= (ISO datetimes; default the next
+        30 days). Booking references are only shown to the owner and admins.
+        """
+        from .availability import busy_intervals, free_windows, MAX_CALENDAR_DAYS
+        aircraft = self.get_object()
+        start = parse_datetime(request.query_params.get('from') or '') or timezone.now()
+        end   = parse_datetime(request.query_params.get('to') or '') or start + timedelta(days=30)
+        if timezone.is_naive(start):
+            start = timezone.make_aware(start)
+        if timezone.is_naive(end):
+            end = timezone.make_aware(end)
+        if end <= start:
+            return Response({'error': '"to" must be after "from".'}, status=400)
+        if end - start > timedelta(days=MAX_CALENDAR_DAYS):
+            return Response({'error': f'Range is limited to {MAX_CALENDAR_DAYS} days.'}, status=400)
+
+        busy = busy_intervals(aircraft.pk, start, end)
+        show_refs = request.user.role == 'admin' or aircraft.owner_id == request.user.id
+        return Response({
+            'aircraft': aircraft.id,
+            'from':     start,
+            'to':       end,
+            'busy': [
+                {
+                    'start':  b['occupied_from'],
+                    'end':    b['occupied_until'],
+                    'status': b['status'],
+                    **({'reference': str(b['reference'])} if show_refs else {}),
+                }
+                for b in busy
+            ],
+            'free': [{'start': s, 'end': e} for s, e in free_windows(busy, start, end)],
+        })
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Aircraft that can fly ?origin=&destination= (airport id or code) on
+        ?date= for ?passengers=, optionally at ?time= (UTC). Ranked by the
+        caller's price after their membership discount.
+        """
+        from .serializers import FleetSearchSerializer
+        from .fleet import search_fleet
+        ser = FleetSearchSerializer(data=request.query_params)
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        d = ser.validated_data
+        results, discount = search_fleet(
+            request.user, d['distance_km'], d['date'], d['passengers'],
+            departure_time=d.get('time'), limit=d['limit'],
+        )
+        return Response({
+            'origin':       d['origin'].code,
+            'destination':  d['destination'].code,
+            'distance_km':  round(d['distance_km'], 0),
+            'date':         d['date'],
+            'passengers':   d['passengers'],
+            'discount_pct': float(discount),
+            'count':        len(results),
+            'results':      results,
+        })
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, MultiPartParser])
+    def ingest_flight_hours(self, request):
+        """
+        Apply a batch of ops-system flight-hour records in one transaction.
+        Body: {"records": [{record_id, registration_number, hours, timestamp}, ...]}
+        or a multipart `file` (CSV with those headers, or JSON lines).
+        Records whose record_id was already ingested are skipped.
+        """
+        from .serializers import FlightHoursRecordSerializer
+        from .ingest import parse_upload, ingest, MAX_RECORDS
+        if 'file' in request.FILES:
+            try:
+                records = parse_upload(request.FILES['file'])
+            except (ValueError, UnicodeDecodeError) as e:
+                return Response({'error': f'Could not parse upload: {e}'}, status=400)
+        else:
+            records = request.data.get('records') if isinstance(request.data, dict) else request.data
+        if not isinstance(records, list) or not records:
+            return Response({'error': 'Send a non-empty "records" list or a file.'}, status=400)
+        if len(records) > MAX_RECORDS:
+            return Response({'error': f'At most {MAX_RECORDS} records per batch.'}, status=400)
+
+        ser = FlightHoursRecordSerializer(data=records, many=True)
+        if not ser.is_valid():
+            return Response({'errors': ser.errors}, status=400)
+        records = ser.validated_data
+
+        regs = dict(
+            MarketplaceAircraft.objects
+            .filter(registration_number__in={r['registration_number'] for r in records})
+            .values_list('registration_number', 'id')
+        )
+        unknown = sorted({r['registration_number'] for r in records} - regs.keys())
+        if unknown:
+            return Response({'error': 'Unknown registration number(s).', 'unknown': unknown}, status=400)
+        for r in records:
+            r['aircraft_id'] = regs[r['registration_number']]
+
+        applied, duplicates, crossed = ingest(records, request.user)
+        return Response({
+            'received':          len(records),
+            'applied':           applied,
+            'duplicates':        duplicates,
+            'crossed_threshold': [
+                {**a, 'total_flight_hours': float(a['total_flight_hours']),
+                 'maintenance_hours_left': float(a['maintenance_hours_left'])}
+                for a in crossed
+            ],
+        })
+
+
 # ── MAINTENANCE LOG VIEWSET ───────────────────────────────────────────────────
-class MaintenanceLogViewSet(viewsets.ModelViewSet):
+class MaintenanceLogViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class   = MaintenanceLogSerializer
     permission_classes = [IsOwnerOrAdmin]
 
@@ -594,20 +855,58 @@ class MaintenanceLogViewSet(viewsets.ModelViewSet):
         user = self.request.user
         if user.role == 'admin':
             return MaintenanceLog.objects.select_related('aircraft').all()
-        return MaintenanceLog.objects.filter(aircraft__owner=user)
+        return MaintenanceLog.objects.filter(aircraft__owner=user).select_related('aircraft')
 
     @action(detail=False, methods=['get'])
     def alerts(self, request):
-        """Return all aircraft where maintenance is due."""
+        """
+        Aircraft where maintenance is due, most overdue first.
+        ?within_hours=N also includes aircraft within N hours of their
+        interval, paginated.
+        """
         user = self.request.user
         qs = MarketplaceAircraft.objects.filter(owner=user) if user.role == 'owner' \
              else MarketplaceAircraft.objects.all()
-        due = [a for a in qs if a.maintenance_due]
-        return Response(MarketplaceAircraftSerializer(due, many=True).data)
+        qs = qs.select_related('owner').prefetch_related('exclusive_tiers') \
+               .order_by('maintenance_hours_left', 'id')
+
+        within = request.query_params.get('within_hours')
+        if within is None:
+            due = qs.filter(maintenance_hours_left__lte=0)
+            return Response(MarketplaceAircraftSerializer(due, many=True).data)
+        try:
+            within = Decimal(within)
+        except (InvalidOperation, ValueError):
+            return Response({'error': 'within_hours must be a number.'}, status=400)
+        if not within.is_finite() or within < 0:
+            return Response({'error': 'within_hours must be zero or more.'}, status=400)
+        page = self.paginate_queryset(qs.filter(maintenance_hours_left__lte=within))
+        return self.get_paginated_response(MarketplaceAircraftSerializer(page, many=True).data)
 
 
 # ── MARKETPLACE BOOKING VIEWSET ───────────────────────────────────────────────
-class MarketplaceBookingViewSet(viewsets.ModelViewSet):
+def _save_booking(serializer, **extra):
+    """
+    serializer.save() for a MarketplaceBooking, refusing a window that
+    overlaps another blocking booking of the same aircraft.
+    """
+    from .availability import BLOCKING_STATUSES, booking_window, is_booked
+    instance = serializer.instance
+    d        = {**serializer.validated_data, **extra}
+    value    = lambda field, default=None: d[field] if field in d else getattr(instance, field, default)
+    aircraft = value('aircraft')
+    start, end = booking_window(value('departure_datetime'), value('return_datetime'), value('estimated_hours'))
+    with transaction.atomic():
+        if value('status', 'pending') in BLOCKING_STATUSES and \
+                is_booked(aircraft.pk, start, end, exclude_pk=getattr(instance, 'pk', None)):
+            raise ValidationError({
+                'aircraft': f'{aircraft.name} is already booked between '
+                            f'{start:%Y-%m-%d %H:%M} and {end:%Y-%m-%d %H:%M} UTC.',
+            })
+        return serializer.save(**extra)
+
+
+class MarketplaceBookingViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_serializer_class(self):
@@ -617,11 +916,12 @@ class MarketplaceBookingViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
+        qs   = MarketplaceBooking.objects.select_related('client', 'aircraft', 'membership__tier')
         if user.role == 'client':
-            return MarketplaceBooking.objects.filter(client=user).select_related('aircraft', 'membership')
+            return qs.filter(client=user)
         if user.role == 'owner':
-            return MarketplaceBooking.objects.filter(aircraft__owner=user)
-        return MarketplaceBooking.objects.all()
+            return qs.filter(aircraft__owner=user)
+        return qs
 
     def perform_create(self, serializer):
         user     = self.request.user
@@ -636,15 +936,16 @@ class MarketplaceBookingViewSet(viewsets.ModelViewSet):
             raise Exception('Active membership required to book.')
 
         # Get commission rate
-        setting = CommissionSetting.objects.order_by('-effective_from').first()
-        commission_pct = setting.rate_pct if setting else Decimal('10')
+        from .pricing import current_commission_rate
+        commission_pct = current_commission_rate()
 
         # Calculate price
         base_rate   = aircraft.hourly_rate_usd
         discounted  = base_rate * (1 - discount / 100)
         gross       = round(discounted * hours, 2)
 
-        serializer.save(
+        _save_booking(
+            serializer,
             client=user,
             membership=membership,
             gross_amount_usd=gross,
@@ -652,6 +953,9 @@ class MarketplaceBookingViewSet(viewsets.ModelViewSet):
             discount_applied=discount,
         )
 
+    def perform_update(self, serializer):
+        _save_booking(serializer)
+
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
         booking = self.get_object()
@@ -671,8 +975,111 @@ class MarketplaceBookingViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Booking not found.'}, status=404)
 
 
+# ── EMPTY LEGS ────────────────────────────────────────────────────────────────
+class EmptyLegViewSet(SerializerTimingMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Open empty legs, filterable by ?from=&to= (dates or datetimes — legs
+    whose departure window overlaps the range), ?origin=, ?destination=
+    and ?passengers=. Members book one at its discounted price.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_serializer_class(self):
+        from .serializers import EmptyLegSerializer
+        return EmptyLegSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+        qs   = EmptyLeg.objects.select_related('aircraft')
+        if user.role == 'owner':
+            return qs.filter(aircraft__owner=user)
+        qs = qs.filter(status='open', available_until__gt=timezone.now())
+        if user.role == 'client':
+            from .visibility import visible_to
+            qs = qs.filter(aircraft__in=visible_to(user))
+        if self.action != 'list':
+            return qs
+
+        params = self.request.query_params
+        start  = self._moment(params.get('from'))
+        end    = self._moment(params.get('to'), end_of_day=True)
+        if start is not None:
+            qs = qs.filter(available_until__gte=start)
+        if end is not None:
+            qs = qs.filter(available_from__lte=end)
+        if params.get('origin'):
+            qs = qs.filter(origin__iexact=params['origin'].strip())
+        if params.get('destination'):
+            qs = qs.filter(destination__iexact=params['destination'].strip())
+        if params.get('passengers', '').isdigit():
+            qs = qs.filter(aircraft__passenger_capacity__gte=int(params['passengers']))
+        return qs.order_by('available_from', 'id')
+
+    @staticmethod
+    def _moment(value, end_of_day=False):
+        if not value:
+            return None
+        try:
+            day    = parse_date(value)
+            moment = None if day is not None else parse_datetime(value)
+        except ValueError:
+            return None
+        if day is not None:
+            moment = datetime.combine(day, datetime.max.time() if end_of_day else datetime.min.time())
+        if moment is None:
+            return None
+        return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+    @action(detail=True, methods=['post'], permission_classes=[IsClient])
+    def book(self, request, pk=None):
+        """Book the leg: {departure_datetime, passenger_count, special_requests}."""
+        from .serializers import EmptyLegBookSerializer
+        from .availability import booking_window, is_booked
+        from .pricing import current_commission_rate
+        ser = EmptyLegBookSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        d = ser.validated_data
+
+        membership = Membership.objects.filter(user=request.user).first()
+        if membership is None or not membership.is_active:
+            return Response({'error': 'Active membership required to book.'}, status=403)
+
+        with transaction.atomic():
+            leg = get_object_or_404(self.get_queryset().select_for_update(of=('self',)), pk=pk)
+            departure = d['departure_datetime']
+            if not (max(leg.available_from, timezone.now()) <= departure <= leg.available_until):
+                return Response({'error': f'Departure must be between {leg.available_from:%Y-%m-%d %H:%M} '
+                                          f'and {leg.available_until:%Y-%m-%d %H:%M} UTC.'}, status=400)
+            if d['passenger_count'] > leg.aircraft.passenger_capacity:
+                return Response({'error': f'{leg.aircraft.name} seats {leg.aircraft.passenger_capacity}.'}, status=400)
+
+            start, end = booking_window(departure, None, leg.estimated_hours)
+            if is_booked(leg.aircraft_id, start, end):
+                return Response({'error': 'The aircraft is no longer free at that time.'}, status=409)
+
+            booking = MarketplaceBooking.objects.create(
+                client=request.user,
+                aircraft_id=leg.aircraft_id,
+                membership=membership,
+                trip_type='one_way',
+                origin=leg.origin,
+                destination=leg.destination,
+                departure_datetime=departure,
+                estimated_hours=leg.estimated_hours,
+                passenger_count=d['passenger_count'],
+                special_requests=d['special_requests'],
+                gross_amount_usd=leg.price_usd,
+                commission_pct=current_commission_rate(),
+                discount_applied=leg.discount_pct,
+            )
+            EmptyLeg.objects.filter(pk=leg.pk).update(status='booked', booking=booking, updated_at=timezone.now())
+
+        return Response(MarketplaceBookingSerializer(booking).data, status=201)
+
+
 # ── COMMISSION VIEWSET ────────────────────────────────────────────────────────
-class CommissionSettingViewSet(viewsets.ModelViewSet):
+class CommissionSettingViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     queryset           = CommissionSetting.objects.all()
     serializer_class   = CommissionSettingSerializer
     permission_classes = [IsAdminUser]
@@ -680,9 +1087,20 @@ class CommissionSettingViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(set_by=self.request.user)
 
+    @action(detail=False, methods=['get'])
+    def current(self, request):
+        """Rate in effect today, served from the cached schedule, plus cache counters."""
+        from .pricing import current_commission_setting, commission_cache_counts
+        setting = current_commission_setting()
+        return Response({
+            'rate_pct':       setting.rate_pct if setting else 10,
+            'effective_from': setting.effective_from if setting else None,
+            'cache':          commission_cache_counts(),
+        })
+
 
 # ── PAYMENT VIEWSET ───────────────────────────────────────────────────────────
-class PaymentRecordViewSet(viewsets.ReadOnlyModelViewSet):
+class PaymentRecordViewSet(SerializerTimingMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class   = PaymentRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -694,7 +1112,7 @@ class PaymentRecordViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 # ── SAVED ROUTE VIEWSET ───────────────────────────────────────────────────────
-class SavedRouteViewSet(viewsets.ModelViewSet):
+class SavedRouteViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class   = SavedRouteSerializer
     permission_classes = [IsClient]
 
@@ -706,15 +1124,15 @@ class SavedRouteViewSet(viewsets.ModelViewSet):
 
 
 # ── DISPUTE VIEWSET ───────────────────────────────────────────────────────────
-class DisputeViewSet(viewsets.ModelViewSet):
+class DisputeViewSet(SerializerTimingMixin, viewsets.ModelViewSet):
     serializer_class   = DisputeSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'admin':
-            return Dispute.objects.all()
-        return Dispute.objects.filter(raised_by=user)
+            return Dispute.objects.select_related('raised_by')
+        return Dispute.objects.filter(raised_by=user).select_related('raised_by')
 
     def perform_create(self, serializer):
         serializer.save(raised_by=self.request.user)
@@ -743,7 +1161,8 @@ class ClientDashboardViewSet(viewsets.ViewSet):
 
         bookings    = MarketplaceBooking.objects.filter(client=user)
         upcoming    = bookings.filter(departure_datetime__gte=timezone.now(),
-                                      status__in=['confirmed', 'pending'])
+                                      status__in=['confirmed', 'pending']) \
+                              .select_related('client', 'aircraft', 'membership__tier')
         total_spent = bookings.filter(status='completed').aggregate(
             t=Sum('gross_amount_usd'))['t'] or 0
         days_rem    = membership.days_remaining if membership else None
@@ -781,7 +1200,7 @@ class OwnerDashboardViewSet(viewsets.ViewSet):
         maint_alerts= MaintenanceLog.objects.filter(
             aircraft__owner=user, status='scheduled',
             scheduled_date__lte=now.date() + timedelta(days=7)
-        )
+        ).select_related('aircraft')
 
         return Response({
             'total_revenue_usd':      total_rev,
@@ -798,8 +1217,8 @@ class AdminDashboardViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
+        from .pricing import current_commission_rate
         bookings   = MarketplaceBooking.objects.filter(status='completed')
-        commission = CommissionSetting.objects.order_by('-effective_from').first()
 
         return Response({
             'total_platform_revenue': bookings.aggregate(t=Sum('gross_amount_usd'))['t'] or 0,
@@ -808,7 +1227,7 @@ class AdminDashboardViewSet(viewsets.ViewSet):
             'total_aircraft':         MarketplaceAircraft.objects.filter(is_approved=True).count(),
             'pending_approvals':      MarketplaceAircraft.objects.filter(is_approved=False).count(),
             'open_disputes':          Dispute.objects.filter(status='open').count(),
-            'commission_rate':        commission.rate_pct if commission else 10,
+            'commission_rate':        current_commission_rate(),
         })
         
         
@@ -821,6 +1240,7 @@ from django.core.mail import send_mail, EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.conf import settings as django_settings
 from .models import EmailLog
+from .pagination import AdminPaginationMixin
 from .serializers import (
       SendEmailSerializer, FlightBookingAdminSerializer,
       FlightBookingPriceSerializer, FlightBookingCreateAdminSerializer,
@@ -843,6 +1263,7 @@ from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal, ROUND_HALF_UP
 
+from .pricing import price_breakdown, itinerary_legs, price_itinerary, current_commission_rate
 from .models import (
     User, Membership, MembershipTier,
     MarketplaceAircraft, MarketplaceBooking, CommissionSetting,
@@ -861,51 +1282,18 @@ class IsAdminUser(permissions.BasePermission):
 
 def _send_email_and_log(admin_user, to_email, to_name, subject, body,
                         inquiry_type='general', related_id=None):
-    """Send HTML email and log result. Returns (success: bool, error: str)"""
-    html_body = f"""
-    <html><body style="font-family:Arial,sans-serif;max-width:600px;margin:auto;padding:20px">
-      <div style="background:#0b1d3a;padding:20px;border-radius:8px 8px 0 0">
-        <h2 style="color:#C9A84C;margin:0">NairobiJetHouse</h2>
-        <p style="color:rgba(255,255,255,0.6);margin:4px 0 0;font-size:13px">Private Aviation & Luxury Charter</p>
-      </div>
-      <div style="border:1px solid #e5e7eb;border-top:none;padding:28px;border-radius:0 0 8px 8px">
-        {"<p style='color:#374151'>Dear " + to_name + ",</p>" if to_name else ""}
-        <div style="color:#374151;line-height:1.7;white-space:pre-line">{body}</div>
-        <hr style="border:none;border-top:1px solid #e5e7eb;margin:24px 0">
-        <p style="color:#9ca3af;font-size:12px;margin:0">
-          NairobiJetHouse · Private Aviation & Luxury Charter<br>
-          This email was sent by our operations team. Please do not reply directly to this message.
-        </p>
-      </div>
-    </body></html>
     """
-    try:
-        msg = EmailMultiAlternatives(
-            subject=subject,
-            body=body,
-            from_email=getattr(django_settings, 'DEFAULT_FROM_EMAIL', 'ops@NairobiJetHouse.com'),
-            to=[f'"{to_name}" <{to_email}>' if to_name else to_email],
-        )
-        msg.attach_alternative(html_body, "text/html")
-        msg.send()
-        EmailLog.objects.create(
-            sent_by=admin_user, to_email=to_email, to_name=to_name,
-            subject=subject, body=body, inquiry_type=inquiry_type,
-            related_id=related_id, success=True,
-        )
-        return True, ''
-    except Exception as e:
-        EmailLog.objects.create(
-            sent_by=admin_user, to_email=to_email, to_name=to_name,
-            subject=subject, body=body, inquiry_type=inquiry_type,
-            related_id=related_id, success=False, error_msg=str(e),
-        )
-        return False, str(e)
+    Queue an HTML email and return its EmailLog. Delivery happens in the
+    process_email_queue worker (see emails.py), never inside the request.
+    """
+    from .emails import queue_email
+    return queue_email(admin_user, to_email, to_name, subject, body, inquiry_type, related_id)
 
 
 # ── EMAIL LOG VIEWSET ─────────────────────────────────────────────────────────
-class EmailLogViewSet(viewsets.ReadOnlyModelViewSet):
+class EmailLogViewSet(SerializerTimingMixin, AdminPaginationMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAdminUser]
+    cursor_ordering    = ('-sent_at', '-id')
     filter_backends    = [filters.SearchFilter]
     search_fields      = ['to_email', 'subject', 'inquiry_type']
 
@@ -924,14 +1312,44 @@ class EmailLogViewSet(viewsets.ReadOnlyModelViewSet):
         if not ser.is_valid():
             return Response(ser.errors, status=400)
         d = ser.validated_data
-        ok, err = _send_email_and_log(
+        log = _send_email_and_log(
             request.user, d['to_email'], d.get('to_name', ''),
             d['subject'], d['body'], d.get('inquiry_type', 'general'),
             d.get('related_id'),
         )
-        if ok:
-            return Response({'message': f'Email sent to {d["to_email"]} successfully.'})
-        return Response({'error': f'Failed to send email: {err}'}, status=500)
+        return Response({'message': f'Email queued for {d["to_email"]}.', 'email_reference': str(log.reference)})
+
+    @action(detail=False, methods=['post'])
+    def send_bulk(self, request):
+        """
+        Campaign to an explicit list or to members matched by role /
+        membership status / tier. Rows are only queued here; the
+        process_email_queue worker delivers them in chunks over one SMTP
+        connection per thread, so delivery failures show up on the logs
+        (status / error_msg), not in this response.
+        """
+        from .serializers import BulkEmailSerializer
+        from .emails import queue_bulk, member_recipients, listed_recipients
+        ser = BulkEmailSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        d = ser.validated_data
+        if d.get('recipients'):
+            recipients = listed_recipients(d['recipients'])
+        else:
+            recipients = member_recipients(d.get('role'), d.get('membership_status'), d.get('tier'))
+        started = time.perf_counter()
+        queued  = queue_bulk(
+            request.user, recipients, d['subject'], d['body'],
+            d['inquiry_type'], d['chunk_size'],
+        )
+        elapsed = time.perf_counter() - started
+        return Response({
+            'message':           f'{queued} email(s) queued for delivery by the outbox worker.',
+            'queued':            queued,
+            'elapsed_ms':        round(elapsed * 1000, 1),
+            'queued_per_second': round(queued / elapsed, 1) if elapsed else None,
+        })
 
 
 # ── PRICE CALCULATOR VIEW ─────────────────────────────────────────────────────
@@ -946,8 +1364,7 @@ class PriceCalculatorViewSet(viewsets.ViewSet):
             return Response(ser.errors, status=400)
 
         d = ser.validated_data
-        commission = CommissionSetting.objects.order_by('-effective_from').first()
-        commission_pct = d.get('commission_pct') or (commission.rate_pct if commission else Decimal('10'))
+        commission_pct = d.get('commission_pct') or current_commission_rate()
 
         # Base rate
         hourly_rate = d.get('hourly_rate_usd')
@@ -960,34 +1377,93 @@ class PriceCalculatorViewSet(viewsets.ViewSet):
         if not hourly_rate:
             return Response({'error': 'Provide either aircraft_id or hourly_rate_usd.'}, status=400)
 
-        hours      = Decimal(str(d['estimated_hours']))
-        base       = hourly_rate * hours
-        catering   = Decimal('500') * d['passenger_count'] if d.get('catering') else Decimal('0')
-        ground     = Decimal('800') if d.get('ground_transport') else Decimal('0')
-        concierge  = Decimal('400') if d.get('concierge') else Decimal('0')
-        subtotal   = base + catering + ground + concierge
-        discount   = (subtotal * Decimal(str(d['discount_pct'])) / 100).quantize(Decimal('0.01'), ROUND_HALF_UP)
-        after_disc = subtotal - discount
-        comm_amt   = (after_disc * Decimal(str(commission_pct)) / 100).quantize(Decimal('0.01'), ROUND_HALF_UP)
-        owner_net  = after_disc - comm_amt
+        return Response({
+            'breakdown': price_breakdown(
+                hourly_rate, d['estimated_hours'], d['passenger_count'],
+                catering=d.get('catering'), ground_transport=d.get('ground_transport'),
+                concierge=d.get('concierge'), discount_pct=d['discount_pct'],
+                commission_pct=commission_pct,
+            )
+        })
+
+    @action(detail=False, methods=['post'])
+    def itinerary(self, request):
+        """
+        Multi-leg pricing. Takes ordered legs (or an existing FlightBooking's
+        legs), adds positioning legs to/from base_airport when given, and
+        prices the whole itinerary for one aircraft or the available fleet
+        through the same breakdown as calculate(). Each option carries block
+        hours per leg as well as the total.
+
+        Charter Aircraft rows have no home base, so positioning is only added
+        when the caller names base_airport.
+        """
+        from .geo import get_airport_index
+        from .serializers import ItineraryPriceSerializer
+        ser = ItineraryPriceSerializer(data=request.data)
+        if not ser.is_valid():
+            return Response(ser.errors, status=400)
+        d = ser.validated_data
+
+        if d.get('booking_id'):
+            booking = FlightBooking.objects.filter(id=d['booking_id']).first()
+            if booking is None:
+                return Response({'error': 'Booking not found.'}, status=404)
+            legs = list(booking.legs.values_list('origin_id', 'destination_id')) or \
+                   [(booking.origin_id, booking.destination_id)]
+            if booking.trip_type == 'round_trip' and len(legs) == 1:
+                legs.append((booking.destination_id, booking.origin_id))
+        else:
+            legs = [(l['origin'], l['destination']) for l in d['legs']]
+
+        airports = get_airport_index()
+        base_id  = d.get('base_airport')
+        missing  = sorted({pk for pair in legs for pk in pair if airports.get(pk) is None}
+                          | ({base_id} if base_id and airports.get(base_id) is None else set()))
+        if missing:
+            return Response({'error': f'Unknown airport id(s): {missing}'}, status=400)
+
+        fleet_qs = Aircraft.objects.all()
+        if d.get('aircraft_id'):
+            fleet_qs = fleet_qs.filter(id=d['aircraft_id'])
+        else:
+            fleet_qs = fleet_qs.filter(is_available=True, passenger_capacity__gte=d['passenger_count'])
+        fleet = list(fleet_qs.values('id', 'name', 'category', 'passenger_capacity',
+                                     'range_km', 'cruise_speed_kmh', 'hourly_rate_usd'))
+        if not fleet:
+            return Response({'error': 'No aircraft match this itinerary.'}, status=400)
+
+        commission_pct = d.get('commission_pct') or current_commission_rate()
+
+        expanded = itinerary_legs(airports, legs, base_id)
+        try:
+            options = price_itinerary(
+                expanded, fleet, d['passenger_count'],
+                catering=d.get('catering'), ground_transport=d.get('ground_transport'),
+                concierge=d.get('concierge'), discount_pct=d['discount_pct'],
+                commission_pct=commission_pct,
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        def airport_brief(pk):
+            a = airports.get(pk)
+            return {'id': a.id, 'code': a.code, 'city': a.city}
 
         return Response({
-            'breakdown': {
-                'hourly_rate_usd':    float(hourly_rate),
-                'estimated_hours':    float(hours),
-                'base_flight_cost':   float(base),
-                'catering_cost':      float(catering),
-                'ground_transport':   float(ground),
-                'concierge_cost':     float(concierge),
-                'subtotal':           float(subtotal),
-                'discount_pct':       float(d['discount_pct']),
-                'discount_amount':    float(discount),
-                'total_after_discount': float(after_disc),
-                'commission_pct':     float(commission_pct),
-                'commission_amount':  float(comm_amt),
-                'owner_net_usd':      float(owner_net),
-                'grand_total_usd':    float(after_disc),
-            }
+            'legs': [
+                {
+                    'leg_number':     n,
+                    'origin':         airport_brief(l['origin']),
+                    'destination':    airport_brief(l['destination']),
+                    'distance_km':    round(l['distance_km'], 1),
+                    'is_positioning': l['is_positioning'],
+                }
+                for n, l in enumerate(expanded, 1)
+            ],
+            'revenue_km':     round(sum(l['distance_km'] for l in expanded if not l['is_positioning']), 1),
+            'positioning_km': round(sum(l['distance_km'] for l in expanded if l['is_positioning']), 1),
+            'options':        options,
         })
 
 
@@ -1001,7 +1477,7 @@ from django.db.models.functions import TruncMonth
 from decimal import Decimal, ROUND_HALF_UP
 
 
-class FlightBookingAdminViewSet(viewsets.ModelViewSet):
+class FlightBookingAdminViewSet(SerializerTimingMixin, AdminPaginationMixin, viewsets.ModelViewSet):
     """
     Admin CRUD for FlightBooking.
     set_price  — auto-calculates commission_usd & net_revenue_usd, then emails guest.
@@ -1015,7 +1491,7 @@ class FlightBookingAdminViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return FlightBooking.objects.select_related(
             'origin', 'destination', 'aircraft'
-        ).prefetch_related('legs').order_by('-created_at')
+        ).prefetch_related(_legs_with_airports()).order_by('-created_at')
 
     def get_serializer_class(self):
         from .serializers import FlightBookingAdminSerializer, FlightBookingCreateAdminSerializer
@@ -1051,7 +1527,7 @@ class FlightBookingAdminViewSet(viewsets.ModelViewSet):
             'commission_pct': float(booking.commission_pct),
             'commission_usd': float(booking.commission_usd or 0),
             'net_revenue':    float(booking.net_revenue_usd or 0),
-            'email_sent':     False,
+            'email_queued':   False,
         }
 
         if d.get('send_email', True):
@@ -1068,14 +1544,14 @@ class FlightBookingAdminViewSet(viewsets.ModelViewSet):
                 f"To confirm your booking please reply to this email or contact your dedicated concierge.\n\n"
                 f"Warm regards,\nNairobiJetHouse Operations Team"
             )
-            ok, err = _send_email_and_log(
+            log = _send_email_and_log(
                 request.user, booking.guest_email, booking.guest_name,
                 f"Your Flight Quote – {route} | NairobiJetHouse",
                 body, 'flight_booking', booking.id,
             )
-            result['email_sent'] = ok
-            if not ok:
-                result['email_error'] = err
+            result['email_queued']    = True   # delivery status lives on the EmailLog
+            result['email_status']    = log.status
+            result['email_reference'] = str(log.reference)
 
         return Response(result)
 
@@ -1093,13 +1569,11 @@ class FlightBookingAdminViewSet(viewsets.ModelViewSet):
         if d.get('quoted_price'):
             booking.quoted_price_usd = d['quoted_price']
         booking.save()
-        ok, err = _send_email_and_log(
+        log = _send_email_and_log(
             request.user, booking.guest_email, booking.guest_name,
             d['subject'], d['message'], 'flight_booking', booking.id,
         )
-        if ok:
-            return Response({'message': 'Reply sent successfully.'})
-        return Response({'error': err}, status=500)
+        return Response({'message': 'Reply queued for delivery.', 'email_reference': str(log.reference)})
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -1112,119 +1586,22 @@ class FlightBookingAdminViewSet(viewsets.ModelViewSet):
         booking.save()
         return Response({'message': f'Status updated to {new_status}.'})
 
-
-# ── PATCH: Add revenue_chart to AdminOverviewViewSet ─────────────────────────
-# Append this action inside your existing AdminOverviewViewSet class.
-
     @action(detail=False, methods=['get'])
     def revenue_chart(self, request):
-        """
-        Monthly revenue time-series for confirmed/completed FlightBookings.
-        Returns last 12 months by default (or ?months=N).
-        Only bookings with status in ['confirmed','in_flight','completed']
-        and a non-null quoted_price_usd are counted.
-        """
-        from django.utils import timezone
-        from datetime import timedelta
-        from django.db.models.functions import TruncMonth
-
+        """Same payload as /admin/overview/revenue_chart/ (?months=N, default 12)."""
+        from .revenue import revenue_chart
         months = int(request.query_params.get('months', 12))
-        since  = timezone.now() - timedelta(days=months * 31)
-
-        qs = (
-            FlightBooking.objects
-            .filter(
-                status__in=['confirmed', 'in_flight', 'completed'],
-                quoted_price_usd__isnull=False,
-                created_at__gte=since,
-            )
-            .annotate(month=TruncMonth('created_at'))
-            .values('month')
-            .annotate(
-                confirmed_count=Count('id'),
-                gross_usd      =Sum('quoted_price_usd'),
-                commission_usd =Sum('commission_usd'),
-                net_usd        =Sum('net_revenue_usd'),
-            )
-            .order_by('month')
-        )
-
-        data = [
-            {
-                'month':           row['month'].strftime('%Y-%m'),
-                'label':           row['month'].strftime('%b %Y'),
-                'confirmed_count': row['confirmed_count'],
-                'gross_usd':       float(row['gross_usd']   or 0),
-                'commission_usd':  float(row['commission_usd'] or 0),
-                'net_usd':         float(row['net_usd']     or 0),
-            }
-            for row in qs
-        ]
-
-        # Also include a totals object for quick summary cards
-        totals_qs = FlightBooking.objects.filter(
-            status__in=['confirmed', 'in_flight', 'completed'],
-            quoted_price_usd__isnull=False,
-        ).aggregate(
-            total_bookings    =Count('id'),
-            total_gross       =Sum('quoted_price_usd'),
-            total_commission  =Sum('commission_usd'),
-            total_net         =Sum('net_revenue_usd'),
-        )
-
-        return Response({
-            'chart': data,
-            'totals': {
-                'total_bookings':   totals_qs['total_bookings']   or 0,
-                'total_gross':      float(totals_qs['total_gross']      or 0),
-                'total_commission': float(totals_qs['total_commission'] or 0),
-                'total_net':        float(totals_qs['total_net']        or 0),
-            },
-        })
-
+        return Response(revenue_chart(months))
 
     @action(detail=False, methods=['get'])
     def combined_revenue(self, request):
-        """
-        Combines FlightBooking + MarketplaceBooking confirmed revenue.
-        Used for the grand total platform revenue card.
-        """
-        flight_agg = FlightBooking.objects.filter(
-            status__in=['confirmed', 'in_flight', 'completed'],
-            quoted_price_usd__isnull=False,
-        ).aggregate(
-            gross      =Sum('quoted_price_usd'),
-            commission =Sum('commission_usd'),
-        )
-        mp_agg = MarketplaceBooking.objects.filter(
-            status='completed',
-        ).aggregate(
-            gross      =Sum('gross_amount_usd'),
-            commission =Sum('commission_usd'),
-        )
-
-        total_gross      = float(flight_agg['gross']      or 0) + float(mp_agg['gross']      or 0)
-        total_commission = float(flight_agg['commission'] or 0) + float(mp_agg['commission'] or 0)
-
-        return Response({
-            'flight_bookings': {
-                'gross':      float(flight_agg['gross']      or 0),
-                'commission': float(flight_agg['commission'] or 0),
-            },
-            'marketplace_bookings': {
-                'gross':      float(mp_agg['gross']      or 0),
-                'commission': float(mp_agg['commission'] or 0),
-            },
-            'combined': {
-                'gross':      total_gross,
-                'commission': total_commission,
-                'net':        total_gross - total_commission,
-            },
-        })
+        """Same payload as /admin/overview/combined_revenue/."""
+        from .revenue import combined_revenue
+        return Response(combined_revenue())
 
 
 # ── YACHT CHARTER ADMIN VIEWSET ───────────────────────────────────────────────
-class YachtCharterAdminViewSet(viewsets.ModelViewSet):
+class YachtCharterAdminViewSet(SerializerTimingMixin, AdminPaginationMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     filter_backends    = [filters.SearchFilter]
     search_fields      = ['guest_name', 'guest_email', 'reference']
@@ -1249,7 +1626,7 @@ class YachtCharterAdminViewSet(viewsets.ModelViewSet):
             charter.status = d['status']
         charter.save()
 
-        result = {'message': 'Price updated.', 'email_sent': False}
+        result = {'message': 'Price updated.', 'email_queued': False}
         if d.get('send_email', True):
             nights = (charter.charter_end - charter.charter_start).days
             body   = d.get('email_message') or (
@@ -1265,14 +1642,14 @@ class YachtCharterAdminViewSet(viewsets.ModelViewSet):
                 f"Please contact us to proceed with your booking confirmation.\n\n"
                 f"Warm regards,\nNairobiJetHouse Concierge Team"
             )
-            ok, err = _send_email_and_log(
+            log = _send_email_and_log(
                 request.user, charter.guest_email, charter.guest_name,
                 f"Your Yacht Charter Quote | NairobiJetHouse",
                 body, 'yacht_charter', charter.id,
             )
-            result['email_sent'] = ok
-            if not ok:
-                result['email_error'] = err
+            result['email_queued']    = True   # delivery status lives on the EmailLog
+            result['email_status']    = log.status
+            result['email_reference'] = str(log.reference)
         return Response(result)
 
     @action(detail=True, methods=['post'])
@@ -1288,18 +1665,16 @@ class YachtCharterAdminViewSet(viewsets.ModelViewSet):
         if d.get('quoted_price'):
             charter.quoted_price_usd = d['quoted_price']
         charter.save()
-        ok, err = _send_email_and_log(
+        log = _send_email_and_log(
             request.user, charter.guest_email, charter.guest_name,
             d['subject'], d['message'], 'yacht_charter', charter.id,
         )
-        if ok:
-            return Response({'message': 'Reply sent successfully.'})
-        return Response({'error': err}, status=500)
+        return Response({'message': 'Reply queued for delivery.', 'email_reference': str(log.reference)})
 
 
 # ── GENERIC INQUIRY REPLY MIXIN ───────────────────────────────────────────────
-class InquiryAdminMixin:
-    """Mixin for inquiry viewsets that support reply + status update"""
+class InquiryAdminMixin(AdminPaginationMixin):
+    """Mixin for inquiry viewsets that support reply + status update (cursor-paginated)"""
     inquiry_type_label = 'general'
 
     def _get_email_fields(self, obj):
@@ -1328,13 +1703,11 @@ class InquiryAdminMixin:
         email, name = self._get_email_fields(obj)
         if not email:
             return Response({'error': 'No email address found on this record.'}, status=400)
-        ok, err = _send_email_and_log(
+        log = _send_email_and_log(
             request.user, email, name,
             d['subject'], d['message'], self.inquiry_type_label, obj.id,
         )
-        if ok:
-            return Response({'message': f'Reply sent to {email}.'})
-        return Response({'error': err}, status=500)
+        return Response({'message': f'Reply queued for {email}.', 'email_reference': str(log.reference)})
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -1348,7 +1721,7 @@ class InquiryAdminMixin:
 
 
 # ── LEASE INQUIRY ADMIN VIEWSET ───────────────────────────────────────────────
-class LeaseInquiryAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
+class LeaseInquiryAdminViewSet(SerializerTimingMixin, InquiryAdminMixin, viewsets.ModelViewSet):
     permission_classes    = [IsAdminUser]
     inquiry_type_label    = 'lease_inquiry'
     filter_backends       = [filters.SearchFilter]
@@ -1363,7 +1736,7 @@ class LeaseInquiryAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
 
 
 # ── CONTACT INQUIRY ADMIN VIEWSET ─────────────────────────────────────────────
-class ContactInquiryAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
+class ContactInquiryAdminViewSet(SerializerTimingMixin, InquiryAdminMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     inquiry_type_label = 'contact'
     filter_backends    = [filters.SearchFilter]
@@ -1378,7 +1751,7 @@ class ContactInquiryAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
 
 
 # ── GROUP CHARTER ADMIN VIEWSET ───────────────────────────────────────────────
-class GroupCharterAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
+class GroupCharterAdminViewSet(SerializerTimingMixin, InquiryAdminMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     inquiry_type_label = 'group_charter'
     filter_backends    = [filters.SearchFilter]
@@ -1393,7 +1766,7 @@ class GroupCharterAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
 
 
 # ── AIR CARGO ADMIN VIEWSET ───────────────────────────────────────────────────
-class AirCargoAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
+class AirCargoAdminViewSet(SerializerTimingMixin, InquiryAdminMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     inquiry_type_label = 'air_cargo'
     filter_backends    = [filters.SearchFilter]
@@ -1408,7 +1781,7 @@ class AirCargoAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
 
 
 # ── AIRCRAFT SALES ADMIN VIEWSET ──────────────────────────────────────────────
-class AircraftSalesAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
+class AircraftSalesAdminViewSet(SerializerTimingMixin, InquiryAdminMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     inquiry_type_label = 'aircraft_sales'
     filter_backends    = [filters.SearchFilter]
@@ -1423,7 +1796,7 @@ class AircraftSalesAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
 
 
 # ── FLIGHT INQUIRY ADMIN VIEWSET ──────────────────────────────────────────────
-class FlightInquiryAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
+class FlightInquiryAdminViewSet(SerializerTimingMixin, InquiryAdminMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     inquiry_type_label = 'flight_inquiry'
     filter_backends    = [filters.SearchFilter]
@@ -1438,14 +1811,17 @@ class FlightInquiryAdminViewSet(InquiryAdminMixin, viewsets.ModelViewSet):
 
 
 # ── MARKETPLACE BOOKING ADMIN VIEWSET ─────────────────────────────────────────
-class MarketplaceBookingAdminViewSet(viewsets.ModelViewSet):
+class MarketplaceBookingAdminViewSet(SerializerTimingMixin, AdminPaginationMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     filter_backends    = [filters.SearchFilter]
     search_fields      = ['client__username', 'client__email', 'aircraft__name', 'reference']
 
     def get_queryset(self):
-        return MarketplaceBooking.objects.select_related(
-            'client', 'aircraft', 'aircraft__owner', 'membership'
+        # client / aircraft are prefetched rather than joined: with INNER JOINs
+        # SQLite may drive the query from the small aircraft table and sort
+        # every booking instead of walking mpbooking_created_idx
+        return MarketplaceBooking.objects.select_related('membership__tier').prefetch_related(
+            'client', 'aircraft__owner',
         ).order_by('-created_at')
 
     def get_serializer_class(self):
@@ -1464,7 +1840,10 @@ class MarketplaceBookingAdminViewSet(viewsets.ModelViewSet):
         comm_pct   = d.get('commission_pct', Decimal('10'))
         comm_usd   = (gross * comm_pct / 100).quantize(Decimal('0.01'), ROUND_HALF_UP)
         net        = gross - comm_usd
-        serializer.save(commission_usd=comm_usd, net_owner_usd=net)
+        _save_booking(serializer, commission_usd=comm_usd, net_owner_usd=net)
+
+    def perform_update(self, serializer):
+        _save_booking(serializer)
 
     @action(detail=True, methods=['post'])
     def send_confirmation(self, request, pk=None):
@@ -1483,15 +1862,13 @@ class MarketplaceBookingAdminViewSet(viewsets.ModelViewSet):
             f"Your concierge will be in touch with further details.\n\n"
             f"Warm regards,\nNairobiJetHouse Operations Team"
         )
-        ok, err = _send_email_and_log(
+        log = _send_email_and_log(
             request.user, booking.client.email,
             booking.client.get_full_name(),
             f"Booking Confirmed – {booking.origin} → {booking.destination} | NairobiJetHouse",
             body, 'marketplace_booking', booking.id,
         )
-        if ok:
-            return Response({'message': 'Confirmation email sent.'})
-        return Response({'error': err}, status=500)
+        return Response({'message': 'Confirmation email queued.', 'email_reference': str(log.reference)})
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -1500,14 +1877,20 @@ class MarketplaceBookingAdminViewSet(viewsets.ModelViewSet):
         valid = [s[0] for s in MarketplaceBooking.STATUS_CHOICES]
         if new_status not in valid:
             return Response({'error': 'Invalid status.'}, status=400)
+        from .availability import BLOCKING_STATUSES, is_booked
         old = booking.status
-        booking.status = new_status
-        booking.save()
+        with transaction.atomic():
+            if new_status in BLOCKING_STATUSES and old not in BLOCKING_STATUSES and \
+                    is_booked(booking.aircraft_id, booking.occupied_from, booking.occupied_until, booking.pk):
+                return Response({'error': f'{booking.aircraft.name} is already booked for this window.'},
+                                status=409)
+            booking.status = new_status
+            booking.save()
         return Response({'message': f'Status changed from {old} to {new_status}.'})
 
 
 # ── USER MANAGEMENT ADMIN VIEWSET ─────────────────────────────────────────────
-class UserAdminViewSet(viewsets.ModelViewSet):
+class UserAdminViewSet(SerializerTimingMixin, AdminPaginationMixin, viewsets.ModelViewSet):
     permission_classes = [IsAdminUser]
     filter_backends    = [filters.SearchFilter]
     search_fields      = ['username', 'email', 'first_name', 'last_name', 'company']
@@ -1535,13 +1918,11 @@ class UserAdminViewSet(viewsets.ModelViewSet):
         if not ser.is_valid():
             return Response(ser.errors, status=400)
         d = ser.validated_data
-        ok, err = _send_email_and_log(
+        log = _send_email_and_log(
             request.user, user.email, user.get_full_name(),
             d['subject'], d['body'], d.get('inquiry_type', 'general'),
         )
-        if ok:
-            return Response({'message': f'Email sent to {user.email}.'})
-        return Response({'error': err}, status=500)
+        return Response({'message': f'Email queued for {user.email}.', 'email_reference': str(log.reference)})
 
 
 # ── ADMIN OVERVIEW EXTENDED ───────────────────────────────────────────────────
@@ -1551,129 +1932,85 @@ class AdminOverviewViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'])
     def inquiries_summary(self, request):
-        return Response({
-            'flight_bookings':  FlightBooking.objects.count(),
-            'yacht_charters':   YachtCharter.objects.count(),
-            'lease_inquiries':  LeaseInquiry.objects.count(),
-            'flight_inquiries': FlightInquiry.objects.count(),
-            'contacts':         ContactInquiry.objects.count(),
-            'group_charters':   GroupCharterInquiry.objects.count(),
-            'air_cargo':        AirCargoInquiry.objects.count(),
-            'aircraft_sales':   AircraftSalesInquiry.objects.count(),
-            'pending_flight_bookings': FlightBooking.objects.filter(status='inquiry').count(),
-            'pending_yacht_charters':  YachtCharter.objects.filter(status='inquiry').count(),
-            'pending_lease':           LeaseInquiry.objects.filter(status='pending').count(),
-            'pending_contacts':        ContactInquiry.objects.count(),
-            'pending_group_charters':  GroupCharterInquiry.objects.filter(status='pending').count(),
-            'pending_air_cargo':       AirCargoInquiry.objects.filter(status='pending').count(),
-            'pending_aircraft_sales':  AircraftSalesInquiry.objects.filter(status='pending').count(),
-        })
+        from .summaries import inquiries_summary
+        return Response(inquiries_summary())
 
     @action(detail=False, methods=['get'])
     def users_summary(self, request):
-        return Response({
-            'total_users':    User.objects.count(),
-            'clients':        User.objects.filter(role='client').count(),
-            'owners':         User.objects.filter(role='owner').count(),
-            'active_members': Membership.objects.filter(status='active').count(),
-            'expired':        Membership.objects.filter(status='expired').count(),
-        })
+        from .summaries import users_summary
+        return Response(users_summary())
 
     @action(detail=False, methods=['get'])
     def revenue_chart(self, request):
         """
         Monthly revenue time-series for confirmed/completed FlightBookings.
-        Returns last 12 months by default (or ?months=N).
+        Returns last 12 months by default (or ?months=N). Reads the
+        RevenueMonthly rollup, not the booking table.
         """
-        from django.db.models.functions import TruncMonth
-
+        from .revenue import revenue_chart
         months = int(request.query_params.get('months', 12))
-        since  = timezone.now() - timedelta(days=months * 31)
-
-        qs = (
-            FlightBooking.objects
-            .filter(
-                status__in=['confirmed', 'in_flight', 'completed'],
-                quoted_price_usd__isnull=False,
-                created_at__gte=since,
-            )
-            .annotate(month=TruncMonth('created_at'))
-            .values('month')
-            .annotate(
-                confirmed_count=Count('id'),
-                gross_usd      =Sum('quoted_price_usd'),
-                commission_usd =Sum('commission_usd'),
-                net_usd        =Sum('net_revenue_usd'),
-            )
-            .order_by('month')
-        )
-
-        data = [
-            {
-                'month':            row['month'].strftime('%Y-%m'),
-                'label':            row['month'].strftime('%b %Y'),
-                'confirmed_count':  row['confirmed_count'],
-                'gross_usd':        float(row['gross_usd']        or 0),
-                'commission_usd':   float(row['commission_usd']   or 0),
-                'net_usd':          float(row['net_usd']          or 0),
-            }
-            for row in qs
-        ]
-
-        totals_qs = FlightBooking.objects.filter(
-            status__in=['confirmed', 'in_flight', 'completed'],
-            quoted_price_usd__isnull=False,
-        ).aggregate(
-            total_bookings   =Count('id'),
-            total_gross      =Sum('quoted_price_usd'),
-            total_commission =Sum('commission_usd'),
-            total_net        =Sum('net_revenue_usd'),
-        )
-
-        return Response({
-            'chart': data,
-            'totals': {
-                'total_bookings':   totals_qs['total_bookings']   or 0,
-                'total_gross':      float(totals_qs['total_gross']      or 0),
-                'total_commission': float(totals_qs['total_commission'] or 0),
-                'total_net':        float(totals_qs['total_net']        or 0),
-            },
-        })
+        return Response(revenue_chart(months))
 
     @action(detail=False, methods=['get'])
     def combined_revenue(self, request):
         """
         Combines FlightBooking + MarketplaceBooking confirmed revenue.
+        Used for the grand total platform revenue card.
         """
-        flight_agg = FlightBooking.objects.filter(
-            status__in=['confirmed', 'in_flight', 'completed'],
-            quoted_price_usd__isnull=False,
-        ).aggregate(
-            gross      =Sum('quoted_price_usd'),
-            commission =Sum('commission_usd'),
-        )
-        mp_agg = MarketplaceBooking.objects.filter(
-            status='completed',
-        ).aggregate(
-            gross      =Sum('gross_amount_usd'),
-            commission =Sum('commission_usd'),
-        )
+        from .revenue import combined_revenue
+        return Response(combined_revenue())
 
-        total_gross      = float(flight_agg['gross']      or 0) + float(mp_agg['gross']      or 0)
-        total_commission = float(flight_agg['commission'] or 0) + float(mp_agg['commission'] or 0)
 
+# ── EXPORTS ───────────────────────────────────────────────────────────────────
+class ExportViewSet(viewsets.ViewSet):
+    """
+    Streaming CSV / JSON Lines exports.
+    GET /admin/exports/                 → available datasets and their columns
+    GET /admin/exports/<dataset>/       → ?output=csv|jsonl&from=&to=&status=
+    """
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        from .exports import DATASETS, FORMATS
         return Response({
-            'flight_bookings': {
-                'gross':      float(flight_agg['gross']      or 0),
-                'commission': float(flight_agg['commission'] or 0),
-            },
-            'marketplace_bookings': {
-                'gross':      float(mp_agg['gross']      or 0),
-                'commission': float(mp_agg['commission'] or 0),
-            },
-            'combined': {
-                'gross':      total_gross,
-                'commission': total_commission,
-                'net':        total_gross - total_commission,
-            },
-        })
\ No newline at end of file
+            'formats':  list(FORMATS),
+            'datasets': {name: [col for col, _ in columns] for name, (_, columns) in DATASETS.items()},
+        })
+
+    def retrieve(self, request, pk=None):
+        from .exports import DATASETS, FORMATS, export_response, filter_rows
+        if pk not in DATASETS:
+            return Response({'error': f'Unknown dataset "{pk}".'}, status=404)
+        fmt = request.query_params.get('output', 'csv')
+        if fmt not in FORMATS:
+            return Response({'error': f'"output" must be one of: {", ".join(FORMATS)}.'}, status=400)
+        model, _ = DATASETS[pk]
+        try:
+            queryset = filter_rows(model.objects.all(), request.query_params)
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=400)
+        return export_response(queryset, pk, fmt)
+
+
+# ── PERFORMANCE ───────────────────────────────────────────────────────────────
+class PerfViewSet(viewsets.ViewSet):
+    """
+    Per-route request stats collected by PerfMiddleware (this worker only).
+    GET  /admin/perf/         → top routes by p95 and by queries per request (?limit=20)
+    POST /admin/perf/reset/   → start a fresh measurement window
+    """
+    permission_classes = [IsAdminUser]
+
+    def list(self, request):
+        from .perf import snapshot
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 200)
+        except ValueError:
+            return Response({'error': '"limit" must be a number.'}, status=400)
+        return Response(snapshot(limit))
+
+    @action(detail=False, methods=['post'])
+    def reset(self, request):
+        from .perf import reset
+        reset()
+        return Response({'message': 'Performance stats cleared.'})
@@ -0,0 +1,126 @@
+# flights/visibility.py
+"""
+Which membership tiers can see a marketplace listing.
+
+MarketplaceAircraft.exclusive_tiers is denormalised into
+MarketplaceAircraft.tier_mask — one bit per MembershipTier.name, 0 meaning
+"open to every tier". There are only a handful of tiers, so "listings this
+member may see" becomes tier_mask IN (the few masks containing their bit)
+on the (is_approved, status, tier_mask) index: no join through the M2M, no
+duplicate rows.
+
+The mask is kept in step by m2m_changed on exclusive_tiers plus
+post_save / delete on MembershipTier (renames, and deletions, which cascade
+to the through table without any m2m_changed). See flights/signals.py.
+
+A tier name with no bit would add nothing to the mask and so open the
+listing to everyone; linking one raises ValidationError instead.
+"""
+from collections import defaultdict
+
+from django.core.exceptions import ValidationError
+
+from .models import MarketplaceAircraft, MembershipTier
+
+TIER_BITS = {name: 1 << i for i, (name, _) in enumerate(MembershipTier.TIER_CHOICES)}
+ALL_MASKS = range(1 << len(TIER_BITS))
+
+Through = MarketplaceAircraft.exclusive_tiers.through
+
+
+def tier_bit(name):
+    """The tier's bit in tier_mask; ValidationError for a name outside TIER_CHOICES."""
+    try:
+        return TIER_BITS[name]
+    except KeyError:
+        raise ValidationError(
+            f'Unknown membership tier {name!r} — expected one of {", ".join(TIER_BITS)}.'
+        ) from None
+
+
+def masks_visible_to(tier_name):
+    """tier_mask values a member of tier_name (or None) may see."""
+    # Without a known tier a member sees only listings open to every tier
+    bit = TIER_BITS.get(tier_name, 0)
+    return [m for m in ALL_MASKS if m == 0 or m & bit]
+
+
+def visible_to(user, queryset=None):
+    """Approved, available listings the given client may see."""
+    from .models import Membership
+    tier = Membership.objects.filter(user=user).values_list('tier__name', flat=True).first()
+    queryset = MarketplaceAircraft.objects.all() if queryset is None else queryset
+    return queryset.filter(
+        is_approved=True, status='available', tier_mask__in=masks_visible_to(tier),
+    )
+
+
+def refresh_tier_masks(aircraft_ids=None):
+    """Recompute tier_mask for the given aircraft (all when None)."""
+    links = Through.objects.values_list('marketplaceaircraft_id', 'membershiptier__name')
+    targets = MarketplaceAircraft.objects.all()
+    if aircraft_ids is not None:
+        aircraft_ids = list(aircraft_ids)
+        if not aircraft_ids:
+            return
+        links   = links.filter(marketplaceaircraft_id__in=aircraft_ids)
+        targets = targets.filter(id__in=aircraft_ids)
+    masks = defaultdict(int)
+    for aircraft_id, name in links:
+        masks[aircraft_id] |= tier_bit(name)
+    by_mask = defaultdict(list)
+    for aircraft_id, current in targets.values_list('id', 'tier_mask'):
+        if masks[aircraft_id] != current:
+            by_mask[masks[aircraft_id]].append(aircraft_id)
+    for mask, ids in by_mask.items():
+        MarketplaceAircraft.objects.filter(id__in=ids).update(tier_mask=mask)
+
+
+# ── Signal receivers ──────────────────────────────────────────────────────────
+def exclusive_tiers_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """m2m_changed on MarketplaceAircraft.exclusive_tiers (either side)."""
+    if action == 'pre_add':
+        # Refuse an unknown tier before the links are written
+        if reverse:
+            tier_bit(instance.name)
+        else:
+            for name in MembershipTier.objects.filter(pk__in=pk_set).values_list('name', flat=True):
+                tier_bit(name)
+        return
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            refresh_tier_masks([instance.pk])
+        return
+    # instance is a MembershipTier
+    if action == 'pre_clear':
+        instance._cleared_aircraft = list(
+            Through.objects.filter(membershiptier_id=instance.pk)
+            .values_list('marketplaceaircraft_id', flat=True)
+        )
+    elif action in ('post_add', 'post_remove'):
+        refresh_tier_masks(pk_set)
+    elif action == 'post_clear':
+        refresh_tier_masks(getattr(instance, '_cleared_aircraft', []))
+
+
+def tier_deleting(sender, instance, **kwargs):
+    """pre_delete on MembershipTier — its links cascade away without m2m_changed."""
+    instance._linked_aircraft = list(
+        Through.objects.filter(membershiptier_id=instance.pk)
+        .values_list('marketplaceaircraft_id', flat=True)
+    )
+
+
+def tier_deleted(sender, instance, **kwargs):
+    """post_delete on MembershipTier."""
+    refresh_tier_masks(getattr(instance, '_linked_aircraft', []))
+
+
+def tier_saved(sender, instance, created, raw=False, **kwargs):
+    """post_save on MembershipTier — a rename moves the tier's bit."""
+    if raw or created:
+        return
+    refresh_tier_masks(
+        Through.objects.filter(membershiptier_id=instance.pk)
+        .values_list('marketplaceaircraft_id', flat=True)
+    )
@@ -77,6 +77,11 @@ const STATUS_BADGE = {
   disputed:  'mem-badge-red',
 }
 
+const EMAIL_BADGE = {
+  pending: 'mem-badge-orange', sending: 'mem-badge-blue',
+  sent: 'mem-badge-green',     failed: 'mem-badge-red',
+}
+
 const DISPUTE_BADGE = {
   open: 'mem-badge-red', reviewing: 'mem-badge-orange',
   resolved: 'mem-badge-green', closed: 'mem-badge-gray',
@@ -2061,8 +2066,8 @@ export default function AdminDashboard() {
                           <div style={{ fontSize: 11, color: 'var(--danger)', marginTop: 2 }}>Error: {log.error_msg}</div>
                         )}
                       </div>
-                      <span className={`mem-badge ${log.success ? 'mem-badge-green' : 'mem-badge-red'}`}>
-                        {log.success ? 'Sent' : 'Failed'}
+                      <span className={`mem-badge ${EMAIL_BADGE[log.status] || 'mem-badge-gray'}`}>
+                        {log.status_display || log.status}
                       </span>
                     </div>
                   ))